@@ -0,0 +1,141 @@
+"""
+飞字动画 HTML 体积：布局池中每套布局分别按 inline（每词一个带内联样式的 <div>，原来的输出）
+和 compact（词表 + 定宽数字串，由 scripts/plus_words.js 展开）渲染，比较字节数（原始 / zlib 压缩后）。
+compact 另需脚本：静态服务时每次只多一个 <script src>（脚本文件由浏览器缓存），否则内联整段脚本。
+
+同时核对 compact 的正确性：
+    - decode_compact 还原的参数与原布局的误差不超过量化步长的一半；
+    - 本机有 node 时，用一个最小的 DOM 替身执行 scripts/plus_words.js，
+      核对它生成的每个元素（词、top/left/字号/时长/延迟/旋转/--tx/--ty）与 Python 解码结果一致。
+
+    python benchmarks/blessing_payload.py
+    python benchmarks/blessing_payload.py --layouts 200 --json
+"""
+import argparse
+import json
+import math
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import blessing
+import page_assets
+
+# 执行 scripts/plus_words.js 所需的最小 DOM：一个 .blessing-words 容器，收集 appendChild 的元素
+_NODE_SHIM = """
+const fs = require("fs");
+const box = {attrs: JSON.parse(process.argv[1]), children: [],
+    getAttribute(k) { return k in this.attrs ? this.attrs[k] : null; },
+    setAttribute(k, v) { this.attrs[k] = v; },
+    appendChild(el) { this.children.push(el); }};
+global.document = {
+    querySelectorAll: () => [box],
+    createElement: () => ({style: {}}),
+};
+eval(fs.readFileSync(0, "utf-8"));
+console.log(JSON.stringify(box.children.map(el => [el.textContent, el.className, el.style.cssText])));
+"""
+_CSS_RE = re.compile(r"top:(?P<top>[-\d.e]+)%;left:(?P<left>[-\d.e]+)%;font-size:(?P<size>[-\d.e]+)px;"
+                     r"animation:tunnelFly (?P<duration>[-\d.e]+)s ease-out infinite;animation-delay:(?P<delay>[-\d.e]+)s;"
+                     r"--tx:(?P<tx>[-\d.e]+)vw;--ty:(?P<ty>[-\d.e]+)vh;--rot:(?P<rot>[-\d.e]+)deg$")
+
+
+def sizes(text):
+    data = text.encode("utf-8")
+    return len(data), len(zlib.compress(data, 6))
+
+
+def max_quantization_error(layout):
+    decoded = blessing.decode_compact(*blessing.encode_compact(layout))
+    worst = {}
+    for original, restored in zip(layout, decoded):
+        for name, a, b in zip(blessing.WORD_FIELDS[1:], original[1:], restored[1:]):
+            error = min(abs(a - b), 360 - abs(a - b)) if name == "angle" else abs(a - b)
+            worst[name] = max(worst.get(name, 0.0), error)
+    return worst
+
+
+def check_script(layout):
+    """用 node 执行浏览器端脚本，返回不一致的元素数；没有 node 时返回 None"""
+    node = shutil.which("node")
+    if node is None:
+        return None
+    words, digits = blessing.encode_compact(layout)
+    result = subprocess.run([node, "-e", _NODE_SHIM, json.dumps({"data-w": words, "data-p": digits})],
+                            input=page_assets.script("plus_words").text, capture_output=True, text=True, check=True)
+    elements = json.loads(result.stdout)
+    expected = blessing.decode_compact(words, digits)
+    mismatches = abs(len(elements) - len(expected))
+    for (text, cls, css), row in zip(elements, expected):
+        values = dict(zip(blessing.WORD_FIELDS, row))
+        match = _CSS_RE.match(css)
+        angle = math.radians(values["angle"])
+        values.update(tx=math.cos(angle) * 80, ty=math.sin(angle) * 80)
+        if (text != values["word"] or cls != "floating-word" or match is None
+                or any(abs(float(v) - values[k]) > 1e-9 for k, v in match.groupdict().items())):
+            mismatches += 1
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="飞字动画 HTML 体积：inline vs compact")
+    parser.add_argument("--layouts", type=int, default=blessing.POOL_SIZE)
+    parser.add_argument("--seed", type=int, default=blessing.POOL_SEED)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    layouts = blessing.build_pool(args.layouts, args.seed)
+    inline = [sizes(blessing.render_inline(layout)) for layout in layouts]
+    compact = [sizes(blessing.render_compact(layout)) for layout in layouts]
+    script = page_assets.script("plus_words")
+    tags = {"static": sizes(page_assets.script_markup("plus_words", True)),
+            "inline": sizes(page_assets.script_markup("plus_words", False))}
+
+    errors = {}
+    for layout in layouts:
+        for name, error in max_quantization_error(layout).items():
+            errors[name] = max(errors.get(name, 0.0), error)
+    limits = {name: 0.5 / scale for name, _, _, scale in blessing.COMPACT_FIELDS}
+    script_mismatches = check_script(layouts[0])
+
+    mean = lambda rows, i: statistics.mean(r[i] for r in rows)
+    report = {
+        "layouts": len(layouts),
+        "inline": {"bytes": mean(inline, 0), "zlib": mean(inline, 1)},
+        "compact": {"bytes": mean(compact, 0), "zlib": mean(compact, 1)},
+        "script": {"file_bytes": len(script.text.encode("utf-8")), "tag_static": tags["static"][0],
+                   "tag_inline": tags["inline"][0]},
+        "max_error": errors,
+        "script_mismatches": script_mismatches,
+    }
+    ok = all(errors[name] <= limits[name] + 1e-9 for name in errors) and script_mismatches in (0, None)
+    if args.json:
+        print(json.dumps({**report, "ok": ok}, ensure_ascii=False, indent=2))
+    else:
+        print(f"{len(layouts)} 套布局，每套 {blessing.WORD_COUNT} 个词，平均每次 rerun 发送的飞字 HTML：")
+        print(f"{'方式':<22}{'字节':>10}{'zlib':>10}{'倍数':>8}")
+        rows = [("inline（原输出）", inline, (0, 0)), ("compact", compact, (0, 0)),
+                ("compact + <script src>", compact, tags["static"]),
+                ("compact + 内联脚本", compact, tags["inline"])]
+        base = mean(inline, 0)
+        for label, data, extra in rows:
+            total = mean(data, 0) + extra[0]
+            print(f"{label:<22}{total:>10.0f}{mean(data, 1) + extra[1]:>10.0f}{base / total:>7.1f}×")
+        print(f"脚本文件 {report['script']['file_bytes']} 字节（静态服务时浏览器缓存，只下载一次）")
+        print("量化误差（最大 / 允许）：" + "，".join(f"{k} {v:.3f}/{limits[k]:.3f}" for k, v in errors.items()))
+        if script_mismatches is None:
+            print("未找到 node，跳过浏览器脚本核对")
+        else:
+            print(f"浏览器脚本核对：{blessing.WORD_COUNT} 个元素，不一致 {script_mismatches} 个")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
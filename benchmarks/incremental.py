@@ -0,0 +1,127 @@
+"""
+增量重算基准：模拟日常更新流（大多数会员只更新体重），对比全量重算与增量重算。
+
+用法（在仓库根目录运行）：
+    python benchmarks/incremental.py --members 200000 --days 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from fitness_batch import calculate_batch
+from fitness_incremental import evaluate, evaluate_batch, update, update_batch
+
+ACTIVITIES = np.array(["Sedentary", "Light", "Moderate", "Active", "Extreme"])
+GOALS = np.array(["减脂 (Cut)", "维持 (Maintain)", "增肌 (Bulk)"])
+
+# 每日更新中各类变化的比例：体重 / 腰围 / 活动水平（其余会员当天不变）
+WEIGHT_SHARE, WAIST_SHARE, ACTIVITY_SHARE = 0.85, 0.05, 0.02
+
+
+def make_cohort(n, rng):
+    gender = rng.choice(np.array(["Male", "Female"]), n)
+    return {
+        "gender": gender,
+        "age": rng.integers(18, 70, n).astype(np.float64),
+        "height": np.round(rng.uniform(150, 195, n), 1),
+        "weight": np.round(rng.uniform(45, 120, n), 1),
+        "neck": np.round(rng.uniform(30, 45, n), 1),
+        "waist": np.round(rng.uniform(60, 120, n), 1),
+        "hip": np.where(gender == "Female", np.round(rng.uniform(80, 120, n), 1), 0.0),
+        "activity": rng.choice(ACTIVITIES, n),
+        "goal": rng.choice(GOALS, n),
+    }
+
+
+def daily_deltas(cohort, rng):
+    """生成一天的更新：[(字段, 行号, 新值), ...]，各会员最多一类变化"""
+    n = len(cohort["weight"])
+    roll = rng.random(n)
+    weight_rows = np.flatnonzero(roll < WEIGHT_SHARE)
+    waist_rows = np.flatnonzero((roll >= WEIGHT_SHARE) & (roll < WEIGHT_SHARE + WAIST_SHARE))
+    activity_rows = np.flatnonzero((roll >= WEIGHT_SHARE + WAIST_SHARE)
+                                   & (roll < WEIGHT_SHARE + WAIST_SHARE + ACTIVITY_SHARE))
+    return [
+        ("weight", weight_rows, np.round(cohort["weight"][weight_rows] + rng.normal(0, 0.4, weight_rows.size), 1)),
+        ("waist", waist_rows, np.round(cohort["waist"][waist_rows] + rng.normal(0, 0.5, waist_rows.size), 1)),
+        ("activity", activity_rows, rng.choice(ACTIVITIES, activity_rows.size)),
+    ]
+
+
+def bench_batch(members, days, seed):
+    rng = np.random.default_rng(seed)
+    cohort = make_cohort(members, rng)
+    state = evaluate_batch(**cohort)
+    full_s = incr_s = 0.0
+    for _ in range(days):
+        deltas = daily_deltas(cohort, rng)
+
+        # 全量：先把变化写进输入，再整体重算
+        for field, rows, values in deltas:
+            cohort[field][rows] = values
+        start = time.perf_counter()
+        full = calculate_batch(**cohort)
+        full_s += time.perf_counter() - start
+
+        # 增量：逐个 delta 只重算受影响的行与输出
+        start = time.perf_counter()
+        for field, rows, values in deltas:
+            state = update_batch(state, {field: values}, rows)
+        incr_s += time.perf_counter() - start
+
+        for key in full:
+            assert np.array_equal(full[key], state["results"][key], equal_nan=True), key
+    return full_s, incr_s
+
+
+def bench_scalar(members, days, seed):
+    rng = random.Random(seed)
+    state = [evaluate({
+        "gender": rng.choice(["Male", "Female"]), "age": rng.randint(18, 70),
+        "height": round(rng.uniform(150, 195), 1), "weight": round(rng.uniform(45, 120), 1),
+        "neck": round(rng.uniform(30, 45), 1), "waist": round(rng.uniform(60, 120), 1),
+        "hip": round(rng.uniform(80, 120), 1), "activity": rng.choice(list(ACTIVITIES)),
+        "goal": rng.choice(list(GOALS)),
+    }) for _ in range(members)]
+    deltas = [
+        [{"weight": round(s["inputs"]["weight"] + rng.gauss(0, 0.4), 1)} for s in state]
+        for _ in range(days)
+    ]
+
+    start = time.perf_counter()
+    for day in deltas:
+        for s, d in zip(state, day):
+            evaluate({**s["inputs"], **d})
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for day in deltas:
+        state = [update(s, d) for s, d in zip(state, day)]
+    return full_s, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="全量 vs 增量重算基准")
+    parser.add_argument("--members", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--scalar-members", type=int, default=20_000, help="单人接口测试的会员数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    full_s, incr_s = bench_batch(args.members, args.days, args.seed)
+    print(f"批量（{args.members} 人 × {args.days} 天）：全量 {full_s:.3f}s · 增量 {incr_s:.3f}s "
+          f"· 加速 {full_s / incr_s:.2f}×")
+
+    full_s, incr_s = bench_scalar(args.scalar_members, args.days, args.seed)
+    print(f"单人（{args.scalar_members} 人 × {args.days} 天，仅体重变化）：全量 {full_s:.3f}s "
+          f"· 增量 {incr_s:.3f}s · 加速 {full_s / incr_s:.2f}×")
+
+
+if __name__ == "__main__":
+    main()
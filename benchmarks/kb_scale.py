@@ -0,0 +1,81 @@
+"""
+知识库规模基准：把现有 section 复制成 N 倍的合成知识库，测量
+    import     在新进程里导入 ophth_kb（应与 N 无关：导入时不读任何文件）
+    toc        第一次访问时读取目录索引
+    module     加载一个模块的全部 section（只读该模块自己的文件）
+    hit        已缓存 section 的访问耗时
+
+用法（在仓库根目录运行）：
+    python benchmarks/kb_scale.py --sizes 10 1000 10000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from ophth_kb import KB, KnowledgeBase, build_index, write_section
+
+MODULES = 12
+
+
+def make_kb(root, n):
+    """以现有 section 为模板生成 n 个 section，平均分到 12 个模块"""
+    templates = [(KB.toc["sections"][key]["kind"], KB[key]) for key in KB]
+    for i in range(n):
+        kind, value = templates[i % len(templates)]
+        write_section(root, f"s{i:06d}", i % MODULES + 1, kind, value)
+    build_index(root)
+
+
+def import_ms(root):
+    code = ("import time; t = time.perf_counter(); import ophth_kb; "
+            "print((time.perf_counter() - t) * 1000)")
+    env = {**os.environ, "OPHTH_KB_DIR": root}
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def measure(n):
+    with tempfile.TemporaryDirectory() as root:
+        make_kb(root, n)
+        kb = KnowledgeBase(root)
+        start = time.perf_counter()
+        kb.toc
+        toc_ms = (time.perf_counter() - start) * 1000
+
+        # 模块一只取前 20 个 section，模拟一个页面的内容量
+        keys = kb.toc["modules"]["1"][:20]
+        start = time.perf_counter()
+        for key in keys:
+            kb[key]
+        module_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            kb[keys[0]]
+        hit_us = (time.perf_counter() - start) * 1000
+
+        return {"sections": n, "import_ms": import_ms(root), "toc_ms": toc_ms,
+                "module_ms": module_ms, "module_sections": len(keys), "hit_us": hit_us}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="知识库规模 vs 启动/加载耗时")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10, 1000, 10000])
+    args = parser.parse_args(argv)
+
+    print(f"{'section 数':>10}{'导入 ms':>10}{'索引 ms':>10}{'模块 ms':>10}{'命中 µs':>10}")
+    for n in args.sizes:
+        r = measure(n)
+        print(f"{r['sections']:>10}{r['import_ms']:>10.2f}{r['toc_ms']:>10.2f}"
+              f"{r['module_ms']:>10.2f}{r['hit_us']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+媒体服务的分段播放验证：在临时目录生成一段合成音频（标准库 wave，默认 30 秒 44.1 kHz 立体声），
+按 media.build 发布后在本机起服务，像浏览器的 <audio> 一样发请求并核对：
+    - bytes=0- 返回 206，先读 64 KiB 就断开（浏览器拿到开头即开始播放）；
+    - 拖动进度条：bytes=<中间位置>- 返回的字节与文件对应片段一致；
+    - 按 256 KiB 分段顺序拉取，拼起来与原文件逐字节一致；
+    - bytes=-n 取文件尾、越界返回 416、If-None-Match 返回 304、If-Range 不匹配时返回整文件 200；
+    - 带哈希的文件名有 immutable 缓存头。
+本机有 ffmpeg 时还会转码成 mp3 / opus，对比开始播放前需要下载的字节数（头部 + 前 N 秒）。
+这是手动工具（看实际音频的字节数、核对线上服务）；media.MediaServer 的 Range / 缓存行为由 tests/test_media.py 自动测试。
+
+    python benchmarks/media_range.py                   # 用 media.MediaServer 作为服务
+    python benchmarks/media_range.py --url http://127.0.0.1:8501/app/static/media --file bgm.<哈希>.flac
+                                                             # 对正在运行的服务（如 Streamlit 静态服务）做同样的核对
+"""
+import argparse
+import asyncio
+import hashlib
+import http.client
+import math
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import wave
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import media
+
+CHUNK = 256 * 1024
+
+
+def make_wav(path, seconds, rate=44100):
+    """双声道正弦 + 少量噪声（避免转码后体积小得不真实）"""
+    frames = bytearray()
+    seed = 1
+    for i in range(int(seconds * rate)):
+        seed = (seed * 1103515245 + 12345) & 0x7FFFFFFF
+        noise = (seed >> 16) % 2000 - 1000
+        left = int(12000 * math.sin(2 * math.pi * 440 * i / rate)) + noise
+        right = int(12000 * math.sin(2 * math.pi * 660 * i / rate)) - noise
+        frames += struct.pack("<hh", left, right)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(bytes(frames))
+
+
+class Client:
+    def __init__(self, base):
+        parts = urlsplit(base)
+        self.host, self.port, self.prefix = parts.hostname, parts.port, parts.path.rstrip("/")
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+
+    def get(self, name, method="GET", read=None, **headers):
+        """read=None 读完整个响应体；否则只读 read 字节后断开连接（模拟浏览器中途取消）"""
+        self.conn.request(method, f"{self.prefix}/{name}", headers=headers)
+        response = self.conn.getresponse()
+        if read is None:
+            return response, response.read()
+        body = response.read(read)
+        self.conn.close()
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        return response, body
+
+
+def check(client, name, data, caching=True):
+    """返回 [(检查项, 是否通过, 是否必需)]；caching=False 时缓存相关的检查只报告不判失败"""
+    size = len(data)
+    results = []
+
+    def ok(label, condition, required=True):
+        results.append((label, bool(condition), required))
+
+    start = time.perf_counter()
+    r, body = client.get(name, read=64 * 1024, Range="bytes=0-")
+    first_ms = (time.perf_counter() - start) * 1000
+    ok("bytes=0- → 206 + Content-Range", r.status == 206 and r.getheader("Content-Range") == f"bytes 0-{size - 1}/{size}")
+    ok("开头 64 KiB 正确，中途断开", body == data[:64 * 1024])
+    ok("Accept-Ranges: bytes", r.getheader("Accept-Ranges") == "bytes")
+    tag, cache = r.getheader("ETag"), r.getheader("Cache-Control") or ""
+
+    middle = size // 2
+    r, body = client.get(name, Range=f"bytes={middle}-")
+    ok("拖动到中间 bytes=N- 内容一致", r.status == 206 and body == data[middle:])
+
+    pieces = []
+    for offset in range(0, size, CHUNK):
+        r, body = client.get(name, Range=f"bytes={offset}-{offset + CHUNK - 1}")
+        pieces.append(body if r.status == 206 else b"")
+    ok(f"{len(pieces)} 段顺序拉取拼回原文件", b"".join(pieces) == data)
+
+    r, body = client.get(name, Range="bytes=-1000")
+    ok("bytes=-1000 取文件尾", r.status == 206 and body == data[-1000:])
+    r, body = client.get(name, Range=f"bytes={size}-")
+    ok("越界 → 416", r.status == 416 and r.getheader("Content-Range") == f"bytes */{size}")
+    r, body = client.get(name, method="HEAD")
+    ok("HEAD 返回长度不带内容", r.status == 200 and int(r.getheader("Content-Length")) == size and body == b"")
+    if tag:
+        r, body = client.get(name, **{"If-None-Match": tag})
+        ok("If-None-Match → 304", r.status == 304 and body == b"", caching)
+        r, body = client.get(name, Range="bytes=0-9", **{"If-Range": '"stale"'})
+        ok("If-Range 不匹配 → 整文件 200", r.status == 200 and body == data)
+    else:
+        ok("ETag", False, caching)
+    ok("immutable 缓存头", "immutable" in cache, caching)
+    return results, first_ms
+
+
+def startup_bytes(entry, seconds, duration):
+    """开始播放前需要的字节：按平均码率估算前 N 秒（压缩格式的头部很小，FLAC 另含元数据块）"""
+    return entry["bytes"] * min(seconds, duration) / duration
+
+
+def _serve_in_thread(root):
+    loop = asyncio.new_event_loop()
+    server = media.MediaServer(root)
+    address = loop.run_until_complete(server.start(port=0))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return server, address
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="媒体服务分段播放验证")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--startup", type=float, default=3.0, help="估算开始播放前需要的秒数")
+    parser.add_argument("--url", help="对已运行的服务做核对（304 / 缓存头只报告，不判失败）")
+    parser.add_argument("--file", help="配合 --url：要请求的文件名（本地 static/media 下的同名文件作对照）")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        with open(os.path.join(media.MEDIA_DIR, args.file), "rb") as f:
+            data = f.read()
+        results, first_ms = check(Client(args.url), args.file, data, caching=False)
+    else:
+        workdir = tempfile.mkdtemp(prefix="media-bench-")
+        try:
+            source = os.path.join(workdir, "source.wav")
+            make_wav(source, args.seconds)
+            track = media.Track("bench", source)
+            out = os.path.join(workdir, "media")
+            formats = ["copy"] + (["mp3", "opus"] if shutil.which("ffmpeg") else [])
+            print(f"{'格式':<6}{'文件':<26}{'字节':>12}{f'前 {args.startup:g}s 字节':>14}")
+            for fmt in formats:
+                entry = media.build(track, fmt, media_dir=out, source_path=source)
+                print(f"{fmt:<6}{entry['file']:<26}{entry['bytes']:>12}"
+                      f"{startup_bytes(entry, args.startup, args.seconds):>14.0f}")
+            if len(formats) == 1:
+                print("（未找到 ffmpeg，跳过转码对比）")
+
+            entry = media.read_manifest(out)["bench"]
+            with open(os.path.join(out, entry["file"]), "rb") as f:
+                data = f.read()
+            server, (host, port) = _serve_in_thread(out)
+            results, first_ms = check(Client(f"http://{host}:{port}"), entry["file"], data)
+            print(f"\n服务共处理 {server.requests} 个请求，发送 {server.bytes_sent} 字节"
+                  f"（文件 {len(data)} 字节，sha256 {hashlib.sha256(data).hexdigest()[:10]}）")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"首个分段响应 {first_ms:.1f} ms")
+    for label, passed, required in results:
+        print(f"  {'✅' if passed else '❌' if required else '⚠️'} {label}")
+    if not all(passed for _, passed, required in results if required):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
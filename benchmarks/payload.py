@@ -0,0 +1,113 @@
+"""
+每次 rerun 推给浏览器的数据量：用 AppTest 跑三个应用的典型交互，统计每次 rerun 的
+ForwardMsg 序列化字节数（即 websocket 上的负载），以及其中样式（<style> / <link>）所占的字节。
+
+    python benchmarks/payload.py                       # 默认资源模式（见 page_assets）
+    PAGE_ASSETS=inline python benchmarks/payload.py    # 对比：样式内联
+    python benchmarks/payload.py --json
+
+场景：
+    app     首次打开 + 点击「开始计算」
+    review  首次打开 + 依次切换到模块 1..12
+    plus    落地页 + 点击进入动画页 + 动画页再 rerun 一次
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+_captured = []
+_parse = local_script_runner.parse_tree_from_messages
+
+
+def _capture(messages):
+    # LocalScriptRunner 每次 run 结束时用本次的全部 ForwardMsg 构造元素树，顺便记下它们
+    _captured.append(list(messages))
+    return _parse(messages)
+
+
+local_script_runner.parse_tree_from_messages = _capture
+
+
+def _style_bytes(msg):
+    if msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+        return 0
+    element = msg.delta.new_element
+    kind = element.WhichOneof("type")
+    body = element.markdown.body if kind == "markdown" else element.html.body if kind == "html" else ""
+    return msg.ByteSize() if ("<style" in body or "<link" in body) else 0
+
+
+def _rerun(at, label, results):
+    start = len(_captured)
+    at.run()
+    messages = [m for batch in _captured[start:] for m in batch]
+    results.append({"rerun": label, "bytes": sum(m.ByteSize() for m in messages),
+                    "style_bytes": sum(map(_style_bytes, messages)), "messages": len(messages)})
+    if at.exception:
+        raise RuntimeError(f"{label}: {at.exception[0].message}")
+
+
+def _script(name):
+    return AppTest.from_file(os.path.join(REPO_ROOT, name), default_timeout=60)
+
+
+def scenario_app():
+    results, at = [], _script("app.py")
+    _rerun(at, "open", results)
+    at.button[0].click()
+    _rerun(at, "calculate", results)
+    return results
+
+
+def scenario_review():
+    results, at = [], _script("review.py")
+    _rerun(at, "open", results)
+    for option in at.sidebar.radio[0].options[1:]:
+        at.sidebar.radio[0].set_value(option)
+        _rerun(at, f"module {option.split('.')[0]}", results)
+    return results
+
+
+def scenario_plus():
+    results, at = [], _script("plus.py")
+    _rerun(at, "landing", results)
+    at.button[0].click()
+    _rerun(at, "enter", results)
+    _rerun(at, "animation rerun", results)
+    return results
+
+
+SCENARIOS = {"app": scenario_app, "review": scenario_review, "plus": scenario_plus}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="每次 rerun 的 websocket 负载")
+    parser.add_argument("--only", nargs="*", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    report = {name: SCENARIOS[name]() for name in args.only}
+    if args.json:
+        print(json.dumps({"mode": os.environ.get("PAGE_ASSETS", "auto"), "results": report},
+                         ensure_ascii=False, indent=2))
+        return
+    print(f"资源模式：{os.environ.get('PAGE_ASSETS', 'auto')}")
+    print(f"{'应用':<8}{'rerun':<18}{'总字节':>10}{'样式字节':>10}{'消息数':>8}")
+    for name, rows in report.items():
+        for r in rows:
+            print(f"{name:<8}{r['rerun']:<18}{r['bytes']:>10}{r['style_bytes']:>10}{r['messages']:>8}")
+        print(f"{name:<8}{'平均':<18}{statistics.mean(r['bytes'] for r in rows):>10.0f}"
+              f"{statistics.mean(r['style_bytes'] for r in rows):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+测验判分基准：随机生成 N 份答卷（每份作答全部病例题 + 表格题，正确率约 70%），比较
+    loop     逐份调用 quiz.grade，再用 Python 汇总每题正确率
+    batch    quiz.grade_batch 一次编码成矩阵后整体比较
+并核对两种方式的得分完全一致。
+
+用法（在仓库根目录运行）：
+    python benchmarks/quiz.py --submissions 1000 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import quiz
+
+
+def make_submissions(n, seed=0, p_correct=0.7):
+    rng = random.Random(seed)
+    questions = list(quiz.question_index().values())
+    return [{q.id: q.answer if rng.random() < p_correct else rng.choice(q.options) for q in questions}
+            for _ in range(n)]
+
+
+def grade_loop(submissions, questions):
+    scores, correct = [], dict.fromkeys(questions, 0)
+    for answers in submissions:
+        result = quiz.grade(answers, questions)
+        scores.append(result["score"])
+        for qid, ok in result["results"].items():
+            correct[qid] += ok
+    return np.array(scores), np.array([correct[q] / len(submissions) for q in questions])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="测验判分：逐份 vs 批量")
+    parser.add_argument("--submissions", type=int, nargs="*", default=[1000, 10000])
+    args = parser.parse_args(argv)
+
+    questions = sorted(quiz.question_index())
+    print(f"题库 {len(questions)} 道（病例 {len(quiz.cases())}，表格 {len(quiz.generated_questions())}）")
+    print(f"{'答卷数':>8}{'逐份 ms':>10}{'批量 ms':>10}{'加速':>8}{'平均分':>8}")
+    for n in args.submissions:
+        submissions = make_submissions(n)
+        start = time.perf_counter()
+        loop_scores, loop_accuracy = grade_loop(submissions, questions)
+        loop_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        batch = quiz.grade_batch(submissions, questions)
+        batch_ms = (time.perf_counter() - start) * 1000
+        assert np.array_equal(loop_scores, batch["scores"]) and np.allclose(loop_accuracy, batch["accuracy"])
+        print(f"{n:>8}{loop_ms:>10.1f}{batch_ms:>10.1f}{loop_ms / batch_ms:>7.1f}×{batch['mean']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
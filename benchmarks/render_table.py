@@ -0,0 +1,87 @@
+"""
+review.py 表格渲染基准：每次 rerun 新建 DataFrame（旧做法） vs 进程级缓存（kb_cache）。
+
+用法（在仓库根目录运行）：
+    python benchmarks/render_table.py --rounds 200
+
+分别测量：
+    construct   只取得要显示的 DataFrame（旧：DataFrame(...) + iloc；新：缓存查找）
+    render      完整的 render_table（含 st.dataframe 序列化，bare mode 下执行）
+每项给出单次调用耗时，以及 tracemalloc 统计的单次调用新分配内存峰值。
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import streamlit as st
+
+from kb_cache import table_frame, warm
+from ophth_kb import KB
+
+TABLE_KEYS = KB.sections(kind="table")
+CALLS = [(key, blind) for key in TABLE_KEYS for blind in (False, True)]
+
+
+def rebuild_frame(key, blind_mode):
+    """旧版 render_table 中的 DataFrame 构造"""
+    df = pd.DataFrame(KB[key]["data"], columns=KB[key]["cols"])
+    return df.iloc[:, [0]] if blind_mode else df
+
+
+def render(get_frame, key, blind_mode):
+    st.dataframe(get_frame(key, blind_mode), use_container_width=True)
+    if blind_mode:
+        st.warning("🙈 遮挡模式开启：请背诵被隐藏的内容！")
+
+
+def per_call_seconds(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for key, blind in CALLS:
+            fn(key, blind)
+    return (time.perf_counter() - start) / (rounds * len(CALLS))
+
+
+def per_call_peak_kb(fn):
+    """单次调用期间新分配内存的峰值（取所有表格的平均）"""
+    peaks = []
+    tracemalloc.start()
+    for key, blind in CALLS:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(key, blind)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return sum(peaks) / len(peaks) / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="render_table：重建 DataFrame vs 进程级缓存")
+    parser.add_argument("--rounds", type=int, default=200, help="每种方式遍历全部表格的轮数")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)   # bare mode 下 st.* 的 ScriptRunContext 告警
+    warm()
+    cases = {
+        "construct": (rebuild_frame, table_frame),
+        "render": (lambda k, b: render(rebuild_frame, k, b), lambda k, b: render(table_frame, k, b)),
+    }
+    print(f"{len(TABLE_KEYS)} 张表 × (正常 + 遮挡)，每种方式 {args.rounds} 轮")
+    print(f"{'':<12}{'重建 µs':>10}{'缓存 µs':>10}{'加速':>8}{'重建 KB':>10}{'缓存 KB':>10}")
+    for name, (old, new) in cases.items():
+        for fn in (old, new):   # 预热：首次导入 pyarrow 等
+            per_call_seconds(fn, 1)
+        old_s, new_s = per_call_seconds(old, args.rounds), per_call_seconds(new, args.rounds)
+        old_kb, new_kb = per_call_peak_kb(old), per_call_peak_kb(new)
+        print(f"{name:<12}{old_s * 1e6:>10.1f}{new_s * 1e6:>10.1f}{old_s / new_s:>7.1f}×"
+              f"{old_kb:>10.1f}{new_kb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+全文检索基准：把当前知识库的全部文档（KB 表格行、口诀、review.py 文字与病例）复制成 N 倍，
+每份副本的标题带编号以免完全重复，然后测量
+    build      建索引并写盘
+    open       打开持久化索引（mmap）
+    query      一组典型查询的单次耗时分位数（含读取命中文档、生成摘要）
+
+用法（在仓库根目录运行）：
+    python benchmarks/search.py --scales 1 100 --rounds 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kb_search import SearchIndex, build, collect_documents
+
+QUERIES = ["毛果芸香碱", "树枝状", "阿托品", "青光眼", "BUT", "角膜内皮", "急性闭角型青光眼发作",
+           "真菌", "眼压 21mmHg", "泪膜破裂", "激素", "Pilocarpine"]
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def measure(labels, docs, scale, rounds, limit):
+    copies = [{**doc, "title": f"{doc['title']} #{i}" if i else doc["title"]} for i in range(scale) for doc in docs]
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        meta = build(copies, root, labels)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = SearchIndex(root)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        for query in QUERIES:   # 预热：页缓存、首次 mmap 访问
+            index.search(query, limit)
+        samples = []
+        for _ in range(rounds):
+            for query in QUERIES:
+                start = time.perf_counter()
+                index.search(query, limit)
+                samples.append((time.perf_counter() - start) * 1000)
+        index.close()
+    return {"scale": scale, "docs": meta["docs"], "postings": meta["postings"], "build_s": build_s,
+            "open_ms": open_ms, "p50": statistics.median(samples), "p95": percentile(samples, 0.95),
+            "p99": percentile(samples, 0.99), "max": max(samples)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="全文检索：建索引 / 打开 / 查询耗时")
+    parser.add_argument("--scales", type=int, nargs="*", default=[1, 100], help="知识库放大倍数")
+    parser.add_argument("--rounds", type=int, default=200, help="每个查询重复次数")
+    parser.add_argument("--limit", type=int, default=8, help="每次返回的命中数（与页面一致）")
+    args = parser.parse_args(argv)
+
+    labels, docs = collect_documents()
+    print(f"{len(QUERIES)} 个查询 × {args.rounds} 轮，每次取前 {args.limit} 条")
+    print(f"{'倍数':>6}{'文档':>9}{'倒排记录':>10}{'建索引 s':>10}{'打开 ms':>9}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for scale in args.scales:
+        r = measure(labels, docs, scale, args.rounds, args.limit)
+        print(f"{r['scale']:>6}{r['docs']:>9}{r['postings']:>10}{r['build_s']:>10.2f}{r['open_ms']:>9.2f}"
+              f"{r['p50']:>9.3f}{r['p95']:>9.3f}{r['p99']:>9.3f}{r['max']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+fitness_service 压测脚本：N 个 keep-alive 连接并发发送随机会员数据，统计吞吐与延迟分位数。
+
+用法（在仓库根目录运行）：
+    python benchmarks/service_load.py --connections 64 --requests 20000
+    python benchmarks/service_load.py --port 8765 --no-spawn      # 压测已启动的服务
+    python benchmarks/service_load.py --bulk 500                   # 改为压测批量接口
+
+默认会在子进程里启动一个本地服务实例，测完后自动关闭。
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ACTIVITIES = ["Sedentary", "Light", "Moderate", "Active", "Extreme"]
+GOALS = ["减脂 (Cut)", "维持 (Maintain)", "增肌 (Bulk)"]
+
+
+def random_member(rng):
+    gender = rng.choice(["Male", "Female"])
+    return {
+        "gender": gender,
+        "age": rng.randint(18, 70),
+        "height": round(rng.uniform(150, 195), 1),
+        "weight": round(rng.uniform(45, 120), 1),
+        "neck": round(rng.uniform(30, 45), 1),
+        "waist": round(rng.uniform(60, 120), 1),
+        "hip": round(rng.uniform(80, 120), 1) if gender == "Female" else 0,
+        "activity": rng.choice(ACTIVITIES),
+        "goal": rng.choice(GOALS),
+    }
+
+
+async def _request(reader, writer, host, method, path, payload=None):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _worker(host, port, count, bulk, seed, latencies, errors):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            if bulk:
+                path, payload = "/v1/plan/bulk", {"members": [random_member(rng) for _ in range(bulk)]}
+            else:
+                path, payload = "/v1/plan", random_member(rng)
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, host, "POST", path, payload)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, connections, requests, bulk=0):
+    latencies, errors = [], []
+    per_conn = max(1, requests // connections)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(host, port, per_conn, bulk, seed, latencies, errors) for seed in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await _request(reader, writer, host, "GET", "/metrics")
+    writer.close()
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    members = len(latencies) * (bulk or 1)
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "members_per_s": members / elapsed,
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "mean_ms": statistics.fmean(latencies),
+        "server_metrics": metrics.decode("utf-8"),
+    }
+
+
+def _spawn_server(port, window_ms):
+    proc = subprocess.Popen(
+        [sys.executable, "fitness_service.py", "--port", str(port), "--window-ms", str(window_ms)],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    proc.stdout.readline()  # 等待 "服务已启动"
+    return proc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="fitness_service 本地压测")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18765)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--bulk", type=int, default=0, help="每个请求携带的会员数（0 = 压测单个接口）")
+    parser.add_argument("--window-ms", type=float, default=2.0, help="自动启动的服务使用的合并窗口")
+    parser.add_argument("--no-spawn", action="store_true", help="不自动启动服务，直接压测 --host/--port")
+    parser.add_argument("--show-metrics", action="store_true", help="打印服务端 /metrics")
+    args = parser.parse_args(argv)
+
+    proc = None if args.no_spawn else _spawn_server(args.port, args.window_ms)
+    try:
+        r = asyncio.run(run_load(args.host, args.port, args.connections, args.requests, args.bulk))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    print(f"请求数 {r['requests']}（错误 {r['errors']}），耗时 {r['seconds']:.2f}s")
+    print(f"吞吐：{r['requests_per_s']:.0f} req/s，{r['members_per_s']:.0f} 人/s")
+    print(f"延迟：p50 {r['p50_ms']:.2f} ms · p90 {r['p90_ms']:.2f} ms · p99 {r['p99_ms']:.2f} ms · 平均 {r['mean_ms']:.2f} ms")
+    for line in r["server_metrics"].splitlines():
+        if args.show_metrics or line.startswith(("fitness_batches_total", "fitness_batched_items_total")):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
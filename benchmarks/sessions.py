@@ -0,0 +1,190 @@
+"""
+并发会话压测：用 Streamlit AppTest 在进程内模拟 N 个用户，不需要浏览器和网络。
+
+每个用户依次：
+    app.py     随机填写身体数据、活动水平和目标，点击「开始计算」（--iterations 次）
+    review.py  按顺序浏览全部 13 个复习模块
+    plus.py    打开落地页并点击进入动画页
+最多 --concurrency 个用户同时在线，各自在一个线程里操作。AppTest 每次运行都会替换全局的
+Runtime 实例和配置，不能真正并行，所以各会话的 rerun 经一把锁排队执行；页面脚本是纯 CPU 计算，
+受 GIL 限制，单个 Streamlit 进程里的 rerun 本来也基本是排队的。延迟 = 排队等待 + 执行。
+
+用法（在仓库根目录运行）：
+    python benchmarks/sessions.py --users 50 --concurrency 10 --iterations 3
+    python benchmarks/sessions.py --users 20 --json > sessions.json
+
+报告每个脚本首次加载和交互 rerun 的延迟分位数（以及其中的执行时间）、总吞吐（rerun/s）
+和每个会话的常驻内存增量。
+会话在压测结束前一直保留，内存增量 = (结束时 RSS - 开始时 RSS) / 会话数。
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+SCRIPT_TIMEOUT = 60
+GOALS = ["减脂 (Cut)", "维持 (Maintain)", "增肌 (Bulk)"]
+
+
+# 真实服务端所有会话共用一个 ScriptCache，页面脚本只编译一次；AppTest 每次 run 都新建一个，
+# 既把编译耗时算进每次 rerun，多线程同时编译时还会触发 CPython 3.11 的 AST 线程安全问题。
+# 这里让所有模拟会话共用同一个缓存，与服务端一致。
+_SCRIPT_CACHE = ScriptCache()
+local_script_runner.ScriptCache = lambda: _SCRIPT_CACHE
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmRSS:")) / 1024
+    except (OSError, StopIteration):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+_RUN_LOCK = threading.Lock()
+
+
+class Recorder:
+    """线程安全地收集 (脚本, 类型) -> [(总延迟, 执行时间)]"""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = []
+        self.lock = threading.Lock()
+
+    def run(self, at, script, kind):
+        start = time.perf_counter()
+        with _RUN_LOCK:
+            began = time.perf_counter()
+            at.run(timeout=SCRIPT_TIMEOUT)
+        done = time.perf_counter()
+        with self.lock:
+            self.samples.setdefault((script, kind), []).append((done - start, done - began))
+            if at.exception:
+                self.errors.append((script, kind, at.exception[0].message))
+        return at
+
+
+def _script(name):
+    return AppTest.from_file(os.path.join(REPO_ROOT, name), default_timeout=SCRIPT_TIMEOUT)
+
+
+def fitness_user(rec, rng, iterations):
+    at = rec.run(_script("app.py"), "app", "load")
+    for _ in range(iterations):
+        gender = rng.choice(["Male", "Female"])
+        if at.radio[0].value != gender:
+            at.radio[0].set_value(gender)
+            rec.run(at, "app", "interact")   # 切换性别会增删臀围输入框，先重跑一次
+        values = {"年龄": rng.randint(18, 70), "身高 (cm)": round(rng.uniform(150, 195), 1),
+                  "体重 (kg)": round(rng.uniform(45, 120), 1), "颈围 (cm)": round(rng.uniform(30, 45), 1),
+                  "腰围 (cm)": round(rng.uniform(65, 120), 1), "臀围 (cm)": round(rng.uniform(85, 120), 1)}
+        for widget in at.number_input:
+            widget.set_value(values[widget.label])
+        at.selectbox[0].set_value(rng.choice(at.selectbox[0].options))
+        at.selectbox[1].set_value(rng.choice(GOALS))
+        at.button[0].click()
+        rec.run(at, "app", "interact")
+    return at
+
+
+def review_user(rec):
+    at = rec.run(_script("review.py"), "review", "load")
+    nav = at.sidebar.radio[0]
+    for option in nav.options[1:] + nav.options[:1]:
+        at.sidebar.radio[0].set_value(option)
+        rec.run(at, "review", "interact")
+    return at
+
+
+def plus_user(rec):
+    at = rec.run(_script("plus.py"), "plus", "load")
+    at.button[0].click()
+    return rec.run(at, "plus", "interact")   # 按钮回调里 st.rerun()，AppTest 会跑完整个重跑
+
+
+def simulate_user(rec, seed, iterations):
+    rng = random.Random(seed)
+    # 返回会话对象，让它们在压测结束前保持存活，用于估算每会话内存
+    return fitness_user(rec, rng, iterations), review_user(rec), plus_user(rec)
+
+
+def _percentiles(samples):
+    ordered = sorted(total for total, _ in samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"n": len(ordered), "mean_ms": statistics.fmean(ordered) * 1000, "p50_ms": pick(0.5) * 1000,
+            "p90_ms": pick(0.9) * 1000, "p99_ms": pick(0.99) * 1000, "max_ms": ordered[-1] * 1000,
+            "service_ms": statistics.fmean(service for _, service in samples) * 1000}
+
+
+def run(users, concurrency, iterations, seed=0):
+    logging.disable(logging.WARNING)   # AppTest 下页面里的弃用提示等会刷屏
+    rec = Recorder()
+    # 先跑一个用户预热导入（streamlit 组件、pandas、altair 等），不计入结果
+    simulate_user(Recorder(), seed - 1, 1)
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        sessions = list(pool.map(lambda i: simulate_user(rec, seed + i, iterations), range(users)))
+    elapsed = time.perf_counter() - start
+    rss_after = _rss_mb()
+
+    reruns = sum(len(v) for v in rec.samples.values())
+    report = {
+        "users": users,
+        "concurrency": concurrency,
+        "iterations": iterations,
+        "seconds": elapsed,
+        "reruns": reruns,
+        "reruns_per_s": reruns / elapsed,
+        "sessions": len(sessions) * 3,
+        "rss_mb": rss_after,
+        "rss_per_session_mb": (rss_after - rss_before) / (len(sessions) * 3),
+        "errors": len(rec.errors),
+        "latency": {f"{script}.{kind}": _percentiles(v) for (script, kind), v in sorted(rec.samples.items())},
+    }
+    return report, rec.errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streamlit 并发会话压测（AppTest，进程内）")
+    parser.add_argument("--users", type=int, default=20, help="模拟用户总数")
+    parser.add_argument("--concurrency", type=int, default=5, help="同时在线的用户数")
+    parser.add_argument("--iterations", type=int, default=3, help="每个用户在 app.py 点击「开始计算」的次数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出")
+    args = parser.parse_args(argv)
+
+    report, errors = run(args.users, args.concurrency, args.iterations, args.seed)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 1 if errors else 0
+
+    print(f"{report['users']} 用户 · 并发 {report['concurrency']} · 用时 {report['seconds']:.2f}s · "
+          f"{report['reruns']} 次 rerun · 吞吐 {report['reruns_per_s']:.1f} rerun/s")
+    print(f"常驻内存 {report['rss_mb']:.1f} MB · 每会话 {report['rss_per_session_mb']:.2f} MB "
+          f"（{report['sessions']} 个会话）")
+    print(f"\n{'脚本.类型':<18}{'次数':>6}{'均值':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'最大':>9}{'执行':>9}  (ms)")
+    for name, p in report["latency"].items():
+        print(f"{name:<18}{p['n']:>6}{p['mean_ms']:>9.1f}{p['p50_ms']:>9.1f}{p['p90_ms']:>9.1f}"
+              f"{p['p99_ms']:>9.1f}{p['max_ms']:>9.1f}{p['service_ms']:>9.1f}")
+    for script, kind, message in errors[:10]:
+        print(f"错误 {script}.{kind}: {message}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+反向求解基准：闭式候选 + 局部校验 vs 在体重网格上穷举。
+
+用法（在仓库根目录运行）：
+    python benchmarks/solver.py --members 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from fitness import ACTIVITY_MULTIPLIERS, GOAL_ADJUSTMENTS
+from fitness_batch import batch_body_fat
+from fitness_solver import brute_force_weight, waist_for_body_fat, weight_for_calories
+
+
+def make_cohort(n, rng):
+    is_male = rng.random(n) < 0.5
+    return {
+        "is_male": is_male,
+        "age": rng.integers(18, 70, n),
+        "height": np.round(rng.uniform(150, 195, n), 1),
+        "neck": np.round(rng.uniform(30, 45, n), 1),
+        "hip": np.where(is_male, 0.0, np.round(rng.uniform(80, 120, n), 1)),
+        "activity_factor": rng.choice(list(ACTIVITY_MULTIPLIERS.values()), n),
+        "goal_factor": rng.choice(list(GOAL_ADJUSTMENTS.values()), n),
+    }
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_calories(c, targets):
+    args = (c["is_male"], c["age"], c["height"], c["activity_factor"], c["goal_factor"], targets)
+    (weight, calories), solve_s = timed(weight_for_calories, *args)
+    (ref_weight, ref_calories), brute_s = timed(brute_force_weight, *args)
+    same_error = np.abs(calories - targets) == np.abs(ref_calories - targets)
+    print(f"体重 <- 目标热量：求解 {solve_s:.3f}s · 穷举 {brute_s:.3f}s · 加速 {brute_s / solve_s:.1f}×")
+    print(f"  与穷举误差一致 {same_error.mean():.2%} · 精确命中 {(calories == targets).mean():.2%} "
+          f"· 体重相同 {(weight == ref_weight).mean():.2%}")
+
+
+def bench_waist(c, targets):
+    waist, solve_s = timed(waist_for_body_fat, c["is_male"], c["height"], c["neck"], targets, c["hip"])
+    bfp, valid = batch_body_fat(c["is_male"], c["height"], c["neck"], waist, c["hip"])
+    error = np.abs(bfp - targets)[valid]
+    print(f"腰围 <- 目标体脂：求解 {solve_s:.3f}s · 正向复核最大误差 {error.max():.2f}% "
+          f"· 有解 {valid.mean():.2%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="反向求解 vs 穷举基准")
+    parser.add_argument("--members", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    cohort = make_cohort(args.members, rng)
+    bench_calories(cohort, rng.integers(1200, 4000, args.members))
+    bench_waist(cohort, np.round(rng.uniform(8, 35, args.members), 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+间隔重复存储基准：合成 users × cards 条复习状态（到期日随机分布），测量
+    due        ReviewStore.due / due_count（走 (user, due) 索引）
+    no index   同样的查询不用 (user, due) 索引（NOT INDEXED：只按主键找到该用户的全部卡片再过滤）
+    full scan  同样的查询逐行扫描整张表作对照
+    write      连续作答的吞吐：攒批写入（默认 batch_size）vs 每次作答单独提交（batch_size=1），
+               分别在 synchronous=NORMAL（ReviewStore 默认，WAL 下提交不 fsync）与 FULL（每次提交 fsync）下
+
+用法（在仓库根目录运行）：
+    python benchmarks/srs.py --users 1000 --cards 1000 --queries 200
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from srs import DEFAULT_BATCH_SIZE, GRADES, ReviewStore
+
+DAY = 20_000
+
+
+def populate(store, users, cards, seed=0):
+    rng = random.Random(seed)
+    with store._conn:
+        store._conn.execute("BEGIN")
+        for u in range(users):
+            store._conn.executemany(
+                "INSERT INTO card_state VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((f"user{u:06d}", f"card{c:06d}", 3, 10, 2.5, DAY + rng.randint(-30, 60), 0, DAY - 90, DAY - 10)
+                 for c in range(cards)))
+
+
+def timed_ms(fn, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), sorted(samples)[int(0.99 * (len(samples) - 1))]
+
+
+def write_rate(path, batch_size, synchronous, reviews, users, cards):
+    rng = random.Random(1)
+    with ReviewStore(path, batch_size=batch_size, flush_seconds=float("inf")) as store:
+        store._conn.execute(f"PRAGMA synchronous={synchronous}")
+        start = time.perf_counter()
+        for _ in range(reviews):
+            store.review(f"user{rng.randrange(users):06d}", f"card{rng.randrange(cards):06d}",
+                         rng.choice(list(GRADES.values())), DAY)
+        store.flush()
+        return reviews / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="间隔重复存储：到期查询与批量写入")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--cards", type=int, default=1000, help="每个用户学过的卡片数")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--reviews", type=int, default=5000, help="写入测试的作答次数")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "review_state.db")
+        start = time.perf_counter()
+        with ReviewStore(path) as store:
+            populate(store, args.users, args.cards)
+        print(f"{args.users} 用户 × {args.cards} 卡片 = {args.users * args.cards} 条状态，"
+              f"生成 {time.perf_counter() - start:.1f} s，{os.path.getsize(path) / 2**20:.0f} MB")
+
+        rng = random.Random(2)
+        queries = [(f"user{rng.randrange(args.users):06d}", DAY) for _ in range(args.queries)]
+        with ReviewStore(path) as store:
+            query = lambda sql: lambda user, day: store._conn.execute(sql, (user, day)).fetchall()
+            no_index = query("SELECT card, due FROM card_state NOT INDEXED WHERE user = ? AND due <= ? "
+                             "ORDER BY due, card LIMIT 100")
+            full_scan = query("SELECT card, due FROM card_state NOT INDEXED WHERE user || '' = ? AND due <= ? "
+                              "ORDER BY due, card LIMIT 100")
+            rows = [
+                ("due (limit 100)", timed_ms(lambda u, d: store.due(u, d, 100), queries)),
+                ("due_count", timed_ms(store.due_count, queries)),
+                ("today", timed_ms(store.today, queries)),
+                ("no index", timed_ms(no_index, queries)),
+                ("full scan", timed_ms(full_scan, queries[:max(1, args.queries // 20)])),
+            ]
+        print(f"{'查询':<18}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, (p50, p99) in rows:
+            print(f"{name:<18}{p50:>10.3f}{p99:>10.3f}")
+
+        print(f"\n{'写入 作答/s':<18}{'NORMAL':>10}{'FULL':>10}")
+        for batch_size in (1, DEFAULT_BATCH_SIZE):
+            rates = [write_rate(path, batch_size, sync, args.reviews, args.users, args.cards)
+                     for sync in ("NORMAL", "FULL")]
+            print(f"{'batch_size=' + str(batch_size):<18}{rates[0]:>10.0f}{rates[1]:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
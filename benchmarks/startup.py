@@ -0,0 +1,95 @@
+"""
+冷启动基准：在全新的 Python 进程里导入每个入口模块，测量导入耗时与常驻内存 (RSS)。
+
+用法（在仓库根目录运行）：
+    python benchmarks/startup.py --repeat 5
+    python benchmarks/startup.py fitness blessing --json
+
+页面入口（PAGE_TARGETS）像 streamlit run 一样以 __main__ 身份执行（plus 的页面代码在 main() 里，
+只导入不会渲染），在 Streamlit 的 "bare mode" 下跑完整页，数字代表整页脚本的启动成本；
+fitness / ophth_kb / blessing 应当不加载 streamlit 和 pandas。
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 核心模块 + 三个页面入口
+DEFAULT_TARGETS = ["fitness", "fitness_batch", "fitness_cache", "ophth_kb", "blessing", "app", "plus", "review"]
+PAGE_TARGETS = ("app", "plus", "review")
+
+# 子进程中执行：导入目标模块并打印耗时、峰值 RSS 以及是否拉入了重量级依赖
+_PROBE = """
+import json, resource, runpy, sys, time
+t0 = time.perf_counter()
+if {page}:
+    runpy.run_module({module!r}, run_name="__main__")
+elif {module!r}:
+    __import__({module!r})
+elapsed = time.perf_counter() - t0
+# ru_maxrss 在 fork + exec 后沿用父进程的峰值；Linux 上改读 exec 时重置的 VmHWM
+try:
+    with open("/proc/self/status") as f:
+        rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_mb": rss_kb / 1024,
+    "streamlit": "streamlit" in sys.modules,
+    "pandas": "pandas" in sys.modules,
+}}))
+"""
+
+
+def probe(module):
+    """在全新解释器里导入一次 module（页面入口按脚本执行；空字符串表示只测解释器本身）"""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, page=module in PAGE_TARGETS)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(module, repeat=3):
+    """多次冷启动取中位数"""
+    runs = [probe(module) for _ in range(repeat)]
+    return {
+        "module": module or "(python)",
+        "seconds": statistics.median(r["seconds"] for r in runs),
+        "rss_mb": statistics.median(r["rss_mb"] for r in runs),
+        "streamlit": runs[0]["streamlit"],
+        "pandas": runs[0]["pandas"],
+    }
+
+
+def run(targets=None, repeat=3):
+    """返回解释器基线 + 每个目标模块的测量结果"""
+    targets = targets or DEFAULT_TARGETS
+    return [measure("", repeat)] + [measure(m, repeat) for m in targets]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="测量各入口模块的冷启动导入耗时与内存")
+    parser.add_argument("targets", nargs="*", help=f"要测量的模块（默认：{' '.join(DEFAULT_TARGETS)}）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个模块冷启动次数，取中位数")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出")
+    args = parser.parse_args(argv)
+
+    results = run(args.targets, args.repeat)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{'模块':<16}{'导入耗时(ms)':>14}{'RSS(MB)':>10}  streamlit  pandas")
+    for r in results:
+        print(f"{r['module']:<16}{r['seconds'] * 1000:>14.1f}{r['rss_mb']:>10.1f}"
+              f"  {'是' if r['streamlit'] else '-':^9}  {'是' if r['pandas'] else '-':^6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+性能回归基准套件：覆盖三个应用的热点路径，结果存成 JSON 基线，之后用 compare 对比。
+
+    python benchmarks/suite.py run --save                 # 运行并写入基线 benchmarks/baseline.json
+    python benchmarks/suite.py run --compare              # 运行并与基线对比，有回归时退出码为 1
+    python benchmarks/suite.py run --only fitness --output new.json
+    python benchmarks/suite.py compare old.json new.json --threshold 0.15
+
+用例：
+    fitness.scalar          FitnessCalculator 逐人计算（体脂 + BMR + TDEE + 营养计划）
+    fitness.batch           fitness_batch.calculate_batch 整列计算
+    review.render_table     review.py 全部知识库表格（正常 + 遮挡模式）的 DataFrame 构建与渲染
+    plus.words_html         blessing.generate_words_html 生成飞字 HTML（布局池构建时的单套成本）
+    plus.animation_page     plus.py 动画页整页（CSS + 音乐 + 飞字）
+    startup.<模块>          各入口模块在新进程中的冷启动耗时与 RSS（见 startup.py）
+
+指标越小越好：seconds_per_op（单位操作耗时）以及启动用例的 rss_mb。
+页面用例在 Streamlit 的 bare mode 下执行，测的是 Python 端构建页面的成本，不含浏览器渲染。
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+import startup
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.10
+METRICS = ("seconds_per_op", "rss_mb")
+
+ACTIVITIES = ["Sedentary", "Light", "Moderate", "Active", "Extreme"]
+GOALS = ["减脂 (Cut)", "维持 (Maintain)", "增肌 (Bulk)"]
+STARTUP_TARGETS = ["fitness", "app", "plus", "review"]
+
+CASES = {}
+
+
+def case(name, unit):
+    """注册用例：被装饰的函数接收 scale，返回 (要计时的函数, 每次调用包含的操作数)"""
+    def register(setup):
+        CASES[name] = (setup, unit)
+        return setup
+    return register
+
+
+def _members(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        gender = rng.choice(["Male", "Female"])
+        rows.append((gender, rng.randint(18, 70), round(rng.uniform(150, 195), 1), round(rng.uniform(45, 120), 1),
+                     round(rng.uniform(30, 45), 1), round(rng.uniform(60, 120), 1),
+                     round(rng.uniform(80, 120), 1) if gender == "Female" else 0.0,
+                     rng.choice(ACTIVITIES), rng.choice(GOALS)))
+    return rows
+
+
+@case("fitness.scalar", "member")
+def bench_scalar(scale):
+    from fitness import FitnessCalculator
+
+    rows = _members(int(10_000 * scale))
+
+    def run():
+        for gender, age, height, weight, neck, waist, hip, activity, goal in rows:
+            calc = FitnessCalculator(gender, age, height, weight, neck, waist, hip)
+            try:
+                calc.calculate_body_fat()
+            except ValueError:
+                pass
+            calc.nutrition_plan(calc.calculate_tdee(activity), goal)
+    return run, len(rows)
+
+
+@case("fitness.batch", "row")
+def bench_batch(scale):
+    from fitness_batch import calculate_batch
+
+    cols = [np.array(c) for c in zip(*_members(int(200_000 * scale)))]
+
+    def run():
+        calculate_batch(*cols)
+    return run, len(cols[0])
+
+
+def _quiet_streamlit():
+    # bare mode 下每次调用 st.* 都会打印 "missing ScriptRunContext" 之类的告警
+    logging.disable(logging.WARNING)
+
+
+@case("review.render_table", "table")
+def bench_render_table(scale):
+    _quiet_streamlit()
+    import review
+
+    keys = review.KB.sections(kind="table")
+    rounds = max(1, int(5 * scale))
+
+    def run():
+        for _ in range(rounds):
+            for key in keys:
+                review.render_table(key)
+                review.render_table(key, blind_mode=True)
+    return run, rounds * len(keys) * 2
+
+
+@case("plus.words_html", "page")
+def bench_words_html(scale):
+    from blessing import generate_words_html
+
+    count = int(2_000 * scale)
+    rng = random.Random(0)
+
+    def run():
+        for _ in range(count):
+            generate_words_html(rng=rng)
+    return run, count
+
+
+@case("plus.animation_page", "page")
+def bench_animation_page(scale):
+    _quiet_streamlit()
+    import plus
+
+    count = max(1, int(200 * scale))
+
+    def run():
+        for _ in range(count):
+            plus.st.session_state.layout = None   # 模拟新会话：每次都重新抽一套飞字布局
+            plus.animation_page()
+    return run, count
+
+
+def _timed(setup, scale, repeat):
+    run, ops = setup(scale)
+    run()  # 预热：导入、首次分配等不计入
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) / ops)
+    per_op = statistics.median(samples)
+    return {"ops": ops, "seconds_per_op": per_op, "ops_per_s": 1 / per_op,
+            "spread": (max(samples) - min(samples)) / per_op}
+
+
+def run_suite(only=None, repeat=5, scale=1.0, startup_targets=STARTUP_TARGETS):
+    """运行用例，返回可直接写成 JSON 的结果"""
+    selected = lambda name: not only or any(name.startswith(p) for p in only)
+    results = {}
+    for name, (setup, unit) in CASES.items():
+        if selected(name):
+            results[name] = {"unit": unit, **_timed(setup, scale, repeat)}
+            print(f"  {name:<24}{_format(results[name])}", file=sys.stderr)
+    for module in startup_targets:
+        name = f"startup.{module}"
+        if selected(name):
+            r = startup.measure(module, repeat)
+            results[name] = {"unit": "import", "ops": 1, "seconds_per_op": r["seconds"], "rss_mb": r["rss_mb"]}
+            print(f"  {name:<24}{_format(results[name])}", file=sys.stderr)
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "node": platform.node(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat,
+            "scale": scale,
+        },
+        "results": results,
+    }
+
+
+def _format(r):
+    per_op = r["seconds_per_op"]
+    text = f"{per_op * 1e6:>12.2f} µs/{r['unit']}"
+    if "rss_mb" in r:
+        text += f"  {r['rss_mb']:>7.1f} MB"
+    return text
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    对比两份结果，返回 [(用例, 指标, 基线值, 当前值, 变化比例, 状态)]。
+    变化超过 threshold 记为 regression / improved，其余为 ok；只在一侧出现的用例记为 missing / new。
+    """
+    rows = []
+    base, cur = baseline["results"], current["results"]
+    for name in sorted(set(base) | set(cur)):
+        if name not in cur:
+            rows.append((name, "-", None, None, None, "missing"))
+            continue
+        if name not in base:
+            rows.append((name, "-", None, None, None, "new"))
+            continue
+        for metric in METRICS:
+            if metric in base[name] and metric in cur[name]:
+                old, new = base[name][metric], cur[name][metric]
+                change = new / old - 1 if old else 0.0
+                status = "regression" if change > threshold else "improved" if change < -threshold else "ok"
+                rows.append((name, metric, old, new, change, status))
+    return rows
+
+
+def print_comparison(rows, threshold):
+    print(f"{'用例':<24}{'指标':<16}{'基线':>12}{'当前':>12}{'变化':>9}  状态（阈值 ±{threshold:.0%}）")
+    for name, metric, old, new, change, status in rows:
+        if change is None:
+            print(f"{name:<24}{metric:<16}{'':>12}{'':>12}{'':>9}  {status}")
+            continue
+        scale, unit = (1e6, "µs") if metric == "seconds_per_op" else (1, "MB")
+        print(f"{name:<24}{metric:<16}{old * scale:>10.2f}{unit:>2}{new * scale:>10.2f}{unit:>2}"
+              f"{change:>+9.1%}  {status}")
+    regressions = [r for r in rows if r[5] == "regression"]
+    print(f"\n{len(regressions)} 项回归" if regressions else "\n无回归")
+    return regressions
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(data, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="性能回归基准套件")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="运行基准")
+    run_p.add_argument("--only", nargs="*", help="只运行名称以这些前缀开头的用例，例如 fitness startup.app")
+    run_p.add_argument("--repeat", type=int, default=5, help="每个用例重复次数，取中位数")
+    run_p.add_argument("--scale", type=float, default=1.0, help="工作量倍数（CI 上可以调小）")
+    run_p.add_argument("--output", help="结果写入该 JSON 文件")
+    run_p.add_argument("--save", action="store_true", help=f"把结果写为基线（{DEFAULT_BASELINE}）")
+    run_p.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="运行后与基线对比（默认基线文件）")
+    run_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="回归判定阈值（比例）")
+
+    cmp_p = sub.add_parser("compare", help="对比两份结果")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        rows = compare(_load(args.baseline), _load(args.current), args.threshold)
+        return 1 if print_comparison(rows, args.threshold) else 0
+
+    results = run_suite(args.only, args.repeat, args.scale)
+    if args.output:
+        _save(results, args.output)
+    if args.save:
+        _save(results, DEFAULT_BASELINE)
+    if args.compare:
+        # 只对比本次实际运行的用例，避免 --only 时把其余用例报成 missing
+        baseline = _load(args.compare)
+        baseline["results"] = {k: v for k, v in baseline["results"].items() if k in results["results"]}
+        rows = compare(baseline, results, args.threshold)
+        return 1 if print_comparison(rows, args.threshold) else 0
+    if not (args.output or args.save):
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+祝福词库与飞字动画布局生成（纯 Python，不依赖 streamlit，可在任意进程中直接导入）
+
+布局是每个词的一组参数（见 WORD_FIELDS），有两种渲染方式（环境变量 BLESSING_RENDER，默认 compact）：
+    inline   每个词一个带完整内联 style 的 <div>（约 18 KB），st.markdown 即可显示；
+    compact  一个 <div class="blessing-words">，data-w 为词表、data-p 为每词 12 位的数字串（约 1.3 KB），
+             由 scripts/plus_words.js 在浏览器里展开成与 inline 相同结构的元素（需要 st.html 执行脚本）。
+             数值按 COMPACT_FIELDS 量化（角度 1°、位置 0.5%、时长 1/3 s、延迟 0.1 s），肉眼看不出区别。
+
+飞字布局池：进程内预先生成 POOL_SIZE 套布局（固定种子），所有会话共用，会话里只存一个下标。
+    index = random_layout()          # 新会话抽一套布局
+    html = layout_html(index)        # 每次 rerun 按下标取渲染好的 HTML，不再重新生成
+设置 BLESSING_POOL_FILE 时布局池持久化到该 JSON 文件，之后的进程（以及同一部署的多个进程）直接加载，
+保证同一下标在任何进程里都是同一套布局；池大小与种子以文件为准，词库或词数变了会自动重建（按默认大小与种子）。
+    python blessing.py pool --out blessing_pool.json --size 64 --seed 7
+"""
+import hashlib
+import html
+import json
+import math
+import os
+import random
+from functools import lru_cache
+
+# --- 祝福词库 (更新版：更现代、更有趣、更生活化) ---
+BLESSING_WORDS = [
+    "暴富", "发财", "瘦成闪电", "不脱发", "加薪", "自由", "开心", "好运爆棚", "锦鲤附体", "心想事成",
+    "平安喜乐", "万事胜意", "未来可期", "光芒万丈", "勇敢", "可爱", "温柔", "浪漫", "热烈", "猫狗双全",
+    "吃不胖", "睡得香", "无忧无虑", "闪闪发光", "好运连连", "大吉大利", "百无禁忌", "诸事顺遂", "岁岁平安",
+    "天天开心", "笑口常开", "美梦成真", "水逆退散", "欧气满满", "升职", "买房", "买车", "恋爱甜甜", "所愿皆所得",
+    "长乐未央", "元气满满", "快乐万岁", "保持热爱", "奔赴山海", "不负韶华", "只争朝夕", "乘风破浪", "披荆斩棘",
+    "逆风翻盘", "向阳而生", "野蛮生长", "熠熠生辉", "未来属于你", "做回自己", "爱自己", "有人爱", "有钱花",
+    "去旅行", "看世界", "吃遍天下", "身体健康", "家人安康", "阖家幸福", "团团圆圆", "和和美美", "甜甜蜜蜜",
+    "长长久久", "顺顺当当", "平平安安", "健健康康", "快快乐乐", "2026冲鸭", "新的开始", "新的机遇", "新的希望",
+    "前程似锦", "星河长明", "因为有你", "顺遂", "无虞", "清欢", "如愿", "锦瑟华年", "招财进宝", "日进斗金",
+    "风生水起", "步步高升", "平步青云", "鱼跃龙门", "金榜题名", "福如东海", "寿比南山", "有趣有盼", "不负心中爱"
+]
+
+# 每次动画飞出的词数
+WORD_COUNT = 45
+
+# 布局池：参数形式每套约 10 KB，渲染结果按需缓存（compact 每套约 1.3 KB，inline 约 37 KB），与在线会话数无关
+POOL_SIZE = int(os.environ.get("BLESSING_POOL_SIZE", 32))
+POOL_SEED = 2026
+POOL_FILE = os.environ.get("BLESSING_POOL_FILE")
+RENDER = os.environ.get("BLESSING_RENDER", "compact")
+
+# 每个词的参数：词、飞出角度（度）、起点 top / left（%）、字号（px）、动画时长、延迟（s）、旋转（度）
+WORD_FIELDS = ("word", "angle", "top", "left", "size", "duration", "delay", "rot")
+# compact 编码：(字段, 位数, 偏移, 缩放)，数字 = round((值 - 偏移) × 缩放)；scripts/plus_words.js 按同样顺序解码
+COMPACT_FIELDS = (("angle", 3, 0, 1), ("top", 1, 48, 2), ("left", 1, 48, 2), ("size", 2, 18, 1),
+                  ("duration", 1, 3, 3), ("delay", 2, 0, 10), ("rot", 2, -20, 1))
+
+
+def generate_layout(count=WORD_COUNT, rng=random):
+    """随机抽取祝福词并生成每个词的动画参数，返回元组的元组（字段见 WORD_FIELDS）"""
+    layout = []
+    for word in rng.sample(BLESSING_WORDS, count):
+        angle = rng.uniform(0, 360)
+        rot = rng.randint(-20, 20)
+        # 起始点：屏幕中心 (50% 50%)
+        top = 50 + rng.uniform(-2, 2)
+        left = 50 + rng.uniform(-2, 2)
+        size = rng.randint(18, 40)
+        duration = rng.uniform(3.0, 6.0)
+        delay = rng.uniform(0, 4.0)
+        layout.append((word, angle, top, left, size, duration, delay, rot))
+    return tuple(layout)
+
+
+def render_inline(layout):
+    """每个词一个带内联样式的 <div>"""
+    html_elements = []
+    for word, angle_deg, start_top, start_left, size, duration, delay, rot in layout:
+        angle_rad = math.radians(angle_deg)
+        # 使用视口单位 vw/vh 确保飞出屏幕
+        tx = f"{math.cos(angle_rad) * 80}vw"
+        ty = f"{math.sin(angle_rad) * 80}vh"
+
+        element = f"""
+        <div class="floating-word" style="
+            top: {start_top}%; 
+            left: {start_left}%; 
+            font-size: {size}px; 
+            animation: tunnelFly {duration}s ease-out infinite;
+            animation-delay: {delay}s;
+            --tx: {tx};
+            --ty: {ty};
+            --rot: {rot}deg;
+        ">{word}</div>
+        """
+        html_elements.append(element)
+
+    return "\n".join(html_elements)
+
+
+def encode_compact(layout):
+    """(词表, 数字串)：词以空格分隔，每个词的参数按 COMPACT_FIELDS 定宽编码"""
+    digits = []
+    for row in layout:
+        values = dict(zip(WORD_FIELDS, row))
+        for name, width, offset, scale in COMPACT_FIELDS:
+            n = round((values[name] - offset) * scale)
+            if name == "angle":
+                n %= 360
+            digits.append(f"{min(max(n, 0), 10 ** width - 1):0{width}d}")
+    return " ".join(row[0] for row in layout), "".join(digits)
+
+
+def decode_compact(words, digits):
+    """encode_compact 的逆过程（与 scripts/plus_words.js 一致），返回量化后的布局"""
+    layout, at = [], 0
+    for word in words.split(" "):
+        values = {"word": word}
+        for name, width, offset, scale in COMPACT_FIELDS:
+            values[name] = offset + int(digits[at:at + width]) / scale
+            at += width
+        layout.append(tuple(values[name] for name in WORD_FIELDS))
+    return tuple(layout)
+
+
+def render_compact(layout):
+    """词表 + 数字串放在一个 <div> 的 data 属性里，由 scripts/plus_words.js 展开"""
+    words, digits = encode_compact(layout)
+    return f'<div class="blessing-words" data-w="{html.escape(words)}" data-p="{digits}"></div>'
+
+
+RENDERERS = {"inline": render_inline, "compact": render_compact}
+
+
+def generate_words_html(count=WORD_COUNT, rng=random):
+    """随机抽取祝福词并生成飞字动画的 HTML（inline 方式）"""
+    return render_inline(generate_layout(count, rng))
+
+
+def _pool_key(size, seed):
+    words = hashlib.sha256("\n".join(BLESSING_WORDS).encode("utf-8")).hexdigest()[:16]
+    return {"version": 2, "size": size, "seed": seed, "count": WORD_COUNT, "words": words}
+
+
+def build_pool(size=POOL_SIZE, seed=POOL_SEED):
+    """按固定种子生成 size 套布局"""
+    rng = random.Random(seed)
+    return tuple(generate_layout(rng=rng) for _ in range(size))
+
+
+def save_pool(path, layouts, seed=POOL_SEED):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({**_pool_key(len(layouts), seed), "layouts": layouts}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def load_pool(path, size=None, seed=None):
+    """
+    读取持久化的布局池；文件不存在或与当前词库 / 参数不符时返回 None。
+    size / seed 为 None 时接受文件自己记录的大小和种子（例如 `pool --size 64 --seed 7` 生成的文件）。
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    layouts = data.pop("layouts", None)
+    size = data.get("size") if size is None else size
+    seed = data.get("seed") if seed is None else seed
+    if data != _pool_key(size, seed) or not layouts or len(layouts) != size:
+        return None
+    return tuple(tuple(tuple(row) for row in layout) for layout in layouts)
+
+
+@lru_cache(maxsize=1)
+def layout_pool():
+    """进程内共享的布局池（首次调用时加载或生成一次）"""
+    if POOL_FILE:
+        layouts = load_pool(POOL_FILE)
+        if layouts is None:
+            layouts = build_pool()
+            save_pool(POOL_FILE, layouts)
+        return layouts
+    return build_pool()
+
+
+@lru_cache(maxsize=None)
+def _rendered(mode):
+    return tuple(map(RENDERERS[mode], layout_pool()))
+
+
+def random_layout(rng=random):
+    """为新会话抽一套布局，返回下标"""
+    return rng.randrange(len(layout_pool()))
+
+
+def layout_html(index, mode=RENDER):
+    rendered = _rendered(mode)
+    return rendered[index % len(rendered)]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="飞字布局池")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pool_p = sub.add_parser("pool", help="生成并保存布局池")
+    pool_p.add_argument("--out", default=POOL_FILE or "blessing_pool.json")
+    pool_p.add_argument("--size", type=int, default=POOL_SIZE)
+    pool_p.add_argument("--seed", type=int, default=POOL_SEED)
+    args = parser.parse_args(argv)
+
+    layouts = build_pool(args.size, args.seed)
+    save_pool(args.out, layouts, args.seed)
+    print(f"{len(layouts)} 套布局 -> {args.out}（{os.path.getsize(args.out) / 1e3:.0f} KB）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import math
+
+# --- 活动水平系数 (下拉菜单 key -> TDEE 倍数) ---
+ACTIVITY_MULTIPLIERS = {
+    "Sedentary": 1.2,
+    "Light": 1.375,
+    "Moderate": 1.55,
+    "Active": 1.725,
+    "Extreme": 1.9
+}
+
+# --- 目标热量调整系数 ---
+GOAL_ADJUSTMENTS = {
+    "减脂 (Cut)": 0.80,
+    "维持 (Maintain)": 1.0,
+    "增肌 (Bulk)": 1.10
+}
+
+# 热量不够分配时的碳水保底 (g)
+CARB_FLOOR_G = 50
+
+def tdee_from_bmr(bmr, activity_level_key):
+    # 将下拉菜单的 key 映射回数值
+    return round(bmr * ACTIVITY_MULTIPLIERS.get(activity_level_key, 1.2))
+
+
+# --- 核心算法类 (保持不变) ---
+class FitnessCalculator:
+    def __init__(self, gender, age, height_cm, weight_kg, neck_cm, waist_cm, hip_cm=0):
+        self.gender = gender.lower()
+        self.age = int(age)
+        self.height = float(height_cm)
+        self.weight = float(weight_kg)
+        self.neck = float(neck_cm)
+        self.waist = float(waist_cm)
+        self.hip = float(hip_cm)
+
+    def calculate_body_fat(self):
+        if self.gender == 'male':
+            bfp = 495 / (1.0324 - 0.19077 * math.log10(self.waist - self.neck) + 0.15456 * math.log10(self.height)) - 450
+        else:
+            bfp = 495 / (1.29579 - 0.35004 * math.log10(self.waist + self.hip - self.neck) + 0.22100 * math.log10(self.height)) - 450
+        return round(bfp, 2)
+
+    def calculate_bmr(self):
+        base = (10 * self.weight) + (6.25 * self.height) - (5 * self.age)
+        if self.gender == 'male':
+            return base + 5
+        else:
+            return base - 161
+
+    def calculate_tdee(self, activity_level_key):
+        return tdee_from_bmr(self.calculate_bmr(), activity_level_key)
+
+    def nutrition_plan(self, tdee, goal):
+        target_calories = round(tdee * GOAL_ADJUSTMENTS.get(goal, 1.0))
+        protein_g = round(self.weight * 2.0)
+        fat_g = round(self.weight * 0.8)
+        
+        consumed_cals = (protein_g * 4) + (fat_g * 9)
+        remaining_cals = target_calories - consumed_cals
+        
+        if remaining_cals < 0:
+            carbs_g = CARB_FLOOR_G
+            target_calories = consumed_cals + (carbs_g * 4)
+        else:
+            carbs_g = round(remaining_cals / 4)
+
+        return {
+            "Calories": target_calories,
+            "Protein": protein_g,
+            "Fat": fat_g,
+            "Carbs": carbs_g
+        }
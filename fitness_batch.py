@@ -0,0 +1,156 @@
+import numpy as np
+
+from fitness import ACTIVITY_MULTIPLIERS, CARB_FLOOR_G, GOAL_ADJUSTMENTS, FitnessCalculator
+
+# --- 批量计算：整列输入，一次算完全部会员 ---
+# 与 FitnessCalculator 逐人计算结果完全一致（同样的浮点运算顺序与四舍五入规则）。
+
+# 体脂四舍五入到 0.01 时，离 .xx5 边界小于该值的行改走标量公式，
+# 避免 np.log10 与 math.log10 的末位误差导致舍入结果不同
+_ROUND_EDGE_TOL = 1e-6
+
+# 批量结果中的字段
+OUTPUT_FIELDS = ("body_fat", "bmr", "tdee", "calories", "protein", "fat", "carbs", "valid")
+
+
+def _column(values, n, dtype=float):
+    """把标量或序列转成长度为 n 的数组"""
+    arr = np.asarray(values, dtype=dtype)
+    if arr.ndim == 0:
+        arr = np.full(n, arr, dtype=dtype)
+    return arr
+
+
+def _lookup(keys, table, default, n):
+    """按 key 查系数表：对表里的每个 key 做一次整列比较，不逐行查字典"""
+    keys = np.asarray(keys)
+    if keys.ndim == 0:
+        return np.full(n, table.get(keys.item(), default), dtype=float)
+    factors = np.full(n, default, dtype=float)
+    for key, factor in table.items():
+        factors[keys == key] = factor
+    return factors
+
+
+def batch_body_fat(is_male, height, neck, waist, hip, log10=np.log10):
+    """
+    批量体脂率 (US Navy)，返回 (体脂数组, 有效掩码)，无效行为 NaN。
+    log10 可替换为查表实现（见 fitness_table.Log10Table）。
+    """
+    male_circ = waist - neck
+    female_circ = waist + hip - neck
+    circ = np.where(is_male, male_circ, female_circ)
+    valid = (circ > 0) & (height > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_circ = log10(circ)
+        log_height = log10(height)
+        male = 495 / (1.0324 - 0.19077 * log_circ + 0.15456 * log_height) - 450
+        female = 495 / (1.29579 - 0.35004 * log_circ + 0.22100 * log_height) - 450
+        raw = np.where(is_male, male, female)
+        bfp = np.round(raw, 2)
+
+        # 靠近舍入边界的行用标量公式复算，保证与逐人计算逐位一致
+        scaled = raw * 100
+        edge = valid & (np.abs(scaled - np.floor(scaled) - 0.5) < _ROUND_EDGE_TOL)
+
+    valid &= np.isfinite(bfp)
+    for i in np.flatnonzero(edge):
+        gender = "male" if is_male[i] else "female"
+        bfp[i] = FitnessCalculator(gender, 0, height[i], 0, neck[i], waist[i], hip[i]).calculate_body_fat()
+    bfp[~valid] = np.nan
+    return bfp, valid
+
+
+def activity_factors(activity, n):
+    """活动水平 key -> TDEE 倍数数组（未知 key 按 1.2 计，与标量版一致）"""
+    return _lookup(activity, ACTIVITY_MULTIPLIERS, 1.2, n)
+
+
+def goal_factors(goal, n):
+    """目标 -> 热量调整系数数组（未知目标按 1.0 计）"""
+    return _lookup(goal, GOAL_ADJUSTMENTS, 1.0, n)
+
+
+def calculate_arrays(is_male, age, height, weight, neck, waist, hip,
+                     activity_factor, goal_factor, log10=np.log10):
+    """
+    纯数值版批量计算：性别已转成布尔掩码、活动/目标已转成系数。
+    age 为整数数组，其余为 float 数组，长度一致。多进程 worker 直接在共享内存上调用它。
+    """
+    body_fat, valid = batch_body_fat(is_male, height, neck, waist, hip, log10)
+    return {"body_fat": body_fat, **energy_arrays(is_male, age, height, weight, activity_factor, goal_factor),
+            "valid": valid}
+
+
+def energy_arrays(is_male, age, height, weight, activity_factor, goal_factor):
+    """BMR / TDEE / 营养计划部分（不依赖围度，可单独重算）"""
+    base = (10 * weight) + (6.25 * height) - (5 * age)
+    bmr = np.where(is_male, base + 5, base - 161)
+    tdee = np.round(bmr * activity_factor).astype(np.int64)
+
+    # 营养计划：碳水保底用掩码处理，而不是逐行分支
+    calories = np.round(tdee * goal_factor).astype(np.int64)
+    protein = np.round(weight * 2.0).astype(np.int64)
+    fat = np.round(weight * 0.8).astype(np.int64)
+    consumed = (protein * 4) + (fat * 9)
+    remaining = calories - consumed
+    floor = remaining < 0
+    carbs = np.where(floor, CARB_FLOOR_G, np.round(remaining / 4)).astype(np.int64)
+    calories = np.where(floor, consumed + (CARB_FLOOR_G * 4), calories)
+
+    return {
+        "bmr": bmr,
+        "tdee": tdee,
+        "calories": calories,
+        "protein": protein,
+        "fat": fat,
+        "carbs": carbs,
+    }
+
+
+def male_mask(gender, n):
+    """性别列 -> 布尔掩码（与标量版一样，只有 lower() 后等于 'male' 的使用男性公式）"""
+    gender = np.asarray(gender)
+    if gender.ndim == 0:
+        return np.full(n, str(gender.item()).lower() == "male")
+    # 常见写法直接整列比较，只有其余写法（如 "MALE"）才逐个转小写
+    is_male = (gender == "Male") | (gender == "male")
+    other = ~(is_male | (gender == "Female") | (gender == "female"))
+    if other.any():
+        is_male[other] = np.char.lower(gender[other].astype(str)) == "male"
+    return is_male
+
+
+def calculate_batch(gender, age, height, weight, neck, waist, hip=0.0,
+                    activity="Sedentary", goal="维持 (Maintain)", log10=np.log10):
+    """
+    批量计算体脂、BMR、TDEE 与营养计划。
+    各参数可为数组/Series 或标量（标量会广播到所有行），返回字段见 OUTPUT_FIELDS，
+    其中 valid 标记体脂公式可计算的行（对应标量版本会抛 ValueError 的输入）。
+    log10 可传入查表实现，结果不变。
+    """
+    n = np.size(gender) if np.ndim(gender) else np.asarray(weight).size
+    return calculate_arrays(
+        male_mask(gender, n),
+        _column(age, n).astype(np.int64),
+        _column(height, n),
+        _column(weight, n),
+        _column(neck, n),
+        _column(waist, n),
+        _column(hip, n),
+        activity_factors(activity, n),
+        goal_factors(goal, n),
+        log10,
+    )
+
+
+def calculate_frame(df, log10=np.log10):
+    """
+    对 DataFrame（或任何按列名取值的对象）批量计算。
+    需要列：gender, age, height, weight, neck, waist；可选列：hip, activity, goal。
+    """
+    columns = set(df.columns) if hasattr(df, "columns") else set(df.keys())
+    optional = {k: df[k] for k in ("hip", "activity", "goal") if k in columns}
+    return calculate_batch(df["gender"], df["age"], df["height"], df["weight"],
+                           df["neck"], df["waist"], log10=log10, **optional)
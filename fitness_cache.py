@@ -0,0 +1,81 @@
+"""
+进程级计算缓存：相同输入（性别/年龄/身高/体重/颈围/腰围/臀围/活动/目标）直接复用上次结果。
+
+Streamlit 每次交互都会重新执行 app.py，但本模块只导入一次，缓存由所有会话共享。
+缓存采用 LRU 淘汰，容量可通过环境变量 FITNESS_CACHE_SIZE 或 configure_cache() 设置。
+"""
+import os
+from functools import lru_cache
+
+from fitness import FitnessCalculator
+
+DEFAULT_CACHE_SIZE = int(os.environ.get("FITNESS_CACHE_SIZE", 1024))
+
+
+def normalize_inputs(gender, age, height, weight, neck, waist, hip, activity, goal):
+    """把页面输入规整成缓存 key（与 FitnessCalculator 的类型转换一致）"""
+    gender = gender.lower()
+    hip = float(hip) if gender != "male" else 0.0  # 男性公式不使用臀围
+    return (gender, int(age), float(height), float(weight), float(neck), float(waist), hip, activity, goal)
+
+
+def _compute_plan(key):
+    gender, age, height, weight, neck, waist, hip, activity, goal = key
+    calc = FitnessCalculator(gender, age, height, weight, neck, waist, hip)
+    bfp = calc.calculate_body_fat()
+    tdee = calc.calculate_tdee(activity)
+    plan = calc.nutrition_plan(tdee, goal)
+    return bfp, tdee, tuple(plan.items())
+
+
+def _build_macro_frames(protein, fat, carbs):
+    import pandas as pd  # 延迟加载：批处理/服务进程不需要 pandas
+
+    macro_data = pd.DataFrame({
+        '营养素': ['蛋白质 (Protein)', '脂肪 (Fat)', '碳水 (Carbs)'],
+        '重量 (g)': [protein, fat, carbs],
+        '热量占比': [protein * 4, fat * 9, carbs * 4]  # 粗略估算用于饼图
+    })
+    return macro_data, macro_data[['营养素', '重量 (g)']]
+
+
+_plan_cache = lru_cache(maxsize=DEFAULT_CACHE_SIZE)(_compute_plan)
+_frame_cache = lru_cache(maxsize=DEFAULT_CACHE_SIZE)(_build_macro_frames)
+
+
+def configure_cache(maxsize):
+    """重新设置缓存容量（会清空已有缓存）"""
+    global _plan_cache, _frame_cache
+    _plan_cache = lru_cache(maxsize=maxsize)(_compute_plan)
+    _frame_cache = lru_cache(maxsize=maxsize)(_build_macro_frames)
+
+
+def clear_cache():
+    _plan_cache.cache_clear()
+    _frame_cache.cache_clear()
+
+
+def cache_stats():
+    """返回两级缓存的命中/未命中次数与当前大小"""
+    stats = {}
+    for name, cache in (("plan", _plan_cache), ("macro_data", _frame_cache)):
+        info = cache.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+    return stats
+
+
+def compute_plan(gender, age, height, weight, neck, waist, hip, activity, goal):
+    """
+    带缓存地计算 (体脂率, TDEE, 营养计划)。
+    输入无效时与 FitnessCalculator 一样抛出 ValueError（异常结果不缓存）。
+    """
+    bfp, tdee, plan = _plan_cache(normalize_inputs(gender, age, height, weight, neck, waist, hip, activity, goal))
+    return bfp, tdee, dict(plan)
+
+
+def macro_frames(plan):
+    """
+    带缓存地构造图表用的 macro_data 及表格视图 (macro_data, 营养素/重量两列)。
+    返回的 DataFrame 在会话间共享，调用方不要原地修改。
+    """
+    return _frame_cache(plan['Protein'], plan['Fat'], plan['Carbs'])
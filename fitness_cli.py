@@ -0,0 +1,176 @@
+"""
+无界面批处理入口：按块读取会员文件，计算体脂/TDEE/营养计划，流式写出结果。
+
+用法：
+    python fitness_cli.py members.csv results.jsonl --chunksize 100000
+    python fitness_cli.py members.parquet results.parquet --activity Light
+
+支持 .csv / .jsonl / .parquet（Parquet 需要安装 pyarrow）。
+输入必须包含列 gender, age, height, weight, neck, waist；hip, activity, goal 可选。
+age / height / weight 缺失（空值、NaN）的行与围度不合理的行一样记为 valid=False，体脂与 BMR 留空，整数字段为 0。
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from fitness_batch import calculate_frame
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# 写入输出文件的计算字段（valid=False 的行体脂为空）
+RESULT_COLUMNS = ["body_fat", "bmr", "tdee", "calories", "protein", "fat", "carbs", "valid"]
+# 计算 BMR 用到的列：缺失时转成整数会得到任意值，这些行整行记为无效
+ENERGY_INPUTS = ("age", "height", "weight")
+
+
+def _file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".csv", ".txt"):
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    raise ValueError(f"不支持的文件格式：{path}（仅支持 csv / jsonl / parquet）")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("读写 Parquet 需要安装 pyarrow：pip install pyarrow") from None
+    return pq
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """按块读取输入文件，每次产出一个不超过 chunksize 行的 DataFrame"""
+    fmt = _file_format(path)
+    if fmt == "csv":
+        yield from pd.read_csv(path, chunksize=chunksize)
+    elif fmt == "jsonl":
+        yield from pd.read_json(path, lines=True, chunksize=chunksize)
+    else:
+        pq = _require_pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+
+
+def prepare_chunk(df, activity="Sedentary", goal="维持 (Maintain)"):
+    """补齐可选列（hip / activity / goal），返回新的 DataFrame"""
+    df = df.copy()
+    if "hip" not in df.columns:
+        df["hip"] = 0.0
+    if "activity" not in df.columns:
+        df["activity"] = activity
+    if "goal" not in df.columns:
+        df["goal"] = goal
+    df["hip"] = df["hip"].fillna(0.0)
+    return df
+
+
+def missing_rows(df):
+    """age / height / weight 缺失或不是有限数的行（布尔数组）"""
+    missing = np.zeros(len(df), dtype=bool)
+    for col in ENERGY_INPUTS:
+        missing |= ~np.isfinite(df[col].to_numpy(dtype=np.float64, na_value=np.nan))
+    return missing
+
+
+def fill_missing(df, missing):
+    """计算用的副本：缺失行的 age / height / weight 填 0，避免 NaN 转整数（结果随后由 mark_missing 覆盖）"""
+    if not missing.any():
+        return df
+    return df.assign(**{col: df[col].where(~missing, 0) for col in ENERGY_INPUTS})
+
+
+def mark_missing(df, missing):
+    """把缺失行的结果记为无效：体脂与 BMR 为空，整数字段为 0"""
+    if missing.any():
+        df.loc[missing, ["body_fat", "bmr"]] = np.nan
+        df.loc[missing, ["tdee", "calories", "protein", "fat", "carbs"]] = 0
+        df.loc[missing, "valid"] = False
+    return df
+
+
+def process_chunk(df, activity="Sedentary", goal="维持 (Maintain)"):
+    """对一个块计算并把结果列追加到原数据后面"""
+    df = prepare_chunk(df, activity, goal)
+    missing = missing_rows(df)
+    results = calculate_frame(fill_missing(df, missing))
+    for col in RESULT_COLUMNS:
+        df[col] = results[col]
+    return mark_missing(df, missing)
+
+
+class ChunkWriter:
+    """流式写出：每个块写完即释放，内存占用只与块大小有关"""
+
+    def __init__(self, path):
+        self.path = path
+        self.fmt = _file_format(path)
+        self._first = True
+        self._parquet = None
+
+    def write(self, df):
+        if self.fmt == "csv":
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        elif self.fmt == "jsonl":
+            with open(self.path, "w" if self._first else "a", encoding="utf-8") as f:
+                df.to_json(f, orient="records", lines=True, force_ascii=False)
+        else:
+            pq = _require_pyarrow()
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def process_file(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE,
+                 activity="Sedentary", goal="维持 (Maintain)"):
+    """处理整个文件，返回 (总行数, 无效行数)"""
+    total = invalid = 0
+    with ChunkWriter(output_path) as writer:
+        for chunk in read_chunks(input_path, chunksize):
+            out = process_chunk(chunk, activity, goal)
+            writer.write(out)
+            total += len(out)
+            invalid += int((~out["valid"]).sum())
+    return total, invalid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量计算体脂、TDEE 与营养计划（无需启动 Streamlit）")
+    parser.add_argument("input", help="输入文件 (.csv / .jsonl / .parquet)")
+    parser.add_argument("output", help="输出文件 (.csv / .jsonl / .parquet)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="每块行数")
+    parser.add_argument("--activity", default="Sedentary", help="输入缺少 activity 列时的默认活动水平")
+    parser.add_argument("--goal", default="维持 (Maintain)", help="输入缺少 goal 列时的默认目标")
+    args = parser.parse_args(argv)
+
+    try:
+        total, invalid = process_file(args.input, args.output, args.chunksize, args.activity, args.goal)
+    except (ValueError, ImportError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"✅ 已处理 {total} 行，其中 {invalid} 行数据无效（例如腰围不大于颈围、年龄缺失）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+增量重算：根据上次的结果和本次变化的字段，只重算受影响的输出。
+
+依赖关系（体脂与体重无关，所以每天只更新体重时不需要重算两次 log10）：
+    body_fat <- gender, height, neck, waist, hip
+    bmr      <- gender, age, height, weight
+    tdee     <- bmr, activity
+    plan     <- tdee, weight, goal
+
+单人：
+    result = evaluate({"gender": "Male", "age": 25, "height": 175, "weight": 70,
+                       "neck": 38, "waist": 80, "hip": 0, "activity": "Light", "goal": "减脂 (Cut)"})
+    result = update(result, {"weight": 69.4})   # 只重算 bmr / tdee / plan
+
+批量：
+    state = evaluate_batch(**columns)
+    state = update_batch(state, {"weight": new_weights}, rows)   # state["results"] 为最新结果
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from fitness import FitnessCalculator, tdee_from_bmr
+from fitness_batch import (_column, activity_factors, batch_body_fat, calculate_arrays, energy_arrays,
+                           goal_factors, male_mask)
+
+INPUT_FIELDS = ("gender", "age", "height", "weight", "neck", "waist", "hip", "activity", "goal")
+
+# 每个输出直接依赖的字段（可以是输入，也可以是其他输出），按计算顺序排列
+DEPENDENCIES = {
+    "body_fat": {"gender", "height", "neck", "waist", "hip"},
+    "bmr": {"gender", "age", "height", "weight"},
+    "tdee": {"bmr", "activity"},
+    "plan": {"tdee", "weight", "goal"},
+}
+OUTPUTS = tuple(DEPENDENCIES)
+
+
+def affected_outputs(changed):
+    """给定变化的输入字段，返回需要重算的输出集合（沿依赖链传递）"""
+    return _affected(frozenset(changed))
+
+
+@lru_cache(maxsize=None)
+def _affected(changed):
+    dirty = set(changed)
+    affected = set()
+    for output in OUTPUTS:
+        if DEPENDENCIES[output] & dirty:
+            affected.add(output)
+            dirty.add(output)
+    return frozenset(affected)
+
+
+def _recompute(inputs, previous, targets):
+    result = {"inputs": inputs}
+    for output in OUTPUTS:
+        if output not in targets:
+            result[output] = previous[output]
+
+    calc = FitnessCalculator(inputs["gender"], inputs["age"], inputs["height"], inputs["weight"],
+                             inputs["neck"], inputs["waist"], inputs.get("hip", 0))
+    if "body_fat" in targets:
+        try:
+            result["body_fat"] = calc.calculate_body_fat()
+        except ValueError:
+            result["body_fat"] = None  # 与页面一致：围度不合理时没有体脂结果
+    if "bmr" in targets:
+        result["bmr"] = calc.calculate_bmr()
+    if "tdee" in targets:
+        result["tdee"] = tdee_from_bmr(result["bmr"], inputs["activity"])
+    if "plan" in targets:
+        result["plan"] = calc.nutrition_plan(result["tdee"], inputs["goal"])
+    result["recomputed"] = tuple(o for o in OUTPUTS if o in targets)
+    return result
+
+
+def evaluate(inputs):
+    """完整计算一次，返回可供 update() 使用的结果"""
+    inputs = {"hip": 0, "activity": "Sedentary", "goal": "维持 (Maintain)", **inputs}
+    return _recompute(inputs, {}, set(OUTPUTS))
+
+
+def update(previous, delta):
+    """在上次结果的基础上应用字段变化，只重算受影响的输出"""
+    inputs = {**previous["inputs"], **delta}
+    return _recompute(inputs, previous, affected_outputs(delta))
+
+
+# --- 批量增量 ---
+
+TEXT_FIELDS = {"gender", "activity", "goal"}
+
+# delta 覆盖的行超过该比例时直接整列重算受影响的输出，比先取子集再写回更快
+FULL_RECOMPUTE_SHARE = 0.5
+
+
+def _derive(field, values, n):
+    """文本字段 -> 计算用的数值列（性别掩码 / 活动系数 / 目标系数）"""
+    if field == "gender":
+        return male_mask(values, n)
+    if field == "activity":
+        return activity_factors(values, n)
+    return goal_factors(values, n)
+
+
+def evaluate_batch(**inputs):
+    """
+    批量完整计算一次，返回增量状态 {"inputs", "derived", "results"}。
+    derived 保存文本字段转换后的数值列，之后只有对应字段变化时才重新转换。
+    """
+    n = len(inputs["weight"])
+    inputs = {"hip": 0.0, "activity": "Sedentary", "goal": "维持 (Maintain)", **inputs}
+    cols = {f: np.asarray(inputs[f]) if f in TEXT_FIELDS else _column(inputs[f], n) for f in INPUT_FIELDS}
+    derived = {f: np.array(_derive(f, cols[f], n)) for f in TEXT_FIELDS}
+    derived["age"] = cols["age"].astype(np.int64)
+    results = calculate_arrays(derived["gender"], derived["age"], cols["height"], cols["weight"], cols["neck"],
+                               cols["waist"], cols["hip"], derived["activity"], derived["goal"])
+    return {"inputs": cols, "derived": derived, "results": results}
+
+
+def update_batch(state, delta, rows=None):
+    """
+    批量增量更新。
+    state : evaluate_batch / update_batch 返回的状态；
+    delta : 只包含发生变化的字段，例如 {"weight": 新体重}；
+    rows  : delta 对应的行号（None 表示 delta 是整列）。
+    只对 rows 重算 delta 影响到的输出，返回新的状态，原状态中的数组不会被修改。
+    """
+    n = len(state["results"]["body_fat"])
+    targets = affected_outputs(delta)
+    where = slice(None) if rows is None else rows
+    inputs, derived, results = dict(state["inputs"]), dict(state["derived"]), dict(state["results"])
+
+    for field, values in delta.items():
+        column = inputs[field]
+        if field in TEXT_FIELDS:
+            column = np.broadcast_to(column, (n,)) if column.ndim == 0 else column
+            # 新值比原列的定长字符串更长时先放宽类型，避免被截断
+            column = column.astype(np.result_type(column, np.asarray(values)))
+            column[where] = values
+            derived[field] = derived[field].copy()
+            derived[field][where] = _derive(field, np.asarray(values), len(column[where]))
+        else:
+            column = column.copy()
+            column[where] = values
+            if field == "age":
+                derived["age"] = derived["age"].copy()
+                derived["age"][where] = column[where].astype(np.int64)
+        inputs[field] = column
+
+    if rows is None or len(rows) > FULL_RECOMPUTE_SHARE * n:
+        sel = slice(None)
+    else:
+        sel = rows
+    take = lambda arr: arr[sel]
+
+    if "body_fat" in targets:
+        bfp, valid = batch_body_fat(take(derived["gender"]), take(inputs["height"]), take(inputs["neck"]),
+                                    take(inputs["waist"]), take(inputs["hip"]))
+        for key, values in (("body_fat", bfp), ("valid", valid)):
+            results[key] = results[key].copy()
+            results[key][sel] = values
+
+    # bmr / tdee / plan 都是几次乘加，只要有一项受影响就一起重算
+    if targets & {"bmr", "tdee", "plan"}:
+        energy = energy_arrays(take(derived["gender"]), take(derived["age"]), take(inputs["height"]),
+                               take(inputs["weight"]), take(derived["activity"]), take(derived["goal"]))
+        for key, values in energy.items():
+            results[key] = results[key].copy()
+            results[key][sel] = values
+
+    return {"inputs": inputs, "derived": derived, "results": results}
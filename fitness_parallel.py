@@ -0,0 +1,237 @@
+"""
+多进程批量重算：把会员数据放进共享内存，按分片交给进程池计算，结果直接写回共享内存。
+
+    python fitness_parallel.py members.parquet results.parquet --workers 32 --shard-size 200000
+
+流程（文件只读一遍，内存占用只与块大小和进程数有关，与文件大小无关）：
+1. 共享内存分成若干个“槽”，每个槽容纳一个输入块；按块读取输入，直接编码进空闲槽
+   （性别 -> 布尔，活动/目标 -> 系数）；
+2. 每个 worker 只收到 (起始行, 结束行)，直接在共享内存上计算并写回结果列，不 pickle 任何行数据；
+3. 块按读入顺序出队：等它的分片算完，把槽里的结果列拼到该块上流式写出，槽随即复用。
+   主进程读、编码、写出的同时，进程池在计算后面的块。
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from fitness_batch import activity_factors, calculate_arrays, goal_factors, male_mask
+from fitness_cli import (DEFAULT_CHUNKSIZE, RESULT_COLUMNS, ChunkWriter, fill_missing, mark_missing,
+                         missing_rows, prepare_chunk, read_chunks)
+
+DEFAULT_SHARD_SIZE = 100_000
+
+# 共享内存中的输入 / 输出列
+INPUT_DTYPES = {
+    "is_male": np.bool_,
+    "age": np.int64,
+    "height": np.float64,
+    "weight": np.float64,
+    "neck": np.float64,
+    "waist": np.float64,
+    "hip": np.float64,
+    "activity_factor": np.float64,
+    "goal_factor": np.float64,
+}
+OUTPUT_DTYPES = {
+    "body_fat": np.float64,
+    "bmr": np.float64,
+    "tdee": np.int64,
+    "calories": np.int64,
+    "protein": np.int64,
+    "fat": np.int64,
+    "carbs": np.int64,
+    "valid": np.bool_,
+}
+
+
+class SharedColumns:
+    """一组放在共享内存中的等长 numpy 列；handles 可以传给其他进程重新挂载"""
+
+    def __init__(self, blocks, n, dtypes):
+        self._blocks = blocks
+        self.n = n
+        self.arrays = {
+            name: np.ndarray((n,), dtype=dtypes[name], buffer=shm.buf) for name, shm in blocks.items()
+        }
+
+    @classmethod
+    def create(cls, n, dtypes):
+        blocks = {
+            name: SharedMemory(create=True, size=max(1, n * np.dtype(dt).itemsize))
+            for name, dt in dtypes.items()
+        }
+        return cls(blocks, n, dtypes)
+
+    @classmethod
+    def attach(cls, handles):
+        n, names = handles
+        blocks = {name: SharedMemory(name=shm_name) for name, (shm_name, _) in names.items()}
+        return cls(blocks, n, {name: dt for name, (_, dt) in names.items()})
+
+    @property
+    def handles(self):
+        return self.n, {name: (shm.name, self.arrays[name].dtype.str) for name, shm in self._blocks.items()}
+
+    def close(self):
+        self.arrays = {}
+        for shm in self._blocks.values():
+            shm.close()
+
+    def unlink(self):
+        for shm in self._blocks.values():
+            shm.unlink()
+
+
+# --- worker 进程 ---
+
+_worker_inputs = None
+_worker_outputs = None
+
+
+def _init_worker(input_handles, output_handles):
+    global _worker_inputs, _worker_outputs
+    _worker_inputs = SharedColumns.attach(input_handles)
+    _worker_outputs = SharedColumns.attach(output_handles)
+
+
+def _compute_shard(bounds):
+    start, stop = bounds
+    _compute_range(_worker_inputs.arrays, _worker_outputs.arrays, start, stop)
+    return stop - start
+
+
+def _compute_range(inputs, outputs, start, stop):
+    cols = {name: arr[start:stop] for name, arr in inputs.items()}
+    results = calculate_arrays(
+        cols["is_male"], cols["age"], cols["height"], cols["weight"], cols["neck"],
+        cols["waist"], cols["hip"], cols["activity_factor"], cols["goal_factor"],
+    )
+    for name, arr in outputs.items():
+        arr[start:stop] = results[name]
+
+
+# --- 主进程 ---
+
+def encode_into(df, arrays, start):
+    """把一个块编码后直接写进共享内存列的 [start, start + len(df)) 区间"""
+    n = len(df)
+    stop = start + n
+    arrays["is_male"][start:stop] = male_mask(df["gender"], n)
+    arrays["age"][start:stop] = np.asarray(df["age"], dtype=np.float64)
+    for name in ("height", "weight", "neck", "waist", "hip"):
+        arrays[name][start:stop] = np.asarray(df[name], dtype=np.float64)
+    arrays["activity_factor"][start:stop] = activity_factors(df["activity"], n)
+    arrays["goal_factor"][start:stop] = goal_factors(df["goal"], n)
+
+
+def process_file_parallel(input_path, output_path, workers=None, shard_size=DEFAULT_SHARD_SIZE,
+                          chunksize=DEFAULT_CHUNKSIZE, activity="Sedentary", goal="维持 (Maintain)",
+                          progress=None):
+    """
+    与 fitness_cli.process_file 输出相同，计算部分由进程池完成。返回 (总行数, 无效行数)。
+    progress(done_rows, None) 在每个块写出后被调用（总行数事先未知）。
+    """
+    workers = workers or os.cpu_count() or 1
+    shard_size = max(1, min(shard_size, chunksize))
+    shards_per_chunk = -(-chunksize // shard_size)
+    # 槽数：让进程池始终有活可干，同时主进程可以读下一块、写上一块
+    slots = max(2, -(-workers // shards_per_chunk) + 1)
+    inputs = SharedColumns.create(slots * chunksize, INPUT_DTYPES)
+    outputs = SharedColumns.create(slots * chunksize, OUTPUT_DTYPES)
+    pool = Pool(workers, initializer=_init_worker, initargs=(inputs.handles, outputs.handles)) if workers > 1 else None
+    pending = deque()      # (块, 缺失行掩码, 槽起始行, 各分片的 AsyncResult)
+    free = deque(range(0, slots * chunksize, chunksize))
+    total = invalid = 0
+
+    def flush_oldest(writer):
+        nonlocal total, invalid
+        out, missing, start, jobs = pending.popleft()
+        for job in jobs:
+            job.get()
+        stop = start + len(out)
+        for col in RESULT_COLUMNS:
+            out[col] = outputs.arrays[col][start:stop]
+        mark_missing(out, missing)
+        invalid += int((~out["valid"]).sum())
+        writer.write(out)
+        total += len(out)
+        free.append(start)
+        if progress:
+            progress(total, None)
+
+    try:
+        with ChunkWriter(output_path) as writer:
+            for chunk in read_chunks(input_path, chunksize):
+                if not free:
+                    flush_oldest(writer)
+                out = prepare_chunk(chunk, activity, goal)
+                missing = missing_rows(out)
+                start = free.popleft()
+                encode_into(fill_missing(out, missing), inputs.arrays, start)
+                bounds = [(s, min(s + shard_size, start + len(out))) for s in range(start, start + len(out), shard_size)]
+                if pool is None:
+                    for lo, hi in bounds:
+                        _compute_range(inputs.arrays, outputs.arrays, lo, hi)
+                    jobs = []
+                else:
+                    jobs = [pool.apply_async(_compute_shard, (b,)) for b in bounds]
+                pending.append((out, missing, start, jobs))
+            while pending:
+                flush_oldest(writer)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        for block in (inputs, outputs):
+            block.close()
+            block.unlink()
+    return total, invalid
+
+
+class ProgressPrinter:
+    """在 stderr 上原地刷新进度行"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+
+    def __call__(self, done, total=None):
+        # 流水线处理时总行数事先未知，只显示已完成的行数和速度
+        elapsed = time.perf_counter() - self.start
+        rate = done / elapsed if elapsed else 0
+        print(f"\r进度 {done} 行 · {rate:,.0f} 行/s · {elapsed:.1f}s", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="多进程批量重算体脂、TDEE 与营养计划")
+    parser.add_argument("input", help="输入文件 (.csv / .jsonl / .parquet)")
+    parser.add_argument("output", help="输出文件 (.csv / .jsonl / .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认 CPU 核数）")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="每个分片的行数")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="读写文件时每块行数")
+    parser.add_argument("--activity", default="Sedentary", help="输入缺少 activity 列时的默认活动水平")
+    parser.add_argument("--goal", default="维持 (Maintain)", help="输入缺少 goal 列时的默认目标")
+    parser.add_argument("--quiet", action="store_true", help="不显示进度")
+    args = parser.parse_args(argv)
+
+    try:
+        total, invalid = process_file_parallel(
+            args.input, args.output, args.workers, args.shard_size, args.chunksize,
+            args.activity, args.goal, progress=None if args.quiet else ProgressPrinter(),
+        )
+    except (ValueError, ImportError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"✅ 已处理 {total} 行，其中 {invalid} 行数据无效（例如腰围不大于颈围、年龄缺失）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""
+本地 HTTP/JSON 服务：把 FitnessCalculator 的计算暴露给移动端后台，无需 Streamlit。
+
+    python fitness_service.py --port 8765 --window-ms 2
+
+接口：
+    POST /v1/plan        单个会员 {"gender": "Male", "age": 25, "height": 175, ...}
+    POST /v1/plan/bulk   批量 {"members": [{...}, {...}]}
+    GET  /metrics        Prometheus 文本格式的延迟直方图与批处理统计
+    GET  /healthz        健康检查
+
+同一时间窗口（默认 2 ms）内到达的单个请求会合并成一次向量化批量计算。
+连接默认 keep-alive（HTTP/1.1）。只依赖标准库 asyncio 和 numpy。
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fitness import ACTIVITY_MULTIPLIERS, GOAL_ADJUSTMENTS
+from fitness_batch import calculate_batch
+from metrics import LatencyHistogram
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MAX_BATCH = 512
+
+KEEPALIVE_TIMEOUT = 15.0      # 空闲连接保持秒数
+MAX_BODY_BYTES = 8 * 1024 * 1024
+BULK_EXECUTOR_THRESHOLD = 2048  # 超过该行数的批量请求放到线程池计算，不阻塞事件循环
+
+REQUIRED_FIELDS = ("gender", "age", "height", "weight", "neck", "waist")
+# 数值字段的取值范围（含端点）；NaN / Infinity / 超大整数一律视为格式错误。hip 男性可省略，默认 0
+FIELD_RANGES = {"age": (0, 150), "height": (0, 300), "weight": (0, 700),
+                "neck": (0, 300), "waist": (0, 300), "hip": (0, 300)}
+
+# 延迟直方图只按已知路径分组，其他路径（404 等）统一记为 "other"，避免扫描器制造无限多的序列
+ROUTES = ("/v1/plan", "/v1/plan/bulk", "/metrics", "/healthz")
+OTHER_ROUTE = "other"
+
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+# --- 输入校验与批量计算 ---
+
+def parse_member(obj):
+    """校验单个会员的 JSON，返回规整后的 dict；格式错误抛 ValueError"""
+    if not isinstance(obj, dict):
+        raise ValueError("每个会员必须是 JSON 对象")
+    missing = [k for k in REQUIRED_FIELDS if k not in obj]
+    if missing:
+        raise ValueError(f"缺少字段：{', '.join(missing)}")
+    member = {"gender": str(obj["gender"])}
+    for key, (low, high) in FIELD_RANGES.items():
+        value = obj.get(key, 0)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{key} 必须是数字")
+        if not low <= value <= high:  # NaN 的比较恒为 False，也在这里被拒绝
+            raise ValueError(f"{key} 超出范围 [{low}, {high}]：{value}")
+        member[key] = value
+    member["activity"] = str(obj.get("activity", "Sedentary"))
+    member["goal"] = str(obj.get("goal", "维持 (Maintain)"))
+    if member["activity"] not in ACTIVITY_MULTIPLIERS:
+        raise ValueError(f"未知的 activity：{member['activity']}")
+    if member["goal"] not in GOAL_ADJUSTMENTS:
+        raise ValueError(f"未知的 goal：{member['goal']}")
+    return member
+
+
+def compute_members(members):
+    """对已校验的会员列表做一次向量化计算，按顺序返回每人的结果 dict"""
+    if not members:
+        return []
+    columns = {k: [m[k] for m in members] for k in members[0]}
+    r = calculate_batch(**columns)
+    results = []
+    for i in range(len(members)):
+        valid = bool(r["valid"][i])
+        results.append({
+            "valid": valid,
+            "body_fat": float(r["body_fat"][i]) if valid else None,
+            "bmr": float(r["bmr"][i]),
+            "tdee": int(r["tdee"][i]),
+            "calories": int(r["calories"][i]),
+            "protein": int(r["protein"][i]),
+            "fat": int(r["fat"][i]),
+            "carbs": int(r["carbs"][i]),
+        })
+    return results
+
+
+class MicroBatcher:
+    """把时间窗口内到达的单个请求合并成一次批量计算"""
+
+    def __init__(self, window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending = []
+        self._timer = None
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, member):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((member, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = compute_members([m for m, _ in batch])
+        except Exception:  # 批量计算失败时逐个重算，只让出错的会员拿到异常，不连累同批的其他请求
+            for member, future in batch:
+                try:
+                    result = compute_members([member])[0]
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# --- HTTP 服务 ---
+
+class FitnessService:
+    def __init__(self, window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH):
+        self.batcher = MicroBatcher(window_ms, max_batch)
+        self.latency = {}
+        self.connections = 0
+        self._server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                headers, malformed = {}, len(parts) != 3 or not parts[2].startswith("HTTP/")
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, sep, value = line.decode("latin-1").partition(":")
+                    if not sep or not key.strip():
+                        malformed = True
+                    headers[key.strip().lower()] = value.strip()
+                length = headers.get("content-length", "0")
+                if malformed or not length.isdigit():
+                    await self._respond(writer, 400, {"error": "请求行或请求头格式错误"}, keep_alive=False)
+                    break
+                method, path, version = parts
+                length = int(length)
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "请求体过大"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                start = time.perf_counter()
+                route = path.split("?", 1)[0]
+                status, payload = await self._dispatch(method, route, body)
+                await self._respond(writer, status, payload, keep_alive)
+                self._observe(route, status, (time.perf_counter() - start) * 1000)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body = payload.encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if keep_alive:
+            head += f"Keep-Alive: timeout={int(KEEPALIVE_TIMEOUT)}\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+
+    async def _dispatch(self, method, route, body):
+        handlers = {
+            "/v1/plan": ("POST", self._plan),
+            "/v1/plan/bulk": ("POST", self._bulk),
+            "/metrics": ("GET", self._metrics),
+            "/healthz": ("GET", self._health),
+        }
+        if route not in handlers:
+            return 404, {"error": f"未知路径：{route}"}
+        expected, handler = handlers[route]
+        if method != expected:
+            return 405, {"error": f"{route} 只支持 {expected}"}
+        try:
+            return 200, await handler(json.loads(body) if body else None)
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def _plan(self, data):
+        return await self.batcher.submit(parse_member(data))
+
+    async def _bulk(self, data):
+        if not isinstance(data, dict) or not isinstance(data.get("members"), list):
+            raise ValueError('请求体必须形如 {"members": [...]}')
+        members = [parse_member(m) for m in data["members"]]
+        if len(members) > BULK_EXECUTOR_THRESHOLD:
+            results = await asyncio.get_running_loop().run_in_executor(None, compute_members, members)
+        else:
+            results = compute_members(members)
+        return {"results": results}
+
+    async def _metrics(self, _):
+        return self.metrics_text()
+
+    async def _health(self, _):
+        return {"status": "ok"}
+
+    def _observe(self, route, status, ms):
+        key = (route if route in ROUTES else OTHER_ROUTE, status)
+        if key not in self.latency:
+            self.latency[key] = LatencyHistogram()
+        self.latency[key].observe(ms)
+
+    def metrics_text(self):
+        lines = ["# TYPE fitness_request_duration_seconds histogram"]
+        for (route, status), hist in sorted(self.latency.items()):
+            lines += hist.prometheus_lines("fitness_request_duration_seconds", f'route="{route}",status="{status}"')
+        lines += [
+            "# TYPE fitness_batches_total counter",
+            f"fitness_batches_total {self.batcher.batches}",
+            "# TYPE fitness_batched_items_total counter",
+            f"fitness_batched_items_total {self.batcher.items}",
+            "# TYPE fitness_open_connections gauge",
+            f"fitness_open_connections {self.connections}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+async def _serve(args):
+    service = FitnessService(args.window_ms, args.max_batch)
+    host, port = await service.start(args.host, args.port)
+    print(f"✅ 服务已启动：http://{host}:{port}", flush=True)
+    await service.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FitnessCalculator 本地 HTTP/JSON 服务")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW_MS, help="合并单个请求的时间窗口")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="单次合并的最大请求数")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
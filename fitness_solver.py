@@ -0,0 +1,164 @@
+"""
+反向求解：给定目标体脂率 / 目标热量，反推需要的腰围、体重或目标设定。全部按列向量化。
+
+- 体脂（US Navy）只依赖围度和身高，与体重无关，可以闭式求解需要的腰围：
+      男：log10(腰 - 颈)      = (1.0324  + 0.15456 * log10(身高) - 495 / (体脂 + 450)) / 0.19077
+      女：log10(腰 + 臀 - 颈) = (1.29579 + 0.22100 * log10(身高) - 495 / (体脂 + 450)) / 0.35004
+- 推荐热量对体重是分段函数：正常情况下 ≈ (10w + c) × 活动系数 × 目标系数，
+  热量不够分配时触发碳水保底，变成 ≈ 15.2w + 200（蛋白 2g/kg×4 + 脂肪 0.8g/kg×9 + 50g×4）。
+  对两段分别闭式求出候选体重，再在 0.1 kg 网格上用正向公式校验附近的点，保证结果与 FitnessCalculator 一致。
+"""
+import numpy as np
+
+from fitness import CARB_FLOOR_G, GOAL_ADJUSTMENTS
+from fitness_batch import _column, batch_body_fat, energy_arrays
+
+DEFAULT_RESOLUTION = 0.1           # 测量精度（cm / kg）
+DEFAULT_WEIGHT_RANGE = (30.0, 250.0)
+_NEIGHBOURS = 6                    # 每个闭式候选两侧校验的网格点数
+_SWITCH_NEIGHBOURS = 30            # 分支交界处蛋白/脂肪取整造成锯齿，校验范围放宽到 ±3 kg
+
+# 碳水保底分支下热量对体重的斜率：2×4 + 0.8×9
+_FLOOR_SLOPE = 2.0 * 4 + 0.8 * 9
+
+
+def circumference_for_body_fat(is_male, height, target_bfp):
+    """
+    达到目标体脂所需的围度差：男性为 腰 - 颈，女性为 腰 + 臀 - 颈（连续值，cm）。
+    目标体脂不可达（公式分母非正）时为 NaN。
+    """
+    is_male = np.asarray(is_male, dtype=bool)
+    height = np.asarray(height, dtype=np.float64)
+    target = np.asarray(target_bfp, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv = 495 / (target + 450)
+        log_h = np.log10(height)
+        male = (1.0324 + 0.15456 * log_h - inv) / 0.19077
+        female = (1.29579 + 0.22100 * log_h - inv) / 0.35004
+        circ = 10 ** np.where(is_male, male, female)
+    return np.where((target + 450 > 0) & (height > 0), circ, np.nan)
+
+
+def waist_for_body_fat(is_male, height, neck, target_bfp, hip=0.0, resolution=DEFAULT_RESOLUTION):
+    """
+    达到目标体脂所需的腰围。resolution 为 None 时返回闭式连续解；
+    否则返回 resolution 网格上正向计算（四舍五入到 0.01）最接近目标的腰围，
+    相同误差时取离连续解最近的点。
+    """
+    is_male = np.asarray(is_male, dtype=bool)
+    n = is_male.size
+    height, neck, hip = _column(height, n), _column(neck, n), _column(hip, n)
+    target = _column(target_bfp, n)
+    waist = circumference_for_body_fat(is_male, height, target) + neck - np.where(is_male, 0.0, hip)
+    if resolution is None:
+        return waist
+
+    offsets = np.arange(-_NEIGHBOURS, _NEIGHBOURS + 1) * resolution
+    cand = _snap(waist[:, None] + offsets[None, :], resolution)   # (n, k)
+    k = cand.shape[1]
+    rep = lambda a: np.repeat(a, k)
+    bfp, valid = batch_body_fat(rep(is_male), rep(height), rep(neck), cand.ravel(), rep(hip))
+    error = np.abs(bfp.reshape(n, k) - target[:, None])
+    error = np.where(valid.reshape(n, k), error, np.inf)
+    return _pick(cand, error, np.abs(cand - waist[:, None]))
+
+
+def _snap(values, resolution):
+    """对齐到 resolution 网格，并去掉浮点尾差（例如 70.10000000000001）"""
+    return np.round(np.round(values / resolution) * resolution, 6)
+
+
+def _pick(cand, error, tiebreak):
+    """每行取误差最小的候选；误差相同时取 tiebreak 最小的。全部无效的行返回 NaN"""
+    order = np.lexsort((tiebreak, error), axis=-1)[:, 0]
+    rows = np.arange(cand.shape[0])
+    best = cand[rows, order]
+    return np.where(np.isfinite(error[rows, order]), best, np.nan)
+
+
+def _bmr_base(is_male, age, height):
+    return (6.25 * height) - (5 * age) + np.where(is_male, 5, -161)
+
+
+def weight_for_calories(is_male, age, height, activity_factor, goal_factor, target_calories,
+                        current_weight=None, resolution=DEFAULT_RESOLUTION, weight_range=DEFAULT_WEIGHT_RANGE):
+    """
+    推荐热量 (nutrition_plan 的 Calories) 等于 target_calories 所需的体重，结果在 resolution 网格上。
+    两个分支（正常 / 碳水保底）及其交界各给出闭式候选，再用正向公式在候选附近校验；
+    无法精确命中时返回误差最小的体重，相同误差时优先接近 current_weight（未给出则取较小体重），
+    与 brute_force_weight 穷举的结果一致。
+    返回 (体重, 对应的推荐热量)。
+    """
+    is_male = np.asarray(is_male, dtype=bool)
+    n = is_male.size
+    age = _column(age, n).astype(np.int64)
+    height = _column(height, n)
+    act, goal = _column(activity_factor, n), _column(goal_factor, n)
+    target = _column(target_calories, n)
+
+    scale = act * goal
+    base = _bmr_base(is_male, age, height)
+    normal = (target / scale - base) / 10
+    floor = (target - CARB_FLOOR_G * 4) / _FLOOR_SLOPE
+    # 两段的交界：(10w + c) × 系数 = 15.2w。目标落在跳变的空档里时，最接近的热量就在这里
+    with np.errstate(divide="ignore", invalid="ignore"):
+        switch = base * scale / (_FLOOR_SLOPE - 10 * scale)
+    switch = np.where(np.isfinite(switch) & (switch > 0), switch, normal)
+    near = np.arange(-_NEIGHBOURS, _NEIGHBOURS + 1)
+    wide = np.arange(-_SWITCH_NEIGHBOURS, _SWITCH_NEIGHBOURS + 1)
+    # 校验窗口整体平移进 weight_range（而不是逐点截断）：目标超出范围时窗口不会塌成同一个端点
+    lo, hi = np.ceil(weight_range[0] / resolution - 1e-9), np.floor(weight_range[1] / resolution + 1e-9)
+    cand = np.concatenate([np.clip(np.nan_to_num(np.round(w / resolution), nan=lo), lo + offsets[-1],
+                                   max(lo + offsets[-1], hi - offsets[-1]))[:, None] + offsets
+                           for w, offsets in ((normal, near), (floor, near), (switch, wide))], axis=1)
+    cand = _snap(np.clip(cand, lo, hi) * resolution, resolution)
+    calories = _calories_grid(is_male, age, height, act, goal, cand)
+
+    error = np.abs(calories - target[:, None]).astype(np.float64)
+    tiebreak = cand if current_weight is None else np.abs(cand - _column(current_weight, n)[:, None])
+    weight = _pick(cand, error, tiebreak)
+    return weight, _calories_grid(is_male, age, height, act, goal, weight[:, None])[:, 0]
+
+
+def _calories_grid(is_male, age, height, act, goal, weights):
+    """对每个会员的一组候选体重 (n, k) 正向计算推荐热量"""
+    n, k = weights.shape
+    rep = lambda a: np.repeat(a, k)
+    energy = energy_arrays(rep(is_male), rep(age), rep(height), weights.ravel(), rep(act), rep(goal))
+    return energy["calories"].reshape(n, k)
+
+
+def goal_for_calories(tdee, weight, target_calories):
+    """三种目标中推荐热量最接近 target_calories 的目标（逐行），返回目标名数组"""
+    tdee = np.asarray(tdee, dtype=np.int64)
+    n = tdee.size
+    weight = _column(weight, n)
+    target = _column(target_calories, n)
+    goals = list(GOAL_ADJUSTMENTS)
+    protein = np.round(weight * 2.0)
+    fat = np.round(weight * 0.8)
+    consumed = protein * 4 + fat * 9
+    errors = []
+    for goal in goals:
+        calories = np.round(tdee * GOAL_ADJUSTMENTS[goal])
+        calories = np.where(calories - consumed < 0, consumed + CARB_FLOOR_G * 4, calories)
+        errors.append(np.abs(calories - target))
+    return np.array(goals, dtype=object)[np.argmin(np.stack(errors, axis=1), axis=1)]
+
+
+def brute_force_weight(is_male, age, height, activity_factor, goal_factor, target_calories,
+                       current_weight=None, resolution=DEFAULT_RESOLUTION, weight_range=DEFAULT_WEIGHT_RANGE):
+    """穷举 weight_range 内全部网格体重的参考实现（用于校验与基准对比）"""
+    is_male = np.asarray(is_male, dtype=bool)
+    n = is_male.size
+    age = _column(age, n).astype(np.int64)
+    height = _column(height, n)
+    act, goal = _column(activity_factor, n), _column(goal_factor, n)
+    target = _column(target_calories, n)
+    grid = _snap(np.arange(weight_range[0], weight_range[1] + resolution / 2, resolution), resolution)
+    cand = np.broadcast_to(grid, (n, grid.size))
+    calories = _calories_grid(is_male, age, height, act, goal, cand)
+    error = np.abs(calories - target[:, None]).astype(np.float64)
+    tiebreak = cand if current_weight is None else np.abs(cand - _column(current_weight, n)[:, None])
+    weight = _pick(cand, error, tiebreak)
+    return weight, _calories_grid(is_male, age, height, act, goal, weight[:, None])[:, 0]
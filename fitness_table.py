@@ -0,0 +1,131 @@
+"""
+查表版体脂计算：预先算好 0.1 cm 精度下所有围度/身高的 log10，计算时直接取表。
+
+    table = Log10Table.build()                 # 或 Log10Table.load("log10.npy") 以 mmap 方式共享
+    table.body_fat("male", 175.0, 38.0, 80.0)  # == FitnessCalculator(...).calculate_body_fat()
+    calculate_batch(..., log10=table.log10)    # 批量模式同样可用
+
+不在表内（超出范围或不是 0.1 cm 整数倍）的值自动退回直接计算；
+靠近 0.01 舍入边界的结果改用原公式复算，因此四舍五入后的结果与 FitnessCalculator 逐位一致。
+
+注意：在 log10 有 SIMD/快速 libm 实现的 x86-64 机器上，直接计算通常不比查表慢，
+因此默认路径仍然直接计算，查表引擎需要显式启用。
+"""
+import math
+import os
+
+import numpy as np
+
+from fitness import FitnessCalculator
+from fitness_batch import _ROUND_EDGE_TOL, batch_body_fat
+
+# 默认量化精度（kiosk 只接受 0.1 cm）与覆盖范围
+DEFAULT_SCALE = 10
+DEFAULT_MAX_CM = 300.0
+
+# 输入与网格点的偏差小于该值（以格为单位）时视为落在网格上
+_GRID_TOL = 1e-6
+
+# 环境变量指定的表文件：各 worker 进程 mmap 同一个文件，共享操作系统页缓存
+TABLE_PATH_ENV = "FITNESS_LOG_TABLE"
+
+
+class Log10Table:
+    """
+    log10 查找表：values[k] = log10(k / scale)。
+    第 0 项不对应任何测量值（log10(0) 无意义），用来保存量化倍数 scale，
+    这样单个 .npy 文件即可完整描述一张表。
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.scale = float(values[0])
+        self._list = None  # 标量查表用的 Python 列表，按需生成
+
+    @classmethod
+    def build(cls, max_cm=DEFAULT_MAX_CM, scale=DEFAULT_SCALE):
+        """按 1/scale cm 精度生成 (0, max_cm] 的 log10 表（与 math.log10 逐位一致）"""
+        n = int(round(max_cm * scale)) + 1
+        values = np.empty(n, dtype=np.float64)
+        values[0] = scale
+        values[1:] = [math.log10(k / scale) for k in range(1, n)]
+        return cls(values)
+
+    def save(self, path):
+        """写入 .npy 文件（先写临时文件再替换，避免其他进程读到半张表）"""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.asarray(self.values))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """读取表文件；mmap=True 时以只读内存映射方式打开，多进程共享同一份物理内存"""
+        return cls(np.load(path, mmap_mode="r" if mmap else None))
+
+    def __len__(self):
+        return len(self.values) - 1
+
+    def log10(self, x):
+        """向量化 log10：网格上的值查表，其余（含 NaN / inf / 非正数 / 超出表范围）退回 np.log10"""
+        x = np.asarray(x, dtype=np.float64)
+        scaled = x * self.scale
+        k = np.rint(scaled)
+        # 先判定是否在表内再转整数：NaN / inf 转 intp 会得到任意值
+        with np.errstate(invalid="ignore"):
+            hit = (k >= 1) & (k < len(self.values)) & (np.abs(scaled - k) < _GRID_TOL)
+        idx = np.where(hit, k, 0).astype(np.intp)
+        out = np.take(self.values, idx)
+
+        miss = ~hit
+        if miss.any():
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[miss] = np.log10(x[miss])
+        return out
+
+    def log10_scalar(self, x):
+        """标量 log10：不在表内时调用 math.log10（非正数同样抛 ValueError）"""
+        if self._list is None:
+            self._list = np.asarray(self.values).tolist()
+        scaled = x * self.scale
+        k = round(scaled)
+        if 1 <= k < len(self._list) and abs(scaled - k) < _GRID_TOL:
+            return self._list[k]
+        return math.log10(x)
+
+    def body_fat(self, gender, height, neck, waist, hip=0):
+        """查表计算单人体脂率，结果与 FitnessCalculator.calculate_body_fat 相同"""
+        height, neck, waist, hip = float(height), float(neck), float(waist), float(hip)
+        if gender.lower() == 'male':
+            bfp = 495 / (1.0324 - 0.19077 * self.log10_scalar(waist - neck) + 0.15456 * self.log10_scalar(height)) - 450
+        else:
+            bfp = 495 / (1.29579 - 0.35004 * self.log10_scalar(waist + hip - neck) + 0.22100 * self.log10_scalar(height)) - 450
+
+        scaled = bfp * 100
+        if abs(scaled - math.floor(scaled) - 0.5) < _ROUND_EDGE_TOL:
+            return FitnessCalculator(gender, 0, height, 0, neck, waist, hip).calculate_body_fat()
+        return round(bfp, 2)
+
+    def batch_body_fat(self, is_male, height, neck, waist, hip):
+        """查表版 fitness_batch.batch_body_fat"""
+        return batch_body_fat(is_male, height, neck, waist, hip, log10=self.log10)
+
+
+_default_table = None
+
+
+def default_table():
+    """
+    进程内共享的默认表：设置了 FITNESS_LOG_TABLE 时从该文件 mmap 读取
+    （文件不存在则生成并写入，供其他 worker 复用），否则直接在内存中生成。
+    """
+    global _default_table
+    if _default_table is None:
+        path = os.environ.get(TABLE_PATH_ENV)
+        if path and os.path.exists(path):
+            _default_table = Log10Table.load(path)
+        else:
+            _default_table = Log10Table.build()
+            if path:
+                _default_table.save(path)
+    return _default_table
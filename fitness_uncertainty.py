@@ -0,0 +1,181 @@
+"""
+测量误差对结果的影响：给定各字段的测量误差（标准差），估计体脂 / BMR / TDEE / 营养计划的置信区间。
+
+两种方法：
+- monte_carlo：对每个会员按误差抽样 draws 次，用批量公式整块计算后取分位数（包含四舍五入、碳水保底等非线性）；
+- analytic：一阶误差传播（delta 方法），用解析梯度，一次计算即得，适合大队列快速筛查。
+
+    ci = monte_carlo(gender, age, height, weight, neck, waist, hip, activity, goal)
+    ci["body_fat"]["low"], ci["body_fat"]["high"]
+
+多个会员可以共用同一组标准正态抽样（RandomStreams），结果可复现且各会员之间可直接比较。
+"""
+import math
+import warnings
+from statistics import NormalDist
+
+import numpy as np
+
+from fitness_batch import _column, activity_factors, calculate_arrays, goal_factors, male_mask
+
+UNCERTAIN_FIELDS = ("height", "weight", "neck", "waist", "hip")
+
+# 默认测量误差（标准差）：软尺围度约 ±1 cm，身高 ±0.5 cm，体重 ±0.2 kg
+DEFAULT_ERRORS = {"height": 0.5, "weight": 0.2, "neck": 1.0, "waist": 1.0, "hip": 1.0}
+
+RESULT_FIELDS = ("body_fat", "bmr", "tdee", "calories", "protein", "fat", "carbs")
+
+DEFAULT_DRAWS = 10_000
+DEFAULT_LEVEL = 0.95
+# 每块最多计算的样本数（行 × 抽样次数），控制峰值内存
+CHUNK_SAMPLES = 2_000_000
+
+_LN10 = math.log(10)
+
+
+class RandomStreams:
+    """
+    预先生成的标准正态抽样，形状 (字段数, draws)，可在多个会员、多次调用之间复用。
+    共用抽样时每个会员的结果只取决于自身输入，便于复现和横向比较。
+    """
+
+    def __init__(self, draws=DEFAULT_DRAWS, seed=None):
+        rng = np.random.default_rng(seed)
+        self.draws = draws
+        self.normals = rng.standard_normal((len(UNCERTAIN_FIELDS), draws))
+
+    def field(self, name):
+        return self.normals[UNCERTAIN_FIELDS.index(name)]
+
+
+def _errors(errors):
+    merged = {**DEFAULT_ERRORS, **(errors or {})}
+    unknown = set(merged) - set(UNCERTAIN_FIELDS)
+    if unknown:
+        raise ValueError(f"未知的误差字段：{sorted(unknown)}")
+    return merged
+
+
+def _inputs(gender, age, height, weight, neck, waist, hip, activity, goal):
+    n = np.size(gender) if np.ndim(gender) else np.asarray(weight).size
+    return n, {
+        "is_male": male_mask(gender, n),
+        "age": _column(age, n).astype(np.int64),
+        "height": _column(height, n),
+        "weight": _column(weight, n),
+        "neck": _column(neck, n),
+        "waist": _column(waist, n),
+        "hip": _column(hip, n),
+        "activity_factor": activity_factors(activity, n),
+        "goal_factor": goal_factors(goal, n),
+    }
+
+
+def _nominal(cols):
+    return calculate_arrays(cols["is_male"], cols["age"], cols["height"], cols["weight"], cols["neck"],
+                            cols["waist"], cols["hip"], cols["activity_factor"], cols["goal_factor"])
+
+
+def _summary(samples, q_low, q_high):
+    """(行, 抽样) -> 每行的均值 / 标准差 / 分位区间；体脂无效的抽样（NaN）不计入"""
+    if np.isnan(samples).any():
+        # 某行全部抽样都无效时 nanquantile 会告警并返回 NaN，这里正是想要的结果
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            low, high = np.nanquantile(samples, [q_low, q_high], axis=1)
+            return np.nanmean(samples, axis=1), np.nanstd(samples, axis=1), low, high
+    low, high = np.quantile(samples, [q_low, q_high], axis=1)
+    return samples.mean(axis=1), samples.std(axis=1), low, high
+
+
+def monte_carlo(gender, age, height, weight, neck, waist, hip=0.0, activity="Sedentary", goal="维持 (Maintain)",
+                errors=None, draws=DEFAULT_DRAWS, level=DEFAULT_LEVEL, streams=None, seed=None):
+    """
+    蒙特卡洛置信区间。参数与 fitness_batch.calculate_batch 相同（数组或标量），另有：
+    errors  : 各字段测量误差（标准差），未给出的字段使用 DEFAULT_ERRORS，设为 0 表示该字段无误差；
+    streams : RandomStreams，给出时所有会员共用这组抽样（draws 取 streams.draws）；
+    seed    : 不共用抽样时的随机种子。
+    返回 {字段: {"value", "mean", "std", "low", "high"}}，value 为原始输入下的计算结果；
+    体脂另有 "valid_share"：抽样中围度仍然有效的比例。
+    """
+    n, cols = _inputs(gender, age, height, weight, neck, waist, hip, activity, goal)
+    errors = _errors(errors)
+    draws = streams.draws if streams is not None else draws
+    rng = None if streams is not None else np.random.default_rng(seed)
+    q_low, q_high = (1 - level) / 2, (1 + level) / 2
+
+    nominal = _nominal(cols)
+    out = {f: {"value": nominal[f], **{k: np.empty(n) for k in ("mean", "std", "low", "high")}}
+           for f in RESULT_FIELDS}
+    out["body_fat"]["valid_share"] = np.empty(n)
+
+    rows = max(1, CHUNK_SAMPLES // draws)
+    for start in range(0, n, rows):
+        sel = slice(start, min(start + rows, n))
+        m = sel.stop - sel.start
+        rep = {k: np.repeat(cols[k][sel], draws) for k in ("is_male", "age", "activity_factor", "goal_factor")}
+        for field in UNCERTAIN_FIELDS:
+            noise = streams.field(field) if streams is not None else rng.standard_normal((m, draws))
+            rep[field] = (cols[field][sel][:, None] + errors[field] * noise).ravel()
+        results = _nominal(rep)
+        for field in RESULT_FIELDS:
+            stats = _summary(results[field].reshape(m, draws).astype(np.float64), q_low, q_high)
+            for key, values in zip(("mean", "std", "low", "high"), stats):
+                out[field][key][sel] = values
+        out["body_fat"]["valid_share"][sel] = results["valid"].reshape(m, draws).mean(axis=1)
+    return out
+
+
+def gradients(cols):
+    """
+    各输出对 UNCERTAIN_FIELDS 的解析偏导（忽略四舍五入），返回 {输出: {字段: 数组}}。
+    体脂：BFP = 495 / D - 450，D = a - b·log10(围度) + c·log10(身高)，围度 = 腰 (+ 臀) - 颈。
+    """
+    is_male = cols["is_male"]
+    zero = np.zeros(is_male.size)
+    circ = np.where(is_male, cols["waist"] - cols["neck"], cols["waist"] + cols["hip"] - cols["neck"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_circ, log_h = np.log10(circ), np.log10(cols["height"])
+        a = np.where(is_male, 1.0324, 1.29579)
+        b = np.where(is_male, 0.19077, 0.35004)
+        c = np.where(is_male, 0.15456, 0.22100)
+        d = a - b * log_circ + c * log_h
+        dbfp_dd = -495 / d ** 2
+        dbfp_dcirc = dbfp_dd * (-b / (circ * _LN10))
+        dbfp_dh = dbfp_dd * (c / (cols["height"] * _LN10))
+    body_fat = {"height": dbfp_dh, "weight": zero, "neck": -dbfp_dcirc, "waist": dbfp_dcirc,
+                "hip": np.where(is_male, 0.0, dbfp_dcirc)}
+
+    bmr = {"height": zero + 6.25, "weight": zero + 10.0, "neck": zero, "waist": zero, "hip": zero}
+    act, goal = cols["activity_factor"], cols["goal_factor"]
+    tdee = {k: v * act for k, v in bmr.items()}
+
+    # 碳水保底时热量只随蛋白/脂肪变化：d/dw = 2×4 + 0.8×9
+    nominal = _nominal(cols)
+    floor = np.round(nominal["tdee"] * goal) < nominal["protein"] * 4 + nominal["fat"] * 9
+    protein = {k: zero + (2.0 if k == "weight" else 0.0) for k in UNCERTAIN_FIELDS}
+    fat = {k: zero + (0.8 if k == "weight" else 0.0) for k in UNCERTAIN_FIELDS}
+    calories = {k: np.where(floor, protein[k] * 4 + fat[k] * 9, tdee[k] * goal) for k in UNCERTAIN_FIELDS}
+    carbs = {k: np.where(floor, 0.0, (calories[k] - protein[k] * 4 - fat[k] * 9) / 4) for k in UNCERTAIN_FIELDS}
+    return {"body_fat": body_fat, "bmr": bmr, "tdee": tdee, "calories": calories,
+            "protein": protein, "fat": fat, "carbs": carbs}, nominal
+
+
+def analytic(gender, age, height, weight, neck, waist, hip=0.0, activity="Sedentary", goal="维持 (Maintain)",
+             errors=None, level=DEFAULT_LEVEL):
+    """
+    一阶误差传播：std = sqrt(Σ (∂输出/∂字段 × 字段误差)²)，区间为 value ± z·std（正态近似）。
+    返回结构与 monte_carlo 相同（mean 即 value）。围度接近 0 或碳水保底交界附近时近似较差，应改用 monte_carlo。
+    """
+    _, cols = _inputs(gender, age, height, weight, neck, waist, hip, activity, goal)
+    errors = _errors(errors)
+    z = NormalDist().inv_cdf((1 + level) / 2)
+    grads, nominal = gradients(cols)
+    out = {}
+    for field in RESULT_FIELDS:
+        var = sum((grads[field][k] * errors[k]) ** 2 for k in UNCERTAIN_FIELDS)
+        std = np.sqrt(var)
+        value = nominal[field].astype(np.float64)
+        out[field] = {"value": nominal[field], "mean": value, "std": std,
+                      "low": value - z * std, "high": value + z * std}
+    return out
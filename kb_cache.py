@@ -0,0 +1,46 @@
+"""
+进程级知识库表格缓存：每张 KB 表格的 DataFrame 及其遮挡模式视图（只保留第一列）只构造一次。
+
+Streamlit 每次交互都会重新执行 review.py，但本模块只导入一次，缓存由所有会话共享（与 fitness_cache 同理）。
+KB 是静态数据，缓存不需要失效；容量可通过环境变量 KB_TABLE_CACHE_SIZE 设置。
+"""
+import os
+from functools import lru_cache
+
+from ophth_kb import KB
+
+DEFAULT_CACHE_SIZE = int(os.environ.get("KB_TABLE_CACHE_SIZE", 256))
+
+
+@lru_cache(maxsize=DEFAULT_CACHE_SIZE)
+def _frames(key):
+    import pandas as pd  # 延迟加载：只有渲染表格时才需要 pandas
+
+    table = KB[key]
+    df = pd.DataFrame(table["data"], columns=table["cols"])
+    # 遮挡模式的投影一起算好；copy() 让它不再引用原表，之后取用不触发任何 pandas 操作
+    return df, df.iloc[:, [0]].copy()
+
+
+def table_frame(key, blind_mode=False):
+    """
+    KB[key] 对应的 DataFrame；blind_mode 时返回只含第一列的视图。
+    返回的 DataFrame 在会话间共享，调用方不要原地修改。
+    """
+    full, blind = _frames(key)
+    return blind if blind_mode else full
+
+
+def warm():
+    """预先构造全部表格（例如服务启动时），之后任何会话的 rerun 都不再构造 DataFrame"""
+    for key in KB.sections(kind="table"):
+        _frames(key)
+
+
+def clear_cache():
+    _frames.cache_clear()
+
+
+def cache_stats():
+    info = _frames.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
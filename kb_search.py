@@ -0,0 +1,410 @@
+"""
+眼科知识库全文检索：倒排索引覆盖 KB 表格（每行一条）、口诀、病例，以及 review.py 中的 box(...) / 正文文字。
+
+没有分词器可用，中文按字切 n-gram：文档里每段连续汉字同时记单字和相邻双字，
+查询时两字以上的汉字串只用双字（"毛果芸香碱" -> 毛果 果芸 芸香 香碱），单字查询用单字；
+英文 / 数字按整词（小写）。打分用 BM25，每条倒排记录的分值在建索引时算好，
+查询只需要按词取出倒排区间累加，再乘上命中词比例，用 argpartition 取前 k 条。
+
+索引持久化在 kb/search/（随知识库目录，可用 OPHTH_KB_DIR 指定）：
+    meta.json          版本、来源指纹（toc.json、各 section 文件与 review.py 的大小 + mtime）、模块标签
+    terms.npy          排好序的词表；查询用 searchsorted 定位
+    offsets.npy        CSR 偏移：词 i 的倒排记录为 [offsets[i], offsets[i + 1])
+    postings_doc.npy   倒排记录的文档号
+    postings_weight.npy  倒排记录的 BM25 分值
+    docs.jsonl + doc_offsets.npy  文档内容，命中后按偏移只读需要的几行
+数组用 mmap 打开，启动不随索引大小变慢；来源文件变化后 default_index() 自动重建。
+
+    python kb_search.py build             # 重建索引
+    python kb_search.py query 毛果芸香碱
+"""
+import ast
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from ophth_kb import KB
+
+REVIEW_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "review.py")
+INDEX_DIR = "search"
+FORMAT_VERSION = 1
+
+K1 = 1.2
+B = 0.75
+SNIPPET_CHARS = 60
+
+# box() 的类型 -> 显示名；st.* 里算作正文的调用
+BOX_TITLES = {"concept": "核心概念", "mech": "机制", "pitfall": "考试陷阱", "mnemonic": "口诀"}
+TEXT_CALLS = {"markdown", "write", "info", "warning", "error", "success", "caption"}
+HEADING_CALLS = {"title", "subheader", "header"}
+
+_CJK = "㐀-䶿一-鿿豈-﫿"
+_TOKEN_RE = re.compile(f"[{_CJK}]+|[a-z0-9]+(?:\\.[0-9]+)?")
+_CJK_RE = re.compile(f"[{_CJK}]")
+_MARKUP_RE = re.compile(r"\*\*|<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+# ==========================================
+# 切词
+# ==========================================
+
+def _runs(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+def tokenize(text):
+    """文档切词：汉字串 -> 单字 + 双字，其余按整词"""
+    tokens = []
+    for run in _runs(text):
+        if _CJK_RE.match(run):
+            tokens.extend(run)
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def query_terms(query):
+    """查询切词（去重、保持顺序）：两字以上的汉字串只用双字，避免单字把结果冲淡"""
+    terms = []
+    for run in _runs(query):
+        if _CJK_RE.match(run) and len(run) > 1:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            terms.append(run)
+    return list(dict.fromkeys(terms))
+
+
+def clean(text):
+    """去掉 Markdown 加粗 / HTML 标签，压缩空白，用于展示和索引"""
+    return _SPACE_RE.sub(" ", _MARKUP_RE.sub("", text)).strip()
+
+
+# ==========================================
+# 文档收集
+# ==========================================
+
+def kb_documents(kb=KB):
+    """KB 表格每行一条（标题为首列），口诀、病例每条一条"""
+    docs = []
+    for key in kb:
+        entry = kb.toc["sections"][key]
+        value = kb[key]
+        if entry["kind"] == "table":
+            for row in value["data"]:
+                text = "；".join(f"{col}：{cell}" for col, cell in zip(value["cols"][1:], row[1:]))
+                docs.append({"module": entry["module"], "source": f"table:{key}",
+                             "title": str(row[0]), "text": text})
+        elif entry["kind"] == "cases":
+            for case in value:
+                text = " ".join([case["history"], case["exam"], case["question"], *case["options"],
+                                 case["correct"], case.get("explanation", "")])
+                docs.append({"module": entry["module"], "source": f"case:{key}", "title": case["title"],
+                             "text": clean(text)})
+        else:
+            for title, content in value:
+                docs.append({"module": entry["module"], "source": f"list:{key}", "title": title, "text": content})
+    return docs
+
+
+def _const(node):
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+
+def _call_name(node):
+    """box(...) -> "box"；st.markdown(...) -> "markdown"；其他返回 None"""
+    if not isinstance(node, ast.Call):
+        return None
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name) and node.func.value.id == "st":
+        return node.func.attr
+    return None
+
+
+def _page_documents(stmts, module, heading, docs):
+    for stmt in stmts:
+        if isinstance(stmt, ast.With):
+            _page_documents(stmt.body, module, heading, docs)
+        elif isinstance(stmt, (ast.If, ast.For)):
+            _page_documents(stmt.body, module, heading, docs)
+            _page_documents(stmt.orelse, module, heading, docs)
+        elif isinstance(stmt, ast.Expr):
+            call, name = stmt.value, _call_name(stmt.value)
+            args = [_const(a) for a in getattr(call, "args", [])]
+            if name == "box" and len(args) == 3 and args[2]:
+                title = args[1] if args[0] != "mnemonic" else BOX_TITLES["mnemonic"]
+                docs.append({"module": module, "source": f"box:{args[0]}", "title": clean(title or heading),
+                             "text": clean(args[2])})
+            elif name in HEADING_CALLS and args and args[0]:
+                heading = clean(args[0])
+            elif name in TEXT_CALLS and args and args[0] and args[0].strip():
+                docs.append({"module": module, "source": "text", "title": heading, "text": clean(args[0])})
+
+
+def review_documents(path=REVIEW_FILE):
+    """
+    解析 review.py（不执行），返回 (模块标签列表, 文档)。
+    标签取自 key="nav" 的导航 st.radio；页面按 `if page.startswith("N.")` 分支对应到模块 N。
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    labels = []
+    for node in ast.walk(tree):
+        if _call_name(node) == "radio" and any(k.arg == "key" and _const(k.value) == "nav" for k in node.keywords):
+            labels = [_const(e) for e in node.args[1].elts]
+            break
+
+    docs = []
+    for stmt in tree.body:
+        branch = stmt
+        while isinstance(branch, ast.If):
+            test = branch.test
+            if (isinstance(test, ast.Call) and isinstance(test.func, ast.Attribute)
+                    and test.func.attr == "startswith" and test.args and _const(test.args[0])):
+                module = int(_const(test.args[0]).rstrip("."))
+                heading = labels[module] if module < len(labels) else str(module)
+                _page_documents(branch.body, module, heading, docs)
+            branch = branch.orelse[0] if len(branch.orelse) == 1 else None
+    return labels, docs
+
+
+def collect_documents(kb=KB, review_path=REVIEW_FILE):
+    labels, docs = review_documents(review_path)
+    return labels, kb_documents(kb) + docs
+
+
+def fingerprint(kb=KB, review_path=REVIEW_FILE):
+    """
+    来源指纹：toc.json、review.py 以及 toc 中登记的每个 section 文件的大小 + mtime。
+    直接编辑 kb/sections/ 下的文件而没有重建 toc.json 时，索引同样会被当作过期。
+    """
+    def stat(path):
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+
+    return {
+        "toc": stat(os.path.join(kb.root, "toc.json")),
+        "review": stat(review_path),
+        "sections": {key: stat(os.path.join(kb.root, entry["file"])) for key, entry in kb.toc["sections"].items()},
+    }
+
+
+# ==========================================
+# 建索引
+# ==========================================
+
+def _tmp_path(path):
+    """每个进程各用一个临时文件：两个进程同时重建时不会写坏对方的临时文件"""
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def _save_npy(path, array):
+    tmp = _tmp_path(path)
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def build(docs, root, labels=(), source=None):
+    """
+    为 docs 建索引并写入 root 目录。每个文件先写临时文件再替换，meta.json 最后写，
+    读取时以 meta 中的数量校验数组，写到一半的索引会被当作过期重建。
+    """
+    os.makedirs(root, exist_ok=True)
+    postings = {}
+    lengths = np.empty(len(docs), dtype=np.float64)
+    for doc_id, doc in enumerate(docs):
+        tokens = tokenize(doc["title"] + " " + doc["text"])
+        lengths[doc_id] = len(tokens)
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            postings.setdefault(token, []).append((doc_id, tf))
+
+    n_docs = len(docs)
+    avgdl = lengths.mean() if n_docs else 1.0
+    terms = sorted(postings)
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(postings[t]) for t in terms])
+    doc_ids = np.empty(offsets[-1], dtype=np.int32)
+    weights = np.empty(offsets[-1], dtype=np.float32)
+    for i, term in enumerate(terms):
+        ids, tf = np.array(postings[term], dtype=np.float64).T
+        idf = np.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+        norm = K1 * (1 - B + B * lengths[ids.astype(np.int64)] / avgdl)
+        doc_ids[offsets[i]:offsets[i + 1]] = ids
+        weights[offsets[i]:offsets[i + 1]] = idf * tf * (K1 + 1) / (tf + norm)
+
+    doc_offsets = np.zeros(n_docs + 1, dtype=np.int64)
+    path = os.path.join(root, "docs.jsonl")
+    tmp = _tmp_path(path)
+    with open(tmp, "wb") as f:
+        for doc_id, doc in enumerate(docs):
+            f.write(json.dumps(doc, ensure_ascii=False).encode("utf-8") + b"\n")
+            doc_offsets[doc_id + 1] = f.tell()
+    os.replace(tmp, path)
+
+    _save_npy(os.path.join(root, "terms.npy"), np.array(terms, dtype=str) if terms else np.array([], dtype="<U1"))
+    _save_npy(os.path.join(root, "offsets.npy"), offsets)
+    _save_npy(os.path.join(root, "postings_doc.npy"), doc_ids)
+    _save_npy(os.path.join(root, "postings_weight.npy"), weights)
+    _save_npy(os.path.join(root, "doc_offsets.npy"), doc_offsets)
+
+    meta = {"version": FORMAT_VERSION, "docs": n_docs, "terms": len(terms), "postings": int(offsets[-1]),
+            "labels": list(labels), "source": source}
+    path = os.path.join(root, "meta.json")
+    tmp = _tmp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return meta
+
+
+# ==========================================
+# 查询
+# ==========================================
+
+class SearchIndex:
+    """打开已持久化的索引（数组 mmap，文档按需读取）"""
+
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"不兼容的检索索引：{root}")
+        load = lambda name: np.load(os.path.join(root, name), mmap_mode="r")
+        self.terms = load("terms.npy")
+        self.offsets = load("offsets.npy")
+        self.postings_doc = load("postings_doc.npy")
+        self.postings_weight = load("postings_weight.npy")
+        self.doc_offsets = load("doc_offsets.npy")
+        if (len(self.terms), len(self.doc_offsets) - 1, len(self.postings_doc)) != (
+                self.meta["terms"], self.meta["docs"], self.meta["postings"]):
+            raise ValueError(f"检索索引不完整：{root}")
+        self.labels = self.meta["labels"]
+        self._docs = open(os.path.join(root, "docs.jsonl"), "rb")
+        self._lock = threading.Lock()   # 文档文件句柄在会话线程间共享
+
+    def __len__(self):
+        return self.meta["docs"]
+
+    def document(self, doc_id):
+        start, end = int(self.doc_offsets[doc_id]), int(self.doc_offsets[doc_id + 1])
+        with self._lock:
+            self._docs.seek(start)
+            line = self._docs.read(end - start)
+        return json.loads(line)
+
+    def _postings(self, term):
+        i = int(np.searchsorted(self.terms, term))
+        if i < len(self.terms) and self.terms[i] == term:
+            start, end = self.offsets[i], self.offsets[i + 1]
+            return self.postings_doc[start:end], self.postings_weight[start:end]
+        return None
+
+    def search(self, query, limit=10):
+        """
+        返回按相关度排序的命中：[{score, module, label, title, snippet, source}]。
+        分数 = BM25 之和 × 命中查询词的比例，只命中一两个双字的长文档不会排到前面。
+        """
+        terms = query_terms(query)
+        found = [p for p in map(self._postings, terms) if p is not None]
+        if not found:
+            return []
+        ids = np.concatenate([p[0] for p in found])
+        scores = np.bincount(ids, weights=np.concatenate([p[1] for p in found]), minlength=len(self))
+        coverage = np.bincount(ids, minlength=len(self))
+        scores *= coverage / len(terms)
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit)[:limit]]
+        ranked = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+        hits = []
+        for doc_id in ranked:
+            doc = self.document(int(doc_id))
+            module = doc["module"]
+            hits.append({"score": float(scores[doc_id]), "module": module,
+                         "label": self.labels[module] if module < len(self.labels) else str(module),
+                         "title": doc["title"], "snippet": snippet(doc["text"], terms),
+                         "source": doc["source"]})
+        return hits
+
+    def close(self):
+        self._docs.close()
+
+
+def snippet(text, terms, width=SNIPPET_CHARS):
+    """以第一个命中词为中心截取一段文字"""
+    lower = text.lower()
+    positions = [p for p in (lower.find(t) for t in terms) if p >= 0]
+    if len(text) <= width:
+        return text
+    start = max(0, min(positions, default=0) - width // 3)
+    end = start + width
+    return ("…" if start else "") + text[start:end] + ("…" if end < len(text) else "")
+
+
+def build_default(kb=KB, review_path=REVIEW_FILE):
+    labels, docs = collect_documents(kb, review_path)
+    return build(docs, os.path.join(kb.root, INDEX_DIR), labels, fingerprint(kb, review_path))
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_index():
+    """
+    进程内共享的默认索引：磁盘上的索引与来源指纹一致就直接打开，否则（首次启动、
+    KB 或 review.py 修改过、索引写了一半）先重建。
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            root = os.path.join(KB.root, INDEX_DIR)
+            try:
+                index = SearchIndex(root)
+                if index.meta.get("source") != fingerprint():
+                    index.close()
+                    index = None
+            except (OSError, ValueError, KeyError):
+                index = None
+            if index is None:
+                build_default()
+                index = SearchIndex(root)
+            _default = index
+        return _default
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="眼科知识库全文检索")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="重建 kb/search/ 下的索引")
+    query_p = sub.add_parser("query", help="检索并打印命中")
+    query_p.add_argument("query")
+    query_p.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        meta = build_default()
+        print(f"{meta['docs']} 条文档，{meta['terms']} 个词，{meta['postings']} 条倒排记录 -> "
+              f"{os.path.join(KB.root, INDEX_DIR)}")
+        return
+    for hit in default_index().search(args.query, args.limit):
+        print(f"{hit['score']:7.2f}  [{hit['label']}] {hit['title']}\n         {hit['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
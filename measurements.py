@@ -0,0 +1,226 @@
+"""
+会员测量记录与历史存储。
+
+- Measurement：单条测量记录，使用 __slots__，不带实例 __dict__；
+- HistoryStore：按会员分桶、只追加的定长二进制列存（每条 22 字节），
+  读取时以 numpy.memmap 映射，单个会员的时间序列或全量扫描都不需要解码成 Python 对象。
+
+目录结构：
+    history/
+        meta.json          # 记录格式、桶数
+        part-000.bin ...   # member_id % buckets 相同的记录，按追加顺序排列
+
+围度/身高/体重以 0.1 为精度存成整数（与 kiosk 输入精度一致），读出时除以 10。
+"""
+import datetime
+import json
+import os
+
+import numpy as np
+
+from fitness import ACTIVITY_MULTIPLIERS, GOAL_ADJUSTMENTS, FitnessCalculator
+from fitness_batch import calculate_arrays, male_mask
+
+FORMAT_VERSION = 1
+DEFAULT_BUCKETS = 256
+
+ACTIVITY_KEYS = list(ACTIVITY_MULTIPLIERS)
+GOAL_KEYS = list(GOAL_ADJUSTMENTS)
+UNKNOWN_CODE = 255
+
+# 定长记录格式（小端，22 字节）
+RECORD_DTYPE = np.dtype([
+    ("member_id", "<u4"),
+    ("day", "<i4"),        # 距 1970-01-01 的天数
+    ("is_male", "u1"),
+    ("age", "u1"),
+    ("height", "<u2"),     # 0.1 cm
+    ("weight", "<u2"),     # 0.1 kg
+    ("neck", "<u2"),       # 0.1 cm
+    ("waist", "<u2"),      # 0.1 cm
+    ("hip", "<u2"),        # 0.1 cm
+    ("activity", "u1"),    # ACTIVITY_KEYS 下标
+    ("goal", "u1"),        # GOAL_KEYS 下标
+])
+
+TENTHS_FIELDS = ("height", "weight", "neck", "waist", "hip")
+
+_EPOCH = datetime.date(1970, 1, 1)
+
+
+def to_day(date):
+    """date / ISO 字符串 -> 天数"""
+    if isinstance(date, str):
+        date = datetime.date.fromisoformat(date)
+    return (date - _EPOCH).days
+
+
+def from_day(day):
+    return _EPOCH + datetime.timedelta(days=int(day))
+
+
+def _code(keys, value):
+    return keys.index(value) if value in keys else UNKNOWN_CODE
+
+
+class Measurement:
+    """单条测量记录"""
+
+    __slots__ = ("member_id", "date", "gender", "age", "height", "weight", "neck", "waist", "hip",
+                 "activity", "goal")
+
+    def __init__(self, member_id, date, gender, age, height, weight, neck, waist, hip=0.0,
+                 activity="Sedentary", goal="维持 (Maintain)"):
+        self.member_id = int(member_id)
+        self.date = datetime.date.fromisoformat(date) if isinstance(date, str) else date
+        self.gender = gender
+        self.age = int(age)
+        self.height = float(height)
+        self.weight = float(weight)
+        self.neck = float(neck)
+        self.waist = float(waist)
+        self.hip = float(hip)
+        self.activity = activity
+        self.goal = goal
+
+    def __repr__(self):
+        return (f"Measurement(member_id={self.member_id}, date={self.date.isoformat()}, gender={self.gender!r}, "
+                f"age={self.age}, height={self.height}, weight={self.weight}, neck={self.neck}, "
+                f"waist={self.waist}, hip={self.hip}, activity={self.activity!r}, goal={self.goal!r})")
+
+    def calculator(self):
+        return FitnessCalculator(self.gender, self.age, self.height, self.weight, self.neck, self.waist, self.hip)
+
+    def to_record(self):
+        return (self.member_id, to_day(self.date), self.gender.lower() == "male", self.age,
+                *(round(getattr(self, f) * 10) for f in TENTHS_FIELDS),
+                _code(ACTIVITY_KEYS, self.activity), _code(GOAL_KEYS, self.goal))
+
+    @classmethod
+    def from_record(cls, rec):
+        return cls(
+            rec["member_id"], from_day(rec["day"]), "Male" if rec["is_male"] else "Female", rec["age"],
+            *(rec[f] / 10 for f in TENTHS_FIELDS),
+            ACTIVITY_KEYS[rec["activity"]] if rec["activity"] < len(ACTIVITY_KEYS) else "Sedentary",
+            GOAL_KEYS[rec["goal"]] if rec["goal"] < len(GOAL_KEYS) else "维持 (Maintain)",
+        )
+
+
+def _checked(name, values, dtype):
+    """按目标字段的整数类型检查取值范围（NaN、负数、溢出都报错，不依赖 dtype 转换时的回绕）"""
+    values = np.asarray(values, dtype=np.float64)
+    info = np.iinfo(dtype)
+    bad = ~np.isfinite(values) | (values < info.min) | (values > info.max)
+    if bad.any():
+        raise ValueError(f"{name} 超出可存储范围 [{info.min}, {info.max}]：{values[bad].ravel()[:5].tolist()}")
+    return values
+
+
+def records_from_columns(member_id, day, gender, age, height, weight, neck, waist, hip=0.0,
+                         activity="Sedentary", goal="维持 (Maintain)"):
+    """把列式输入（数组或标量）打包成 RECORD_DTYPE 结构化数组；取值超出字段范围时抛 ValueError"""
+    member_id = np.asarray(member_id)
+    n = member_id.size
+    rec = np.empty(n, dtype=RECORD_DTYPE)
+    for name, values in (("member_id", member_id), ("day", day), ("age", age)):
+        values = _checked(name, values, RECORD_DTYPE[name])
+        if (values != np.trunc(values)).any():
+            raise ValueError(f"{name} 必须是整数")
+        rec[name] = values
+    rec["is_male"] = male_mask(gender, n)
+    for name, values in zip(TENTHS_FIELDS, (height, weight, neck, waist, hip)):
+        rec[name] = _checked(name, np.rint(np.asarray(values, dtype=np.float64) * 10), RECORD_DTYPE[name])
+    for name, keys, values in (("activity", ACTIVITY_KEYS, activity), ("goal", GOAL_KEYS, goal)):
+        values = np.asarray(values)
+        codes = np.full(n, UNKNOWN_CODE, dtype=np.uint8)
+        for i, key in enumerate(keys):
+            codes[np.broadcast_to(values == key, (n,))] = i
+        rec[name] = codes
+    return rec
+
+
+def decode(records):
+    """结构化记录 -> 计算用的数值列（不生成 Python 对象）"""
+    cols = {f: records[f] / 10 for f in TENTHS_FIELDS}
+    cols["is_male"] = records["is_male"].astype(bool)
+    cols["age"] = records["age"].astype(np.int64)
+    activity = np.append([ACTIVITY_MULTIPLIERS[k] for k in ACTIVITY_KEYS], 1.2)
+    goal = np.append([GOAL_ADJUSTMENTS[k] for k in GOAL_KEYS], 1.0)
+    cols["activity_factor"] = activity[np.minimum(records["activity"], len(ACTIVITY_KEYS))]
+    cols["goal_factor"] = goal[np.minimum(records["goal"], len(GOAL_KEYS))]
+    return cols
+
+
+def compute(records):
+    """直接在结构化记录上批量计算体脂 / BMR / TDEE / 营养计划"""
+    c = decode(records)
+    return calculate_arrays(c["is_male"], c["age"], c["height"], c["weight"], c["neck"], c["waist"], c["hip"],
+                            c["activity_factor"], c["goal_factor"])
+
+
+class HistoryStore:
+    """只追加的测量历史：按 member_id 分桶的定长二进制文件"""
+
+    def __init__(self, root, buckets=DEFAULT_BUCKETS):
+        self.root = root
+        meta_path = os.path.join(root, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["version"] != FORMAT_VERSION or meta["record_size"] != RECORD_DTYPE.itemsize:
+                raise ValueError(f"不兼容的历史存储格式：{meta_path}")
+            self.buckets = meta["buckets"]
+        else:
+            os.makedirs(root, exist_ok=True)
+            self.buckets = buckets
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"version": FORMAT_VERSION, "record_size": RECORD_DTYPE.itemsize,
+                           "buckets": buckets, "fields": RECORD_DTYPE.names}, f, ensure_ascii=False)
+
+    def _part(self, bucket):
+        return os.path.join(self.root, f"part-{bucket:03d}.bin")
+
+    def append(self, records):
+        """追加记录：可以是 Measurement 列表或 RECORD_DTYPE 结构化数组"""
+        if not isinstance(records, np.ndarray):
+            records = np.array([m.to_record() for m in records], dtype=RECORD_DTYPE)
+        buckets = records["member_id"] % self.buckets
+        order = np.argsort(buckets, kind="stable")
+        records, buckets = records[order], buckets[order]
+        bounds = np.flatnonzero(np.diff(buckets)) + 1
+        for chunk in np.split(records, bounds):
+            if chunk.size:
+                with open(self._part(int(chunk["member_id"][0]) % self.buckets), "ab") as f:
+                    # 上次追加中途退出留下的半条记录先截掉，否则之后的记录全部错位
+                    size = f.seek(0, os.SEEK_END)
+                    if size % RECORD_DTYPE.itemsize:
+                        f.truncate(size - size % RECORD_DTYPE.itemsize)
+                    f.write(chunk.tobytes())
+        return len(records)
+
+    def _map(self, bucket):
+        path = self._part(bucket)
+        # 只映射完整的记录：进程在追加中途退出时，文件尾部可能残留半条记录（下次 append 时截掉）
+        count = os.path.getsize(path) // RECORD_DTYPE.itemsize if os.path.exists(path) else 0
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+
+    def member_series(self, member_id):
+        """单个会员的全部记录（按日期排序），只映射该会员所在的分桶"""
+        part = self._map(int(member_id) % self.buckets)
+        series = part[part["member_id"] == member_id]
+        return series[np.argsort(series["day"], kind="stable")]
+
+    def scan(self):
+        """逐个分桶产出内存映射的记录数组，用于全量统计"""
+        for bucket in range(self.buckets):
+            part = self._map(bucket)
+            if part.size:
+                yield part
+
+    def __len__(self):
+        return sum(
+            os.path.getsize(self._part(b)) // RECORD_DTYPE.itemsize
+            for b in range(self.buckets) if os.path.exists(self._part(b))
+        )
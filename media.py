@@ -0,0 +1,383 @@
+"""
+本地媒体资源：背景音乐从本机磁盘提供，不再经第三方代理（raw.githack.com）整首下载，离线终端也能播放。
+
+    python media.py build                    # 构建时转码一次：源文件 -> static/media/<曲目>.<内容哈希>.mp3
+    python media.py build --format opus      # 或 Ogg/Opus（更小，但较旧的 Safari 不支持）
+    python media.py serve --port 8503        # 独立媒体服务（见下），配合 MEDIA_URL=http://<主机>:8503 使用
+    media.audio("bgm", autoplay=True)        # 页面中代替 st.audio(远程 URL)
+
+构建产物文件名带内容哈希，登记在 static/media/manifest.json。页面取地址的顺序：
+    1. 已构建的文件：默认走 Streamlit 的静态文件服务（/app/static/media/...，
+       Starlette 的 FileResponse 支持 Range、ETag、Last-Modified）；设置了 MEDIA_URL 时走独立媒体服务；
+    2. 未构建但源文件在本地：原样发布（format "copy"，不需要 ffmpeg），同样从本地提供；
+    3. 源文件也不在：退回远程地址（旧行为，需要联网）。
+静态文件服务没开时，把本地文件路径交给 st.audio，由 Streamlit 的媒体管理器提供（同样支持 Range）。
+
+转码依赖 ffmpeg（只在构建时需要）。FLAC 是无损格式，开头还带着封面图等元数据块，浏览器要先下载这些才能开始播放；
+转码时去掉封面和标签，128 kbps MP3 约为原文件的 1/8，开始播放前要下载的字节也随之变少。
+
+独立媒体服务只依赖标准库 asyncio（与 fitness_service 相同的写法）：
+    GET / HEAD /<文件名>   单个 Range（bytes=a-b、a-、-n）返回 206，越界返回 416，多段 Range 按整文件返回 200；
+                          ETag / If-None-Match（304）、If-Range、Last-Modified；
+                          带内容哈希的文件名返回 Cache-Control: public, max-age=31536000, immutable。
+"""
+import argparse
+import asyncio
+import email.utils
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import subprocess
+from functools import lru_cache
+from urllib.parse import unquote
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+MEDIA_DIR = os.path.join(REPO_ROOT, "static", "media")   # Streamlit 只提供主脚本旁边的 static/
+STATIC_URL = "/app/static/media"                          # st.audio 只把 /app/static/ 开头的相对地址当作 URL
+MEDIA_URL = os.environ.get("MEDIA_URL", "").rstrip("/")   # 独立媒体服务地址，留空则用 Streamlit 静态服务
+DEFAULT_FORMAT = os.environ.get("MEDIA_FORMAT", "mp3")
+MANIFEST = "manifest.json"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8503
+KEEPALIVE_TIMEOUT = 15.0
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_HASHED_RE = re.compile(r"^[\w-]+\.[0-9a-f]{10}\.\w+$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_STATUS_TEXT = {200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request",
+                404: "Not Found", 405: "Method Not Allowed", 416: "Range Not Satisfiable"}
+
+
+class Track:
+    """一首曲目：源文件放在仓库里（相对仓库根目录），remote 为源文件不在本地时的退路"""
+    __slots__ = ("name", "source", "remote")
+
+    def __init__(self, name, source, remote=None):
+        self.name = name
+        self.source = source
+        self.remote = remote
+
+    @property
+    def path(self):
+        return os.path.join(REPO_ROOT, self.source)
+
+    def __repr__(self):
+        return f"Track({self.name!r})"
+
+
+TRACKS = {
+    "bgm": Track(
+        "bgm", "在虚无中永存 - 英雄主义.flac",
+        remote="https://raw.githack.com/Huuxiann/Cut-Fat/main/%E5%9C%A8%E8%99%9A%E6%97%A0%E4%B8%AD%E6%B0%B8%E5%AD%98%20-%20%E8%8B%B1%E9%9B%84%E4%B8%BB%E4%B9%89.flac",
+    ),
+}
+
+
+class Format:
+    """输出格式：扩展名、MIME 类型、ffmpeg 编码参数（None 表示原样复制，不转码）"""
+    __slots__ = ("name", "ext", "mimetype", "codec")
+
+    def __init__(self, name, ext, mimetype, codec):
+        self.name = name
+        self.ext = ext
+        self.mimetype = mimetype
+        self.codec = codec
+
+
+FORMATS = {
+    "mp3": Format("mp3", "mp3", "audio/mpeg", ["-c:a", "libmp3lame", "-b:a", "128k"]),
+    "opus": Format("opus", "ogg", "audio/ogg", ["-c:a", "libopus", "-b:a", "96k"]),
+    "copy": Format("copy", None, None, None),
+}
+
+
+# --- 构建：转码 / 发布 ---
+
+def _digest(path, salt):
+    h = hashlib.sha256(salt.encode("utf-8"))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:10]
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def read_manifest(media_dir=MEDIA_DIR):
+    path = os.path.join(media_dir, MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return _load_manifest(path, mtime)
+
+
+@lru_cache(maxsize=4)
+def _load_manifest(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build(track, fmt=DEFAULT_FORMAT, media_dir=MEDIA_DIR, source_path=None):
+    """
+    把曲目转码（或原样复制）到 media_dir，文件名 <曲目>.<哈希>.<扩展名>，并登记到 manifest。
+    源文件大小、修改时间、格式都没变且产物还在时直接返回已有条目，不重新读文件。
+    """
+    fmt = FORMATS[fmt]
+    source = source_path or track.path
+    stat = os.stat(source)
+    manifest = dict(read_manifest(media_dir))
+    entry = manifest.get(track.name)
+    if (entry and entry["format"] == fmt.name and entry["source_bytes"] == stat.st_size
+            and entry["source_mtime_ns"] == stat.st_mtime_ns
+            and os.path.exists(os.path.join(media_dir, entry["file"]))):
+        return entry
+
+    ext = fmt.ext or os.path.splitext(source)[1].lstrip(".").lower()
+    mimetype = fmt.mimetype or mimetypes.guess_type(source)[0] or "application/octet-stream"
+    filename = f"{track.name}.{_digest(source, json.dumps(fmt.codec))}.{ext}"
+    path = os.path.join(media_dir, filename)
+    if not os.path.exists(path):
+        os.makedirs(media_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.{ext}"
+        if fmt.codec is None:
+            shutil.copyfile(source, tmp)
+        else:
+            ffmpeg = shutil.which("ffmpeg")
+            if ffmpeg is None:
+                raise RuntimeError("转码需要 ffmpeg；不转码可用 --format copy")
+            # -vn / -map_metadata -1：去掉封面图和标签，文件开头就是音频帧
+            subprocess.run([ffmpeg, "-nostdin", "-loglevel", "error", "-y", "-i", source, "-vn",
+                            "-map_metadata", "-1", *fmt.codec, tmp], check=True)
+        os.replace(tmp, path)
+
+    entry = {"file": filename, "type": mimetype, "format": fmt.name, "bytes": os.path.getsize(path),
+             "source_bytes": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+    manifest[track.name] = entry
+    _write_json(os.path.join(media_dir, MANIFEST), manifest)
+    return entry
+
+
+@lru_cache(maxsize=None)
+def _publish_source(name):
+    # 没跑过构建：把源文件原样发布一次（进程内只做一次）
+    return build(TRACKS[name], "copy")
+
+
+def audio_source(name, static=True):
+    """(地址, MIME 类型)：st.audio 可以直接使用的地址或本地文件路径"""
+    track = TRACKS[name]
+    entry = read_manifest().get(name)
+    if entry is None or not os.path.exists(os.path.join(MEDIA_DIR, entry["file"])):
+        if not os.path.exists(track.path):
+            return track.remote, mimetypes.guess_type(track.source)[0]
+        entry = _publish_source(name)
+    if MEDIA_URL:
+        return f"{MEDIA_URL}/{entry['file']}", entry["type"]
+    if static:
+        return f"{STATIC_URL}/{entry['file']}", entry["type"]
+    return os.path.join(MEDIA_DIR, entry["file"]), entry["type"]
+
+
+def audio(name, **kwargs):
+    """在当前位置输出音频播放器；每次 rerun 调用"""
+    import streamlit as st
+
+    url, mimetype = audio_source(name, bool(st.get_option("server.enableStaticServing")))
+    st.audio(url, format=mimetype, **kwargs)
+
+
+# --- 独立媒体服务：Range + 缓存头 ---
+
+def parse_range(header, size):
+    """
+    解析 Range 头，返回 (起始, 结束)（含结束字节），或 None 表示按整文件返回
+    （没有 Range、格式不认识、多段 Range）。范围完全越界时抛 ValueError（416）。
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.replace(" ", ""))
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+class MediaServer:
+    def __init__(self, root=MEDIA_DIR):
+        self.root = os.path.realpath(root)
+        self.requests = 0
+        self.bytes_sent = 0
+        self._server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _resolve(self, route):
+        name = unquote(route.lstrip("/"))
+        if not name or "/" in name or "\\" in name or name.startswith(".") or name == MANIFEST:
+            return None
+        path = os.path.join(self.root, name)
+        return path if os.path.isfile(path) else None
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                headers, malformed = {}, len(parts) != 3 or not parts[2].startswith("HTTP/")
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, sep, value = line.decode("latin-1").partition(":")
+                    if not sep or not key.strip():
+                        malformed = True
+                    headers[key.strip().lower()] = value.strip()
+                if malformed:
+                    await self._respond(writer, 400, {}, keep_alive=False)
+                    break
+                method, path, version = parts
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                self.requests += 1
+                await self._serve_file(writer, method, path.split("?", 1)[0], headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_file(self, writer, method, route, headers, keep_alive):
+        if method not in ("GET", "HEAD"):
+            return await self._respond(writer, 405, {"Allow": "GET, HEAD"}, keep_alive)
+        path = self._resolve(route)
+        if path is None:
+            return await self._respond(writer, 404, {}, keep_alive)
+
+        stat = os.stat(path)
+        tag = etag(stat)
+        common = {
+            "Accept-Ranges": "bytes",
+            "ETag": tag,
+            "Last-Modified": email.utils.formatdate(stat.st_mtime, usegmt=True),
+            "Cache-Control": IMMUTABLE if _HASHED_RE.match(os.path.basename(path)) else "no-cache",
+            "Access-Control-Allow-Origin": "*",
+        }
+        if tag in [t.strip() for t in headers.get("if-none-match", "").split(",")]:
+            return await self._respond(writer, 304, common, keep_alive)
+
+        size = stat.st_size
+        if_range = headers.get("if-range")
+        try:
+            span = parse_range(headers.get("range"), size) if if_range in (None, tag) else None
+        except ValueError:
+            return await self._respond(writer, 416, {**common, "Content-Range": f"bytes */{size}"}, keep_alive)
+
+        start, end = span or (0, size - 1)
+        common["Content-Type"] = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if span is not None:
+            common["Content-Range"] = f"bytes {start}-{end}/{size}"
+        await self._respond(writer, 206 if span else 200, common, keep_alive, length=end - start + 1)
+        if method == "GET" and size:
+            with open(path, "rb") as f:
+                # loop.sendfile：支持时零拷贝，否则按块读写
+                await asyncio.get_running_loop().sendfile(writer.transport, f, start, end - start + 1)
+            self.bytes_sent += end - start + 1
+
+    async def _respond(self, writer, status, headers, keep_alive, length=0):
+        head = f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+        for key, value in headers.items():
+            head += f"{key}: {value}\r\n"
+        if status != 304:
+            head += f"Content-Length: {length}\r\n"
+        head += f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        if keep_alive:
+            head += f"Keep-Alive: timeout={int(KEEPALIVE_TIMEOUT)}\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n")
+        await writer.drain()
+
+
+async def _serve(args):
+    server = MediaServer(args.root)
+    host, port = await server.start(args.host, args.port)
+    print(f"✅ 媒体服务已启动：http://{host}:{port}（目录 {server.root}）", flush=True)
+    await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="本地媒体资源")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_p = sub.add_parser("build", help="转码并发布曲目")
+    build_p.add_argument("tracks", nargs="*", help=f"曲目（默认全部：{', '.join(TRACKS)}）")
+    build_p.add_argument("--format", choices=list(FORMATS), default=DEFAULT_FORMAT)
+    serve_p = sub.add_parser("serve", help="独立媒体服务（Range + 缓存头）")
+    serve_p.add_argument("--host", default=DEFAULT_HOST)
+    serve_p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_p.add_argument("--root", default=MEDIA_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if FORMATS[args.format].codec is not None and shutil.which("ffmpeg") is None:
+            parser.error("转码需要 ffmpeg；不转码可用 --format copy")
+        for name in args.tracks or TRACKS:
+            if name not in TRACKS:
+                parser.error(f"未知曲目：{name}")
+            track = TRACKS[name]
+            if not os.path.exists(track.path):
+                parser.error(f"找不到源文件：{track.path}")
+            entry = build(track, args.format)
+            ratio = entry["bytes"] / entry["source_bytes"]
+            print(f"{name}: {entry['file']}  {entry['bytes'] / 1e6:.1f} MB（源文件的 {ratio:.0%}）")
+        return
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
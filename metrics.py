@@ -0,0 +1,49 @@
+"""
+Prometheus 文本格式的延迟直方图（只依赖标准库），供 fitness_service 与 page_profile 共用。
+"""
+import math
+
+# 直方图桶上限（毫秒）
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    """累积直方图（Prometheus histogram 语义）"""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, ms):
+        self.n += 1
+        self.total += ms
+        for i, bound in enumerate(self.buckets):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q):
+        """按桶估算分位数（返回所在桶的上限）"""
+        if not self.n:
+            return 0.0
+        target = q * self.n
+        seen = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return math.inf
+
+    def prometheus_lines(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound / 1000:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.n}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total / 1000:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.n}")
+        return lines
@@ -0,0 +1,159 @@
+"""
+眼科知识库 (Knowledge Base)：数据放在磁盘上，按需加载。
+纯数据模块：不依赖 streamlit / pandas，任何进程都可以直接导入。
+
+目录结构（默认为本文件旁的 kb/，可用环境变量 OPHTH_KB_DIR 指定）：
+    kb/
+        toc.json               # 目录索引：section key -> 文件、类型、所属模块
+        sections/<key>.json    # 每个 section 一个文件：{"key", "module", "kind", "value"}
+
+    KB["red_eye"]              # {"cols": [...], "data": [...]}，首次访问时才读文件
+    "red_eye" in KB            # 只查目录索引
+    KB.module_sections(10)     # 模块十的全部 section（只读这几个文件）
+
+导入本模块不读任何文件；目录索引在第一次访问时读取一次，section 内容进有界 LRU
+（容量 KB_SECTION_CACHE_SIZE，默认 256），所以启动开销与知识库大小无关。
+新增或修改 section 文件后运行 `python ophth_kb.py index` 重建目录索引。
+"""
+import json
+import os
+from collections.abc import Mapping
+from functools import lru_cache
+
+DEFAULT_ROOT = os.environ.get("OPHTH_KB_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "kb")
+DEFAULT_CACHE_SIZE = int(os.environ.get("KB_SECTION_CACHE_SIZE", 256))
+
+TOC_FILE = "toc.json"
+SECTIONS_DIR = "sections"
+FORMAT_VERSION = 1
+
+
+class KnowledgeBase(Mapping):
+    """
+    只读的知识库映射：key -> section 内容。按 kind：
+        table   {"cols": [...], "data": [[...], ...]}
+        list    [[标题, 内容], ...]（口诀）
+        cases   [{"id", "title", "history", "exam", "question", "options", "answer", "correct", ...}, ...]（病例，见 quiz）
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, cache_size=DEFAULT_CACHE_SIZE):
+        self.root = root
+        self._toc = None
+        self._load = lru_cache(maxsize=cache_size)(self._read_section)
+
+    @property
+    def toc(self):
+        if self._toc is None:
+            with open(os.path.join(self.root, TOC_FILE), encoding="utf-8") as f:
+                toc = json.load(f)
+            if toc.get("version") != FORMAT_VERSION:
+                raise ValueError(f"不兼容的知识库索引：{os.path.join(self.root, TOC_FILE)}")
+            self._toc = toc
+        return self._toc
+
+    def _read_section(self, key):
+        entry = self.toc["sections"][key]
+        with open(os.path.join(self.root, entry["file"]), encoding="utf-8") as f:
+            return json.load(f)["value"]
+
+    def __getitem__(self, key):
+        if key not in self.toc["sections"]:
+            raise KeyError(key)
+        return self._load(key)
+
+    def __contains__(self, key):
+        return key in self.toc["sections"]
+
+    def __iter__(self):
+        return iter(self.toc["sections"])
+
+    def __len__(self):
+        return len(self.toc["sections"])
+
+    def sections(self, kind=None, module=None):
+        """按类型 / 模块筛选 section key（只查目录索引，不读内容）"""
+        return [key for key, entry in self.toc["sections"].items()
+                if (kind is None or entry["kind"] == kind) and (module is None or entry["module"] == module)]
+
+    def module_sections(self, module):
+        """某个模块的全部 section：{key: 内容}"""
+        return {key: self[key] for key in self.toc["modules"].get(str(module), [])}
+
+    def cache_stats(self):
+        info = self._load.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+
+    def clear_cache(self):
+        """清空 section 缓存并在下次访问时重新读取目录索引"""
+        self._load.cache_clear()
+        self._toc = None
+
+
+KB = KnowledgeBase()
+
+
+def _dumps_section(section):
+    """section 文件的写法：外层缩进，表格每行一行，方便直接编辑和 diff"""
+    value = section["value"]
+    head = {k: section[k] for k in ("key", "module", "kind")}
+    lines = ["{"] + [f"  {json.dumps(k)}: {json.dumps(v, ensure_ascii=False)}," for k, v in head.items()]
+    if section["kind"] == "table":
+        rows = ",\n".join(f"      {json.dumps(row, ensure_ascii=False)}" for row in value["data"])
+        lines += ['  "value": {', f'    "cols": {json.dumps(value["cols"], ensure_ascii=False)},',
+                  '    "data": [', rows, "    ]", "  }"]
+    else:
+        items = ",\n".join(f"    {json.dumps(item, ensure_ascii=False)}" for item in value)
+        lines += ['  "value": [', items, "  ]"]
+    return "\n".join(lines + ["}"]) + "\n"
+
+
+def write_section(root, key, module, kind, value):
+    """写入（或覆盖）一个 section 文件，返回相对路径；之后需要重建索引"""
+    rel = f"{SECTIONS_DIR}/{key}.json"
+    os.makedirs(os.path.join(root, SECTIONS_DIR), exist_ok=True)
+    with open(os.path.join(root, rel), "w", encoding="utf-8") as f:
+        f.write(_dumps_section({"key": key, "module": module, "kind": kind, "value": value}))
+    return rel
+
+
+def build_index(root=DEFAULT_ROOT):
+    """扫描 sections/ 重建 toc.json（先写临时文件再替换，读者不会看到写了一半的索引）"""
+    sections, modules = {}, {}
+    for name in sorted(os.listdir(os.path.join(root, SECTIONS_DIR))):
+        if not name.endswith(".json"):
+            continue
+        rel = f"{SECTIONS_DIR}/{name}"
+        with open(os.path.join(root, rel), encoding="utf-8") as f:
+            section = json.load(f)
+        key = section["key"]
+        if key in sections:
+            raise ValueError(f"重复的 section key：{key}（{sections[key]['file']} / {rel}）")
+        sections[key] = {"file": rel, "kind": section["kind"], "module": section["module"]}
+        modules.setdefault(str(section["module"]), []).append(key)
+
+    toc = {"version": FORMAT_VERSION, "sections": sections,
+           "modules": dict(sorted(modules.items(), key=lambda kv: int(kv[0])))}
+    path = os.path.join(root, TOC_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(toc, f, ensure_ascii=False, separators=(",", ":"))
+        f.write("\n")
+    os.replace(tmp, path)
+    return toc
+
+
+def main(argv=None):
+    import argparse  # 只有命令行工具需要；页面进程导入本模块时不加载
+
+    parser = argparse.ArgumentParser(description="眼科知识库工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+    index_p = sub.add_parser("index", help="扫描 sections/ 重建目录索引")
+    index_p.add_argument("--root", default=DEFAULT_ROOT)
+    args = parser.parse_args(argv)
+
+    toc = build_index(args.root)
+    print(f"{len(toc['sections'])} 个 section，{len(toc['modules'])} 个模块 -> {os.path.join(args.root, TOC_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
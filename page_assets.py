@@ -0,0 +1,120 @@
+"""
+页面样式资源：CSS 放在 styles/<名字>.css，页面每次 rerun 只按名字注册。
+
+    page_assets.inject("plus_base", "plus_landing")
+    page_assets.script_tag("plus_words")       # scripts/<名字>.js，供 st.html(..., unsafe_allow_javascript=True) 使用
+
+Streamlit 每次 rerun 都会清掉这次没有重新输出的元素，样式元素本身没法“只发一次”，
+能省的是每次发出去的内容。两种方式（环境变量 PAGE_ASSETS，默认 auto）：
+    static  首次使用时写出 static/<名字>.<内容哈希>.css，由 Streamlit 的静态文件服务提供
+            （.streamlit/config.toml 中 server.enableStaticServing = true），每次 rerun 只发一个 <link>；
+            内容变了文件名就变，浏览器缓存不会过期也不会用到旧样式；
+    inline  去掉注释和多余空白后合并成一个 <style> 发送（静态服务没开时的回退）；
+    auto    按 server.enableStaticServing 选择。
+样式文件在进程内只读取、压缩、计算哈希一次，所有会话共享。脚本同理（static 时为 <script src>，否则内联）。
+"""
+import hashlib
+import os
+import re
+from functools import lru_cache
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+STYLES_DIR = os.path.join(REPO_ROOT, "styles")
+SCRIPTS_DIR = os.path.join(REPO_ROOT, "scripts")
+STATIC_DIR = os.path.join(REPO_ROOT, "static")      # Streamlit 只提供主脚本旁边的 static/
+STATIC_URL = "app/static"
+MODE = os.environ.get("PAGE_ASSETS", "auto")
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_SPACE_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+_JS_COMMENT_RE = re.compile(r"^\s*//.*$", re.M)
+
+
+def minify(css):
+    """去注释、压缩空白；不改写选择器和取值（":" 前的空白保留，避免改变 `a :hover` 这类选择器）"""
+    css = _SPACE_RE.sub(" ", _COMMENT_RE.sub("", css))
+    css = _PUNCT_RE.sub(r"\1", css).replace(": ", ":")
+    return css.replace(";}", "}").strip()
+
+
+def minify_js(js):
+    """只去整行注释、缩进和空行；保留换行，不影响自动分号插入"""
+    lines = (line.strip() for line in _JS_COMMENT_RE.sub("", js).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class Asset:
+    __slots__ = ("name", "ext", "text", "digest")
+
+    def __init__(self, name, ext, text):
+        self.name = name
+        self.ext = ext
+        self.text = text
+        self.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:10]
+
+    @property
+    def filename(self):
+        return f"{self.name}.{self.digest}.{self.ext}"
+
+    def publish(self, static_dir=STATIC_DIR):
+        """写出带哈希的静态文件（已存在则跳过），返回页面引用的 URL"""
+        path = os.path.join(static_dir, self.filename)
+        if not os.path.exists(path):
+            os.makedirs(static_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.text)
+            os.replace(tmp, path)
+        return f"{STATIC_URL}/{self.filename}"
+
+
+@lru_cache(maxsize=None)
+def stylesheet(name):
+    with open(os.path.join(STYLES_DIR, f"{name}.css"), encoding="utf-8") as f:
+        return Asset(name, "css", minify(f.read()))
+
+
+@lru_cache(maxsize=None)
+def script(name):
+    with open(os.path.join(SCRIPTS_DIR, f"{name}.js"), encoding="utf-8") as f:
+        return Asset(name, "js", minify_js(f.read()))
+
+
+@lru_cache(maxsize=None)
+def _link(name):
+    return f'<link rel="stylesheet" href="{stylesheet(name).publish()}">'
+
+
+def static_enabled(st):
+    if MODE != "auto":
+        return MODE == "static"
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def markup(names, static):
+    """要发送的 HTML：static 为若干 <link>，否则为一个合并的 <style>（同名只出现一次）"""
+    names = list(dict.fromkeys(names))
+    if static:
+        return "".join(_link(name) for name in names)
+    return "<style>" + "".join(stylesheet(name).text for name in names) + "</style>"
+
+
+def script_markup(name, static):
+    if static:
+        return f'<script src="{script(name).publish()}"></script>'
+    return f"<script>{script(name).text}</script>"
+
+
+def script_tag(name):
+    """脚本的 HTML 片段，拼进 st.html(..., unsafe_allow_javascript=True) 的内容里"""
+    import streamlit as st
+
+    return script_markup(name, static_enabled(st))
+
+
+def inject(*names):
+    """在当前位置输出样式；每次 rerun 调用"""
+    import streamlit as st  # 运行时取 streamlit：static_export 用替身模块执行页面时也能捕获到样式
+
+    st.markdown(markup(names, static_enabled(st)), unsafe_allow_html=True)
@@ -0,0 +1,225 @@
+"""
+Streamlit 页面分段计时（默认关闭）。
+
+Streamlit 每次交互都会从头重跑整个页面脚本。打开后，每次 rerun 记录一组分段耗时（span），
+并累积到按页面 / 分段划分的直方图里。通过环境变量开启：
+
+    PAGE_PROFILE_LOG=spans.jsonl   每次 rerun 追加一行 JSON：{"page", "ts", "status", "ms", "spans": [...]}
+    PAGE_PROFILE_PORT=9108         在 127.0.0.1:9108/metrics 提供 Prometheus 文本格式的直方图
+
+页面里的用法：
+    page_profile.begin("review")             # 脚本开头
+    with page_profile.span("css"):
+        st.markdown(...)
+    page_profile.end()                       # 脚本结尾
+
+    @page_profile.timed("local_css")         # 整个函数计时
+    def local_css(page_type): ...
+
+    with page_profile.rerun("plus"):         # 或者把一次 rerun 包成上下文（st.rerun() 打断时记为 status="rerun"）
+        main()
+
+两个变量都没设置时：span() 返回同一个空上下文，timed() 原样返回函数，begin()/end() 直接返回。
+本模块由页面脚本导入，状态在进程内跨 rerun 保留（与 fitness_cache 同理）；
+每个会话的脚本在各自线程里执行，当前 rerun 的记录放在 thread-local 中。
+"""
+import json
+import os
+import threading
+import time
+import warnings
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metrics import LatencyHistogram
+
+LOG_PATH = os.environ.get("PAGE_PROFILE_LOG") or None
+PORT = int(os.environ.get("PAGE_PROFILE_PORT") or 0)
+ENABLED = bool(LOG_PATH or PORT)
+
+_local = threading.local()
+_lock = threading.Lock()
+_section_hist = {}     # (page, section) -> LatencyHistogram
+_rerun_hist = {}       # page -> LatencyHistogram
+_rerun_counts = {}     # (page, status) -> 次数
+_server = None
+
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _Noop()
+
+
+class _Rerun:
+    __slots__ = ("page", "ts", "start", "spans", "depth")
+
+    def __init__(self, page):
+        self.page = page
+        self.ts = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.depth = 0
+
+
+class _Span:
+    __slots__ = ("name", "detail", "start", "run")
+
+    def __init__(self, name, detail):
+        self.name = name
+        self.detail = detail
+
+    def __enter__(self):
+        self.run = getattr(_local, "run", None)
+        if self.run is not None:
+            self.run.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        ms = (end - self.start) * 1000
+        run = self.run
+        page = run.page if run is not None else "-"
+        if run is not None:
+            run.depth -= 1
+            span = {"name": self.name, "start_ms": round((self.start - run.start) * 1000, 3),
+                    "ms": round(ms, 3), "depth": run.depth}
+            if self.detail is not None:
+                span["detail"] = self.detail
+            run.spans.append(span)
+        _observe(_section_hist, (page, self.name), ms)
+        return False
+
+
+def _observe(table, key, ms):
+    with _lock:
+        hist = table.get(key)
+        if hist is None:
+            hist = table[key] = LatencyHistogram()
+        hist.observe(ms)
+
+
+def span(name, detail=None):
+    """给一段代码计时；detail 只写进 JSONL（例如表格 key），直方图只按 name 聚合"""
+    return _Span(name, detail) if ENABLED else _NOOP
+
+
+def timed(name=None):
+    """函数计时装饰器；关闭时原样返回函数，没有任何额外开销"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(label, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin(page):
+    """标记一次 rerun 开始。上一次 rerun 若被异常打断而没有 end()，直接丢弃"""
+    if not ENABLED:
+        return
+    _ensure_server()
+    _local.run = _Rerun(page)
+
+
+def end(status="ok"):
+    """标记 rerun 结束：写 JSONL、更新直方图，返回本次记录（未开启时返回 None）"""
+    run = getattr(_local, "run", None) if ENABLED else None
+    if run is None:
+        return None
+    _local.run = None
+    ms = (time.perf_counter() - run.start) * 1000
+    record = {"page": run.page, "ts": round(run.ts, 3), "status": status, "ms": round(ms, 3), "spans": run.spans}
+    _observe(_rerun_hist, run.page, ms)
+    with _lock:
+        _rerun_counts[run.page, status] = _rerun_counts.get((run.page, status), 0) + 1
+        if LOG_PATH:
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+
+class rerun:
+    """把一次 rerun 包成上下文；异常照常抛出（Streamlit 用 RerunException / StopException 控制流程）"""
+
+    __slots__ = ("page",)
+
+    def __init__(self, page):
+        self.page = page
+
+    def __enter__(self):
+        begin(self.page)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            end()
+        else:
+            name = exc_type.__name__
+            end("rerun" if name == "RerunException" else "stop" if name == "StopException" else "error")
+        return False
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+
+def prometheus_text():
+    """当前累积的直方图与计数（Prometheus 文本格式）"""
+    lines = ["# TYPE page_rerun_seconds histogram"]
+    with _lock:
+        for page, hist in sorted(_rerun_hist.items()):
+            lines += hist.prometheus_lines("page_rerun_seconds", _labels(page=page))
+        lines.append("# TYPE page_section_seconds histogram")
+        for (page, section), hist in sorted(_section_hist.items()):
+            lines += hist.prometheus_lines("page_section_seconds", _labels(page=page, section=section))
+        lines.append("# TYPE page_reruns_total counter")
+        for (page, status), count in sorted(_rerun_counts.items()):
+            lines.append(f"page_reruns_total{{{_labels(page=page, status=status)}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _ensure_server():
+    """第一次 begin() 时在后台线程启动 /metrics（每个进程一次）"""
+    global _server
+    if not PORT or _server is not None:
+        return
+    with _lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", PORT), _MetricsHandler)
+        except OSError as e:  # 端口被占用（例如同时开了多个页面进程）时只保留 JSONL，不影响页面
+            warnings.warn(f"page_profile: 无法监听端口 {PORT}：{e}", RuntimeWarning, stacklevel=3)
+            _server = False
+            return
+        threading.Thread(target=_server.serve_forever, name="page-profile-metrics", daemon=True).start()
@@ -0,0 +1,255 @@
+"""
+测验引擎：病例题与选择题都来自数据，整份答卷一次判分。
+
+题目来源：
+    - 病例题：知识库中 kind 为 "cases" 的 section（模块十一），每个病例一道单选题；
+    - 表格题：由 KB 表格自动生成，"<首列名>「<首列值>」对应的<某列>是？"，
+      干扰项取同一列其他行的值（例如 角膜炎类型 -> 首选药物）。
+      选项顺序由题目 id 决定（crc32 作种子），同一道题在任何进程里都一样。
+
+    answer_key()                                  # {题目 id: 正确选项}，进程内构造一次
+    grade({"case:hsk": "局部滴更昔洛韦凝胶"})       # 单份答卷：一次遍历查表判分
+    grade_batch(submissions)                      # 成千上万份答卷：编码成矩阵后整体比较，给出班级统计
+    SUBMISSIONS.append("alice", answers, "cases") # 答卷存为 JSONL（QUIZ_LOG），`python quiz.py report` 按类型汇总
+
+答案按选项文字比较（不是下标），所以选项顺序调整不影响已保存的答卷。
+"""
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from ophth_kb import KB
+
+DEFAULT_LOG = os.environ.get("QUIZ_LOG") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz_submissions.jsonl")
+MAX_OPTIONS = 4
+MIN_OPTIONS = 3
+# 答卷类型：病例考试（全部病例题）与知识点自测（每组随机 5 道表格题），班级统计分开汇总
+KINDS = ("cases", "drill")
+
+
+class Question:
+    __slots__ = ("id", "module", "prompt", "options", "answer", "source")
+
+    def __init__(self, id, module, prompt, options, answer, source):
+        self.id = id
+        self.module = module
+        self.prompt = prompt
+        self.options = tuple(options)
+        self.answer = answer
+        self.source = source
+
+    def __repr__(self):
+        return f"Question({self.id!r})"
+
+
+class Case:
+    """病例：病史、查体 + 一道单选题，以及答对 / 答错时的反馈"""
+    __slots__ = ("id", "title", "history", "exam", "question", "correct", "wrong", "explanation")
+
+    def __init__(self, id, title, history, exam, question, correct, wrong=None, explanation=None):
+        self.id = id
+        self.title = title
+        self.history = history
+        self.exam = exam
+        self.question = question
+        self.correct = correct
+        self.wrong = wrong or f"❌ 错误。正确答案：{question.answer}"
+        self.explanation = explanation
+
+    def __repr__(self):
+        return f"Case({self.id!r})"
+
+
+@lru_cache(maxsize=1)
+def cases():
+    result = []
+    for key in KB.sections(kind="cases"):
+        module = KB.toc["sections"][key]["module"]
+        for c in KB[key]:
+            question = Question(f"case:{c['id']}", module, c["question"], c["options"], c["answer"], key)
+            result.append(Case(c["id"], c["title"], c["history"], c["exam"], question,
+                               c["correct"], c.get("wrong"), c.get("explanation")))
+    return tuple(result)
+
+
+def _table_questions(key, module, table):
+    cols, rows = table["cols"], table["data"]
+    for j, col in enumerate(cols[1:], 1):
+        values = list(dict.fromkeys(row[j] for row in rows))
+        if len(values) < MIN_OPTIONS:
+            continue
+        for row in rows:
+            qid = f"{key}:{row[0]}:{col}"
+            rng = random.Random(zlib.crc32(qid.encode("utf-8")))
+            distractors = rng.sample([v for v in values if v != row[j]], min(MAX_OPTIONS, len(values)) - 1)
+            options = distractors + [row[j]]
+            rng.shuffle(options)
+            yield Question(qid, module, f"{cols[0]}「{row[0]}」对应的{col}是？", options, row[j], key)
+
+
+@lru_cache(maxsize=1)
+def generated_questions():
+    """全部 KB 表格自动生成的选择题（值不足 3 种的列不出题）"""
+    questions = []
+    for key in KB.sections(kind="table"):
+        questions.extend(_table_questions(key, KB.toc["sections"][key]["module"], KB[key]))
+    return tuple(questions)
+
+
+@lru_cache(maxsize=1)
+def question_index():
+    """题目 id -> Question（病例题 + 表格题）"""
+    return {q.id: q for q in [c.question for c in cases()] + list(generated_questions())}
+
+
+@lru_cache(maxsize=1)
+def answer_key():
+    """题目 id -> 正确选项文字：判分只需一次字典查找"""
+    return {qid: q.answer for qid, q in question_index().items()}
+
+
+def sample(n, seed=None, modules=None):
+    """随机抽 n 道表格题（可限定模块）"""
+    pool = [q for q in generated_questions() if modules is None or q.module in modules]
+    return random.Random(seed).sample(pool, min(n, len(pool)))
+
+
+def grade(answers, questions=None):
+    """
+    单份答卷判分。answers 为 {题目 id: 所选选项}，questions 为应答题目 id（默认即 answers 中的题目，
+    没作答的题记为错）。未知题目 id 不计分，列在 unknown 中。
+    """
+    key = answer_key()
+    questions = list(answers) if questions is None else list(questions)
+    results, unknown = {}, []
+    for qid in questions:
+        if qid in key:
+            results[qid] = answers.get(qid) == key[qid]
+        else:
+            unknown.append(qid)
+    score = sum(results.values())
+    return {"score": score, "total": len(results), "ratio": score / len(results) if results else 0.0,
+            "results": results, "unknown": unknown}
+
+
+def grade_batch(submissions, questions=None):
+    """
+    批量判分，用于班级统计。submissions 为 {题目 id: 所选选项} 的序列；questions 默认为所有答卷中出现过的已知题目。
+    与 grade 一样，questions 中的未知题目 id 不计分，列在 unknown 中。
+    先把答卷编码成 (答卷数 × 题目数) 的选项下标矩阵（-1 = 未作答，-2 = 不是该题的选项），再与答案向量整体比较。
+    返回 {"questions", "scores", "answered", "correct"(布尔矩阵), "accuracy"(每题正确率), "mean", "median", "unknown"}。
+    """
+    submissions = list(submissions)
+    index = question_index()
+    if questions is None:
+        questions, unknown = sorted({qid for answers in submissions for qid in answers if qid in index}), []
+    else:
+        unknown = [qid for qid in questions if qid not in index]
+        questions = [qid for qid in questions if qid in index]
+    # 每题一张 选项 -> 下标 的表，None（未作答）-> -1
+    codes = [{None: -1, **{option: i for i, option in enumerate(index[qid].options)}} for qid in questions]
+    key = np.array([code[index[qid].answer] for qid, code in zip(questions, codes)], dtype=np.int8)
+
+    pairs = list(zip(questions, codes))
+    chosen = np.fromiter((code.get(answers.get(qid), -2) for answers in submissions for qid, code in pairs),
+                         dtype=np.int8, count=len(submissions) * len(questions))
+    chosen = chosen.reshape(len(submissions), len(questions))
+
+    correct = chosen == key
+    scores = correct.sum(axis=1)
+    answered = chosen != -1
+    with np.errstate(invalid="ignore"):
+        accuracy = correct.sum(axis=0) / answered.sum(axis=0)
+    return {"questions": list(questions), "scores": scores, "answered": answered.sum(axis=1), "correct": correct,
+            "accuracy": accuracy, "mean": float(scores.mean()) if len(scores) else 0.0,
+            "median": float(np.median(scores)) if len(scores) else 0.0, "unknown": unknown}
+
+
+class SubmissionLog:
+    """答卷记录（JSONL，每行 {"user", "time", "kind", "answers"}），多个会话线程共享时按行追加"""
+
+    def __init__(self, path=DEFAULT_LOG):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, user, answers, kind="cases"):
+        if kind not in KINDS:
+            raise ValueError(f"未知的答卷类型：{kind}")
+        line = json.dumps({"user": user, "time": int(time.time()), "kind": kind, "answers": answers},
+                          ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def __iter__(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+SUBMISSIONS = SubmissionLog()
+
+
+def record_kind(record):
+    """答卷类型；没有 kind 字段的旧记录按题目推断（全是病例题即病例考试）"""
+    kind = record.get("kind")
+    if kind is None:
+        kind = "cases" if all(qid.startswith("case:") for qid in record["answers"]) else "drill"
+    return kind
+
+
+def merge_answers(records):
+    """
+    按类型合并每个用户的答卷：{类型: {用户: 答案}}。同一题以最后一次作答为准，
+    所以做一组自测不会覆盖同一学生的病例考试答案。
+    """
+    merged = {kind: {} for kind in KINDS}
+    for record in records:
+        merged.setdefault(record_kind(record), {}).setdefault(record["user"], {}).update(record["answers"])
+    return merged
+
+
+def report(records, hardest=10):
+    """班级统计：病例考试与知识点自测分开汇总，每个用户同类答卷合并后判分"""
+    index = question_index()
+    for kind, answers in merge_answers(records).items():
+        result = grade_batch(answers.values())
+        print(f"[{kind}] {len(answers)} 名学生，{len(result['questions'])} 道题，"
+              f"平均得分 {result['mean']:.2f}，中位数 {result['median']:.1f}")
+        if not answers:
+            continue
+        order = np.argsort(np.nan_to_num(result["accuracy"], nan=2.0))[:hardest]
+        print("正确率最低的题目：")
+        for j in order:
+            qid = result["questions"][j]
+            print(f"  {result['accuracy'][j]:6.1%}  {index[qid].prompt}  [{qid}]")
+        print()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="测验引擎")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report_p = sub.add_parser("report", help="汇总已保存的答卷")
+    report_p.add_argument("path", nargs="?", default=DEFAULT_LOG)
+    report_p.add_argument("--hardest", type=int, default=10)
+    sub.add_parser("stats", help="题库规模")
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        print(f"病例题 {len(cases())} 道，表格题 {len(generated_questions())} 道")
+        return
+    report(SubmissionLog(args.path), args.hardest)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
-import streamlit as st
-import pandas as pd
 import random
 
+import streamlit as st
+
+import page_assets
+import page_profile
+from kb_cache import table_frame
+from ophth_kb import KB
+
 # ==========================================
 # 1. 页面配置与专业样式
 # ==========================================
@@ -12,126 +17,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 注入CSS：增加信息密度，区分重点
-st.markdown("""
-<style>
-    .stApp { font-family: 'Microsoft YaHei', sans-serif; }
-    
-    /* 核心概念 (蓝色) */
-    .concept-box { background-color: #e3f2fd; padding: 15px; border-radius: 8px; border-left: 5px solid #2196f3; margin-bottom: 15px; color: #0d47a1; }
-    
-    /* 机制解析 (紫色) */
-    .mech-box { background-color: #f3e5f5; padding: 15px; border-radius: 8px; border-left: 5px solid #ab47bc; margin-bottom: 15px; color: #4a148c; }
-    
-    /* 考试陷阱 (红色) - 必背 */
-    .pitfall-box { background-color: #ffebee; padding: 15px; border-radius: 8px; border-left: 5px solid #ef5350; margin-bottom: 15px; color: #b71c1c; font-weight: bold; }
-    
-    /* 记忆口诀 (黄色) */
-    .mnemonic-box { background-color: #fffde7; padding: 15px; border-radius: 8px; border: 2px dashed #fbc02d; font-style: italic; margin-bottom: 15px; color: #f57f17; }
-    
-    /* 药物卡片 */
-    .drug-card { background-color: #e0f2f1; padding: 10px; border-radius: 5px; margin-bottom: 10px; border: 1px solid #80cbc4; }
-
-    h1, h2, h3 { color: #2c3e50; }
-</style>
-""", unsafe_allow_html=True)
-
 # ==========================================
-# 2. 全量知识库 (Knowledge Base) - 包含所有细节
+# 2. 全量知识库 (Knowledge Base)：数据在 kb/ 目录，由 ophth_kb 按模块按需加载
 # ==========================================
 
-KB = {
-    # --- 模块1：泪液 ---
-    "tear_layers": {
-        "cols": ["层次", "名称", "来源", "功能", "对应干眼类型"],
-        "data": [
-            ["外层", "脂质层", "睑板腺", "防蒸发", "蒸发过强型 (MGD)"],
-            ["中层", "水液层", "泪腺", "供养、冲洗", "水液缺乏型 (SS)"],
-            ["内层", "黏蛋白层", "杯状细胞", "亲水界面", "黏蛋白缺乏型"]
-        ]
-    },
-    # --- 模块2：角膜 ---
-    "cornea_layers": {
-        "cols": ["层次", "名称", "再生能力", "损伤后果"],
-        "data": [
-            ["1", "上皮细胞", "✅ 极强 (24h)", "不留瘢痕"],
-            ["2", "前弹力层", "❌ 不可再生", "留云翳/斑翳"],
-            ["3", "基质层", "❌ 不可再生", "留瘢痕 (最厚占90%)"],
-            ["4", "后弹力层", "✅ 可再生", "耐侵蚀 (可致后弹力层膨出)"],
-            ["5", "内皮细胞", "❌ 绝对不可", "失代偿致角膜水肿 (大泡性病变)"]
-        ]
-    },
-    # --- 模块3：红眼 ---
-    "red_eye": {
-        "cols": ["特征", "结膜充血", "睫状充血"],
-        "data": [
-            ["血管", "结膜后A (浅)", "睫状前A (深)"],
-            ["颜色", "鲜红", "紫红"],
-            ["形态", "树枝状", "毛刷/放射状"],
-            ["移动", "推得动", "推不动"],
-            ["肾上腺素", "敏感 (变白)", "不敏感"],
-            ["常见病", "结膜炎", "角膜炎/虹睫炎/青光眼"]
-        ]
-    },
-    # --- 模块4：角膜炎 ---
-    "keratitis": {
-        "cols": ["类型", "诱因", "症状特征", "典型体征", "首选药物"],
-        "data": [
-            ["细菌性", "外伤/戴镜", "急、痛、脓多", "边界不清、湿润坏死", "左氧氟沙星/妥布霉素"],
-            ["真菌性", "植物划伤", "缓、症征分离", "羽毛状、卫星灶、菌丝苔被", "纳他霉素/氟康唑"],
-            ["病毒性", "感冒复发", "痛感轻(知觉减退)", "树枝状、地图状", "更昔洛韦 (忌激素)"],
-            ["棘阿米巴", "角膜接触镜", "剧烈疼痛", "放射状神经炎", "氯己定/聚六亚甲基双胍"]
-        ]
-    },
-    # --- 模块5：白内障 ---
-    "cataract_stages": {
-        "cols": ["分期", "特征", "考点并发症"],
-        "data": [
-            ["初发期", "楔形混浊", "视力多正常"],
-            ["膨胀期", "吸水肿胀", "诱发急性闭角型青光眼"],
-            ["成熟期", "完全混浊", "手术最佳时机"],
-            ["过熟期", "皮质液化", "诱发晶状体溶解性青光眼"]
-        ]
-    },
-    # --- 模块10：药物治疗 (详细版) ---
-    "drugs_mydriatics": {
-        "cols": ["药物", "作用机制", "适应症", "禁忌症/副作用"],
-        "data": [
-            ["阿托品 (Atropine)", "M受体阻滞 (麻痹睫状肌)", "虹睫炎(首选)、儿童验光", "❌ 青光眼禁用 (散瞳致房角关闭)"],
-            ["托吡卡胺", "短效散瞳", "眼底检查、成人验光", "青光眼慎用"],
-            ["肾上腺素", "α受体激动", "散瞳、降眼压", "高血压、心脏病慎用"]
-        ]
-    },
-    "drugs_miotics": {
-        "cols": ["药物", "作用机制", "适应症", "考点"],
-        "data": [
-            ["毛果芸香碱 (Pilocarpine)", "M受体激动 (收缩瞳孔)", "闭角型青光眼 (拉开房角)", "长期用致虹膜后粘连；虹睫炎禁用"]
-        ]
-    },
-    "drugs_glaucoma": {
-        "cols": ["药物类别", "代表药", "降压机制", "禁忌"],
-        "data": [
-            ["β-受体阻滞剂", "噻摩洛尔 (Timolol)", "减少房水生成", "❌ 哮喘、房室传导阻滞"],
-            ["前列腺素衍生物", "拉坦前列素", "增加葡萄膜巩膜流出", "睫毛变长、虹膜变黑"],
-            ["碳酸酐酶抑制剂", "布林佐胺", "减少房水生成", "磺胺过敏者慎用"],
-            ["高渗剂", "甘露醇", "脱水", "心功能不全者慎用"]
-        ]
-    },
-    # --- 模块12：口诀 ---
-    "mnemonics_list": [
-        ("红眼鉴别", "结膜鲜红穹隆起，推之能动肾上消；睫状紫红角膜绕，推之不动难消退。"),
-        ("泪液结构", "外油中水内黏膜：油防蒸发水供养，黏膜抓水亲上皮。"),
-        ("角膜再生", "上皮再生不留痕，前弹基质留疤痕；后弹坚韧防穿孔，内皮只大不生人。"),
-        ("角膜炎", "细菌急脓性多，真菌缓羽毛扩，病毒复树枝长。"),
-        ("晶体脱位", "Marfan 高富帅往上看(外上)；同型 傻白甜往下看(内下)。"),
-        ("白内障", "初发楔形，膨胀青光(闭)，成熟全白，过熟青光(开)。"),
-        ("虹睫炎", "充血紫，瞳孔小，KP房闪视力掉；阿托品，散瞳孔，抗炎激素少不了。"),
-        ("青光眼", "大杯垂直长(C/D)，盘沿ISNT亡，血管鼻侧移，刺刀出血忙。"),
-        ("视网膜", "动脉阻塞樱桃红，静脉阻塞火焰红。"),
-        ("眼外伤", "前房积血半卧位，碱烧冲洗是首位。")
-    ]
-}
-
 # ==========================================
 # 3. 辅助函数
 # ==========================================
@@ -139,12 +28,11 @@ KB = {
 def render_table(key, blind_mode=False):
     """渲染表格"""
     if key in KB:
-        df = pd.DataFrame(KB[key]["data"], columns=KB[key]["cols"])
-        if blind_mode:
-            st.dataframe(df.iloc[:, [0]], use_container_width=True)
-            st.warning("🙈 遮挡模式开启：请背诵被隐藏的内容！")
-        else:
-            st.dataframe(df, use_container_width=True)
+        with page_profile.span("render_table", key):
+            # 表格与遮挡视图在进程内只构造一次（见 kb_cache），这里不再新建 DataFrame
+            st.dataframe(table_frame(key, blind_mode), use_container_width=True)
+            if blind_mode:
+                st.warning("🙈 遮挡模式开启：请背诵被隐藏的内容！")
 
 def box(type, title, text):
     """渲染彩色框"""
@@ -153,204 +41,241 @@ def box(type, title, text):
     elif type == "pitfall": st.markdown(f'<div class="pitfall-box">🛑 <b>{title}</b><br>{text}</div>', unsafe_allow_html=True)
     elif type == "mnemonic": st.markdown(f'<div class="mnemonic-box">🔔 <b>口诀：</b>{text}</div>', unsafe_allow_html=True)
 
-# ==========================================
-# 4. 侧边栏与导航
-# ==========================================
-with st.sidebar:
-    st.title("👁️ OphthPro Max")
-    st.caption("全考点・无死角・最终版")
-    st.divider()
-    
-    page = st.radio("复习模块导航", [
-        "0. 🏠 首页 (Dashboard)",
-        "1. 💧 解剖：泪液与干眼",
-        "2. 👁️ 解剖：角膜五层楼",
-        "3. 🔴 鉴别：红眼三大魔头",
-        "4. 🦠 疾病：角膜炎体系",
-        "5. ☁️ 疾病：白内障全解析",
-        "6. 🌑 疾病：青光眼机制",
-        "7. 🔥 疾病：葡萄膜炎",
-        "8. 🚑 急诊：眼外伤处理",
-        "9. 🩺 拓展：视网膜与眼底",
-        "10. 💊 治疗：核心药物 (已填充)",
-        "11. ⚔️ 实战：病例模拟 (已填充)",
-        "12. 🎒 宝典：口诀汇总 (已填充)"
-    ])
+with page_profile.rerun("review"):
+    # 注入CSS：增加信息密度，区分重点（styles/review.css）
+    with page_profile.span("css"):
+        page_assets.inject("review")
 
-# ==========================================
-# 5. 页面逻辑
-# ==========================================
+    # ==========================================
+    # 4. 侧边栏与导航
+    # ==========================================
+    with st.sidebar:
+        st.title("👁️ OphthPro Max")
+        st.caption("全考点・无死角・最终版")
+        st.divider()
 
-if page.startswith("0"):
-    st.title("眼科全书复习站")
-    st.info("👋 同学你好！这是基于文档生成的完整复习系统。后三个板块已全部填充完毕。")
-    c1, c2 = st.columns(2)
-    with c1:
-        box("concept", "复习路径", "先看解剖 -> 再背鉴别 -> 最后刷病例")
-    with c2:
-        box("pitfall", "今日必背", "单纯疱疹病毒性角膜炎（上皮型）**绝对禁用激素**！")
-
-# ... (中间板块 1-9 保持之前的逻辑，此处简化显示，但核心数据在KB里) ...
-elif page.startswith("1"):
-    st.title("💧 模块一：泪液与干眼")
-    render_table("tear_layers")
-    box("mech", "机制", "黏蛋白不仅抓水，还能降低表面张力，让泪膜铺平。")
-    st.subheader("检查")
-    st.write("BUT < 10s = 不稳定；Schirmer < 10mm = 分泌少。")
-
-elif page.startswith("2"):
-    st.title("👁️ 模块二：角膜五层楼")
-    render_table("cornea_layers")
-    box("pitfall", "内皮细胞", "只会变大填补，不会分裂！白内障手术最怕伤这层。")
-
-elif page.startswith("3"):
-    st.title("🔴 模块三：红眼鉴别")
-    blind = st.toggle("🛡️ 遮挡模式")
-    render_table("red_eye", blind)
-    box("mech", "充血深度", "结膜血管浅(鲜红)，睫状血管深(紫红)。")
-
-elif page.startswith("4"):
-    st.title("🦠 模块四：角膜炎体系")
-    blind = st.toggle("🛡️ 遮挡答案")
-    render_table("keratitis", blind)
-    box("pitfall", "真菌性角膜炎", "虽然症状轻，但后果严重。禁用激素！首选纳他霉素。")
-
-elif page.startswith("5"):
-    st.title("☁️ 模块五：白内障")
-    render_table("cataract_stages")
-    st.info("晶状体脱位：Marfan (外上)，同型半胱氨酸 (内下)。")
-
-elif page.startswith("6"):
-    st.title("🌑 模块六：青光眼")
-    st.subheader("开角 vs 闭角")
-    st.write("闭角：房角关闭 (门关了)，急诊。")
-    st.write("开角：小梁网堵塞 (下水道堵了)，慢病。")
-    box("mech", "C/D比", "生理性大视杯 < 0.6，两眼差 < 0.2。超过提示青光眼。")
-
-elif page.startswith("7"):
-    st.title("🔥 模块七：葡萄膜炎")
-    st.write("前葡萄膜炎核心三联征：KP + 房水闪辉 + 瞳孔缩小。")
-    box("concept", "治疗首选", "阿托品散瞳！(防止后粘连，缓解痉挛止痛)")
-
-elif page.startswith("8"):
-    st.title("🚑 模块八：眼外伤")
-    st.error("🚨 化学烧伤：就地冲洗！酸凝固，碱溶解(更重)。")
-    st.warning("🚨 眼球破裂：禁冲洗，禁挤压，盖上盾牌速送医。")
-
-elif page.startswith("9"):
-    st.title("🩺 模块九：视网膜")
-    st.write("CRAO (动脉阻塞)：黄斑樱桃红斑。")
-    st.write("CRVO (静脉阻塞)：火焰状出血。")
+        page = st.radio("复习模块导航", [
+            "0. 🏠 首页 (Dashboard)",
+            "1. 💧 解剖：泪液与干眼",
+            "2. 👁️ 解剖：角膜五层楼",
+            "3. 🔴 鉴别：红眼三大魔头",
+            "4. 🦠 疾病：角膜炎体系",
+            "5. ☁️ 疾病：白内障全解析",
+            "6. 🌑 疾病：青光眼机制",
+            "7. 🔥 疾病：葡萄膜炎",
+            "8. 🚑 急诊：眼外伤处理",
+            "9. 🩺 拓展：视网膜与眼底",
+            "10. 💊 治疗：核心药物 (已填充)",
+            "11. ⚔️ 实战：病例模拟 (已填充)",
+            "12. 🎒 宝典：口诀汇总 (已填充)"
+        ], key="nav")
 
-# ==========================================
-# 重点填充：模块 10, 11, 12
-# ==========================================
+        # 全文检索：点击命中结果直接跳到对应模块
+        query = st.text_input("🔍 搜索知识点", placeholder="药名、体征、口诀…")
+        if query.strip():
+            import kb_search  # 延迟加载：不搜索的会话不打开索引
 
-elif page.startswith("10"):
-    st.title("💊 模块十：核心药物全解")
-    st.write("药理机制是选择题和病例分析的基石。")
-    
-    tab1, tab2, tab3 = st.tabs(["散瞳药 (Mydriatics)", "缩瞳药 (Miotics)", "青光眼降压药"])
-    
-    with tab1:
-        st.subheader("阿托品 vs 托吡卡胺")
-        render_table("drugs_mydriatics")
-        box("mech", "为什么要给虹睫炎散瞳？", 
-            "1. 麻痹睫状肌 -> 缓解痉挛性疼痛。\n"
-            "2. 散大瞳孔 -> 防止虹膜与晶状体发生**后粘连** (一旦粘连，房水流通受阻 -> 继发青光眼)。")
-        box("pitfall", "死刑误区", "青光眼患者（尤其闭角型）**绝对禁用**阿托品！散瞳会堆积虹膜根部，彻底堵死房角。")
-
-    with tab2:
-        st.subheader("毛果芸香碱 (Pilocarpine)")
-        render_table("drugs_miotics")
-        box("concept", "缩瞳机制", "收缩瞳孔括约肌 -> 拉紧虹膜 -> 机械性拉开房角 -> 房水流出。")
-
-    with tab3:
-        st.subheader("青光眼药物体系")
-        render_table("drugs_glaucoma")
-        box("pitfall", "全身副作用", "噻摩洛尔 (Timolol) 是β受体阻滞剂，哮喘和心动过缓患者禁用！")
-
-elif page.startswith("11"):
-    st.title("⚔️ 模块十一：病例实战演练")
-    st.markdown("还原真实临床场景，请先思考再点开答案。")
-    
-    # Case 1
-    with st.expander("📝 病例 1：奇怪的“感冒眼”", expanded=True):
-        st.markdown("""
-        **病史**：30岁女性，最近工作压力大，感冒刚愈。右眼红痛、畏光、流泪。
-        **查体**：视力0.6。裂隙灯见角膜中央有树枝状浸润，末端膨大。角膜知觉减退。
-        """)
-        q1 = st.radio("首选治疗方案？", ["局部滴地塞米松", "局部滴更昔洛韦凝胶", "全身抗真菌", "立即角膜移植"], key="c1")
-        
-        if st.button("提交病例 1"):
-            if q1 == "局部滴更昔洛韦凝胶":
-                st.success("✅ 正确！诊断：单纯疱疹病毒性角膜炎 (HSK)。")
-                box("mech", "解析", "树枝状+知觉减退=HSV。首选抗病毒。**禁用激素**，否则溃疡加深穿孔。")
-            else:
-                st.error("❌ 错误。树枝状溃疡绝对不能用激素！")
-
-    # Case 2
-    with st.expander("📝 病例 2：农民的角膜溃疡"):
-        st.markdown("""
-        **病史**：55岁男性，农民。10天前收割稻谷时右眼被稻穗擦伤。现眼痛加剧。
-        **查体**：混合充血，角膜中央灰白溃疡，表面干燥，边缘呈羽毛状，可见卫星灶。前房积脓。
-        """)
-        q2 = st.radio("最可能的致病菌？", ["金黄色葡萄球菌", "棘阿米巴", "镰刀菌 (真菌)", "腺病毒"], key="c2")
-        
-        if st.button("提交病例 2"):
-            if q2 == "镰刀菌 (真菌)":
-                st.success("✅ 正确！植物外伤+干燥/羽毛状/卫星灶 = 真菌性角膜炎。")
-            else:
-                st.error("❌ 错误。植物划伤首先考虑真菌。")
-
-    # Case 3
-    with st.expander("📝 病例 3：剧痛的隐形眼镜佩戴者"):
-        st.markdown("""
-        **病史**：22岁大学生，长期佩戴软性隐形眼镜，常用自来水冲洗镜盒。右眼剧烈疼痛，甚至无法睡眠。
-        **查体**：视力0.1。角膜基质环形浸润，沿神经放射状分布。
-        """)
-        q3 = st.radio("诊断？", ["细菌性角膜炎", "棘阿米巴角膜炎", "过敏性结膜炎"], key="c3")
-        
-        if st.button("提交病例 3"):
-            if q3 == "棘阿米巴角膜炎":
-                st.success("✅ 正确！CL佩戴史 + 自来水 + 剧痛(症征分离) = 棘阿米巴。")
-    
-    # Case 4
-    with st.expander("📝 病例 4：头痛呕吐的老太太"):
+            with page_profile.span("search"):
+                hits = kb_search.default_index().search(query, limit=8)
+            if not hits:
+                st.caption("没有找到相关内容")
+            for i, hit in enumerate(hits):
+                st.button(f"{hit['title']} · {hit['label'].split(' ', 1)[-1]}", key=f"hit_{i}",
+                          on_click=lambda label=hit["label"]: st.session_state.update(nav=label))
+                st.caption(hit["snippet"])
+
+        # 间隔重复：每行表格 / 每条口诀是一张卡片，按学号记录进度（见 srs）
+        st.divider()
+        user = st.text_input("👤 学号 / 昵称", placeholder="填写后开启今日复习").strip()
+        if user:
+            import srs  # 延迟加载：未登记的会话不打开数据库
+
+            with page_profile.span("srs"):
+                store = srs.default_store()
+                cards = srs.card_index()
+                queue = [card for card in store.today(user) if card in cards]
+            with st.expander(f"🔁 今日复习（剩 {len(queue)} 张）", expanded=True):
+                if not queue:
+                    st.success("🎉 今天的卡片都复习完了！")
+                else:
+                    card = cards[queue[0]]
+                    st.caption(f"模块 {card.module}")
+                    st.markdown(f"**{card.front}**")
+                    if st.session_state.get("srs_reveal") == card.id:
+                        st.write(card.back)
+                        for col, (grade, label) in zip(st.columns(4), [("again", "忘了"), ("hard", "模糊"),
+                                                                       ("good", "记得"), ("easy", "轻松")]):
+                            col.button(label, key=f"srs_{grade}", on_click=store.review,
+                                       args=(user, card.id, srs.GRADES[grade]))
+                    else:
+                        st.button("显示答案", key="srs_show",
+                                  on_click=lambda card_id=card.id: st.session_state.update(srs_reveal=card_id))
+
+    # ==========================================
+    # 5. 页面逻辑
+    # ==========================================
+
+    if page.startswith("0."):
+        st.title("眼科全书复习站")
+        st.info("👋 同学你好！这是基于文档生成的完整复习系统。后三个板块已全部填充完毕。")
+        c1, c2 = st.columns(2)
+        with c1:
+            box("concept", "复习路径", "先看解剖 -> 再背鉴别 -> 最后刷病例")
+        with c2:
+            box("pitfall", "今日必背", "单纯疱疹病毒性角膜炎（上皮型）**绝对禁用激素**！")
+
+    # ... (中间板块 1-9 保持之前的逻辑，此处简化显示，但核心数据在KB里) ...
+    elif page.startswith("1."):
+        st.title("💧 模块一：泪液与干眼")
+        render_table("tear_layers")
+        box("mech", "机制", "黏蛋白不仅抓水，还能降低表面张力，让泪膜铺平。")
+        st.subheader("检查")
+        st.write("BUT < 10s = 不稳定；Schirmer < 10mm = 分泌少。")
+
+    elif page.startswith("2."):
+        st.title("👁️ 模块二：角膜五层楼")
+        render_table("cornea_layers")
+        box("pitfall", "内皮细胞", "只会变大填补，不会分裂！白内障手术最怕伤这层。")
+
+    elif page.startswith("3."):
+        st.title("🔴 模块三：红眼鉴别")
+        blind = st.toggle("🛡️ 遮挡模式")
+        render_table("red_eye", blind)
+        box("mech", "充血深度", "结膜血管浅(鲜红)，睫状血管深(紫红)。")
+
+    elif page.startswith("4."):
+        st.title("🦠 模块四：角膜炎体系")
+        blind = st.toggle("🛡️ 遮挡答案")
+        render_table("keratitis", blind)
+        box("pitfall", "真菌性角膜炎", "虽然症状轻，但后果严重。禁用激素！首选纳他霉素。")
+
+    elif page.startswith("5."):
+        st.title("☁️ 模块五：白内障")
+        render_table("cataract_stages")
+        st.info("晶状体脱位：Marfan (外上)，同型半胱氨酸 (内下)。")
+
+    elif page.startswith("6."):
+        st.title("🌑 模块六：青光眼")
+        st.subheader("开角 vs 闭角")
+        st.write("闭角：房角关闭 (门关了)，急诊。")
+        st.write("开角：小梁网堵塞 (下水道堵了)，慢病。")
+        box("mech", "C/D比", "生理性大视杯 < 0.6，两眼差 < 0.2。超过提示青光眼。")
+
+    elif page.startswith("7."):
+        st.title("🔥 模块七：葡萄膜炎")
+        st.write("前葡萄膜炎核心三联征：KP + 房水闪辉 + 瞳孔缩小。")
+        box("concept", "治疗首选", "阿托品散瞳！(防止后粘连，缓解痉挛止痛)")
+
+    elif page.startswith("8."):
+        st.title("🚑 模块八：眼外伤")
+        st.error("🚨 化学烧伤：就地冲洗！酸凝固，碱溶解(更重)。")
+        st.warning("🚨 眼球破裂：禁冲洗，禁挤压，盖上盾牌速送医。")
+
+    elif page.startswith("9."):
+        st.title("🩺 模块九：视网膜")
+        st.write("CRAO (动脉阻塞)：黄斑樱桃红斑。")
+        st.write("CRVO (静脉阻塞)：火焰状出血。")
+
+    # ==========================================
+    # 重点填充：模块 10, 11, 12
+    # ==========================================
+
+    elif page.startswith("10."):
+        st.title("💊 模块十：核心药物全解")
+        st.write("药理机制是选择题和病例分析的基石。")
+
+        tab1, tab2, tab3 = st.tabs(["散瞳药 (Mydriatics)", "缩瞳药 (Miotics)", "青光眼降压药"])
+
+        with tab1:
+            st.subheader("阿托品 vs 托吡卡胺")
+            render_table("drugs_mydriatics")
+            box("mech", "为什么要给虹睫炎散瞳？", 
+                "1. 麻痹睫状肌 -> 缓解痉挛性疼痛。\n"
+                "2. 散大瞳孔 -> 防止虹膜与晶状体发生**后粘连** (一旦粘连，房水流通受阻 -> 继发青光眼)。")
+            box("pitfall", "死刑误区", "青光眼患者（尤其闭角型）**绝对禁用**阿托品！散瞳会堆积虹膜根部，彻底堵死房角。")
+
+        with tab2:
+            st.subheader("毛果芸香碱 (Pilocarpine)")
+            render_table("drugs_miotics")
+            box("concept", "缩瞳机制", "收缩瞳孔括约肌 -> 拉紧虹膜 -> 机械性拉开房角 -> 房水流出。")
+
+        with tab3:
+            st.subheader("青光眼药物体系")
+            render_table("drugs_glaucoma")
+            box("pitfall", "全身副作用", "噻摩洛尔 (Timolol) 是β受体阻滞剂，哮喘和心动过缓患者禁用！")
+
+    elif page.startswith("11."):
+        import quiz  # 延迟加载：题库与判分只在本模块用到
+
+        st.title("⚔️ 模块十一：病例实战演练")
+        st.markdown("还原真实临床场景，请先思考再作答，全部选完后一起提交。")
+
+        # 病例来自知识库（kb/sections/cases.json），整份答卷一次判分
+        cases = quiz.cases()
+        with st.form("cases"):
+            answers = {}
+            for i, case in enumerate(cases):
+                with st.expander(case.title, expanded=i == 0):
+                    st.markdown(f"**病史**：{case.history}  \n**查体**：{case.exam}")
+                    q = case.question
+                    answers[q.id] = st.radio(q.prompt, q.options, index=None, key=q.id)
+            submitted = st.form_submit_button("提交答卷")
+
+        if submitted:
+            result = quiz.grade(answers, [case.question.id for case in cases])
+            st.subheader(f"得分：{result['score']} / {result['total']}")
+            for case in cases:
+                st.markdown(f"**{case.title}**")
+                if result["results"][case.question.id]:
+                    st.success(case.correct)
+                    if case.explanation:
+                        box("mech", "解析", case.explanation)
+                else:
+                    st.error(case.wrong)
+            if user:
+                quiz.SUBMISSIONS.append(user, {k: v for k, v in answers.items() if v is not None}, "cases")
+
+        # 知识点自测：由 KB 表格自动出题，每组 5 题
+        st.divider()
+        st.subheader("🎲 知识点自测")
+        seed = st.session_state.setdefault("quiz_seed", random.randrange(1 << 30))
+        questions = quiz.sample(5, seed=seed)
+        with st.form("drill"):
+            drill = {q.id: st.radio(q.prompt, q.options, index=None, key=f"drill_{seed}_{q.id}") for q in questions}
+            checked = st.form_submit_button("判分")
+        if checked:
+            result = quiz.grade(drill)
+            st.write(f"得分：{result['score']} / {result['total']}")
+            for q in questions:
+                if not result["results"][q.id]:
+                    st.error(f"{q.prompt} 正确答案：{q.answer}")
+            if user:
+                quiz.SUBMISSIONS.append(user, {k: v for k, v in drill.items() if v is not None}, "drill")
+        st.button("换一组", on_click=lambda: st.session_state.update(quiz_seed=seed + 1))
+
+    # ==========================================
+    # 重点填充：模块 12
+    # ==========================================
+
+    elif page.startswith("12."):
+        st.title("🎒 模块十二：口诀宝典")
+        st.write("考前10分钟突击专用。")
+
+        for title, content in KB["mnemonics_list"]:
+            box("mnemonic", title, content)
+
+        st.markdown("---")
+        st.subheader("🔢 数字记忆")
         st.markdown("""
-        **病史**：65岁女性，看电视时突发右眼胀痛，伴同侧头痛、恶心呕吐。
-        **查体**：视力指数/眼前。混合充血，角膜雾状水肿，瞳孔散大固定（垂直椭圆），眼压 60mmHg。
+        * **10秒**：BUT正常值（泪膜破裂时间）。
+        * **10mm**：Schirmer试验正常值。
+        * **21mmHg**：正常眼压上限。
+        * **0.6**：视杯视盘比(C/D)警戒线。
+        * **500个**：角膜内皮计数临界值（低于此值水肿）。
         """)
-        q4 = st.radio("立即处理措施？", ["静滴甘露醇 + 缩瞳", "阿托品散瞳", "抗生素眼药水"], key="c4")
-        
-        if st.button("提交病例 4"):
-            if q4 == "静滴甘露醇 + 缩瞳":
-                st.success("✅ 正确！诊断：急性闭角型青光眼发作期。")
-                box("mech", "解析", "必须快速降眼压（甘露醇）+ 拉开房角（毛果芸香碱）。禁用阿托品！")
 
-# ==========================================
-# 重点填充：模块 12
-# ==========================================
-
-elif page.startswith("12"):
-    st.title("🎒 模块十二：口诀宝典")
-    st.write("考前10分钟突击专用。")
-    
-    for title, content in KB["mnemonics_list"]:
-        box("mnemonic", title, content)
-        
+    # ==========================================
+    # 底部
+    # ==========================================
     st.markdown("---")
-    st.subheader("🔢 数字记忆")
-    st.markdown("""
-    * **10秒**：BUT正常值（泪膜破裂时间）。
-    * **10mm**：Schirmer试验正常值。
-    * **21mmHg**：正常眼压上限。
-    * **0.6**：视杯视盘比(C/D)警戒线。
-    * **500个**：角膜内皮计数临界值（低于此值水肿）。
-    """)
-
-# ==========================================
-# 底部
-# ==========================================
-st.markdown("---")
-st.caption("© 2025 OphthPro Max | 内容完全基于用户上传文档整理")
+    st.caption("© 2025 OphthPro Max | 内容完全基于用户上传文档整理")
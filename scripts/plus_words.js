@@ -0,0 +1,25 @@
+// 展开 blessing.render_compact 输出的飞字布局（plus.py 动画页）。
+// <div class="blessing-words" data-w="词 词 …" data-p="数字串">：每个词在 data-p 中占 12 位，
+// 字段与 blessing.COMPACT_FIELDS 一一对应（宽度, 偏移, 缩放）：值 = 偏移 + 数字 / 缩放。
+(function () {
+    var FIELDS = [[3, 0, 1], [1, 48, 2], [1, 48, 2], [2, 18, 1], [1, 3, 3], [2, 0, 10], [2, -20, 1]];
+    document.querySelectorAll(".blessing-words:not([data-ready])").forEach(function (box) {
+        box.setAttribute("data-ready", "");
+        var params = box.getAttribute("data-p"), at = 0;
+        box.getAttribute("data-w").split(" ").forEach(function (word) {
+            var v = FIELDS.map(function (f) {
+                var n = +params.substr(at, f[0]);
+                at += f[0];
+                return f[1] + n / f[2];
+            });
+            var angle = v[0] * Math.PI / 180;
+            var el = document.createElement("div");
+            el.className = "floating-word";
+            el.textContent = word;
+            el.style.cssText = "top:" + v[1] + "%;left:" + v[2] + "%;font-size:" + v[3] + "px;" +
+                "animation:tunnelFly " + v[4] + "s ease-out infinite;animation-delay:" + v[5] + "s;" +
+                "--tx:" + Math.cos(angle) * 80 + "vw;--ty:" + Math.sin(angle) * 80 + "vh;--rot:" + v[6] + "deg";
+            box.appendChild(el);
+        });
+    });
+})();
@@ -0,0 +1,288 @@
+"""
+间隔重复 (SM-2)：把知识库的每一行表格、每一条口诀变成复习卡片，按用户记录复习进度。
+
+    store = ReviewStore("review_state.db")
+    store.today("alice")                  # 今天要复习的卡片 id：到期的旧卡 + 少量新卡
+    store.review("alice", card_id, GRADES["good"])
+    store.flush()                         # 写入是攒批的，查询已包含未写盘的作答
+
+卡片正面是表格第一列（与遮挡模式一致）或口诀标题，背面是其余各列 / 口诀内容；
+卡片 id 为 "<section key>:<正面>"，知识库增删行不会打乱其他卡片的进度。
+
+进度存在本地 SQLite（WAL）：
+    card_state(user, card, reps, interval, ease, due, lapses, first, last)   主键 (user, card)
+    card_state_due 索引 (user, due)      “今天到期” = 按索引做一次范围查询，不扫描其他用户 / 未到期的卡
+    card_state_first 索引 (user, first)  今天已学的新卡数（每日新卡限额）
+    review_log(user, card, day, grade)  每次作答的流水
+review() 只改内存里的待写缓冲，攒够 batch_size 条或距上次写入超过 flush_seconds 时
+用一个事务批量写入，查询时把缓冲叠加到数据库结果上；同一进程的所有会话共享一个连接（见 default_store）。
+日期按“距 1970-01-01 的天数”记。
+"""
+import atexit
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+from ophth_kb import KB
+
+DEFAULT_PATH = os.environ.get("REVIEW_DB") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "review_state.db")
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_SECONDS = 2.0
+DEFAULT_NEW_PER_DAY = 20
+
+# 复习按钮 -> SM-2 评分（0-5，低于 3 视为遗忘）
+GRADES = {"again": 1, "hard": 3, "good": 4, "easy": 5}
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS card_state (
+    user TEXT NOT NULL,
+    card TEXT NOT NULL,
+    reps INTEGER NOT NULL,
+    interval INTEGER NOT NULL,
+    ease REAL NOT NULL,
+    due INTEGER NOT NULL,
+    lapses INTEGER NOT NULL,
+    first INTEGER NOT NULL,
+    last INTEGER NOT NULL,
+    PRIMARY KEY (user, card)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS card_state_due ON card_state (user, due);
+CREATE INDEX IF NOT EXISTS card_state_first ON card_state (user, first);
+CREATE TABLE IF NOT EXISTS review_log (
+    user TEXT NOT NULL,
+    card TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    grade INTEGER NOT NULL
+);
+"""
+
+_EPOCH = datetime.date(1970, 1, 1)
+
+
+def today():
+    return (datetime.date.today() - _EPOCH).days
+
+
+class Card:
+    __slots__ = ("id", "module", "section", "front", "back")
+
+    def __init__(self, id, module, section, front, back):
+        self.id = id
+        self.module = module
+        self.section = section
+        self.front = front
+        self.back = back
+
+    def __repr__(self):
+        return f"Card({self.id!r})"
+
+
+@lru_cache(maxsize=1)
+def deck():
+    """知识库的全部卡片，按模块、section 顺序；进程内只构造一次"""
+    cards = []
+    for module in sorted(KB.toc["modules"], key=int):
+        for key, value in KB.module_sections(module).items():
+            if KB.toc["sections"][key]["kind"] == "table":
+                for row in value["data"]:
+                    back = "；".join(f"{col}：{cell}" for col, cell in zip(value["cols"][1:], row[1:]))
+                    cards.append(Card(f"{key}:{row[0]}", int(module), key, f"{value['cols'][0]}：{row[0]}", back))
+            elif KB.toc["sections"][key]["kind"] == "list":
+                for title, content in value:
+                    cards.append(Card(f"{key}:{title}", int(module), key, title, content))
+    return tuple(cards)
+
+
+@lru_cache(maxsize=1)
+def card_index():
+    """卡片 id -> Card"""
+    return {card.id: card for card in deck()}
+
+
+class State:
+    """一张卡片对某个用户的 SM-2 状态（字段顺序与 card_state 表的列一致，去掉 user/card）"""
+    __slots__ = ("reps", "interval", "ease", "due", "lapses", "first", "last")
+
+    def __init__(self, reps=0, interval=0, ease=INITIAL_EASE, due=0, lapses=0, first=None, last=None):
+        self.reps = reps
+        self.interval = interval
+        self.ease = ease
+        self.due = due
+        self.lapses = lapses
+        self.first = first
+        self.last = last
+
+    def __repr__(self):
+        return (f"State(reps={self.reps}, interval={self.interval}, ease={self.ease:.2f}, due={self.due}, "
+                f"lapses={self.lapses})")
+
+    def row(self):
+        return (self.reps, self.interval, self.ease, self.due, self.lapses, self.first, self.last)
+
+
+def schedule(state, grade, day):
+    """
+    SM-2：grade < 3 视为遗忘，重新从 1 天开始并记一次 lapse；否则间隔 1 天、6 天、之后乘以 ease。
+    ease 按评分调整，下限 1.3。返回新的 State（不修改传入的 state）。
+    """
+    if not 0 <= grade <= 5:
+        raise ValueError(f"评分应在 0-5 之间：{grade}")
+    state = state or State(first=day)
+    ease = max(MIN_EASE, state.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    if grade < 3:
+        reps, interval, lapses = 0, 1, state.lapses + 1
+    else:
+        reps, lapses = state.reps + 1, state.lapses
+        interval = 1 if reps == 1 else 6 if reps == 2 else max(1, round(state.interval * ease))
+    return State(reps, interval, ease, day + interval, lapses, state.first, day)
+
+
+class ReviewStore:
+    """
+    按用户保存卡片进度；线程安全，写入攒批。
+    查询不会触发写盘：到期列表 / 计数以数据库结果为准，再叠加该用户还在缓冲里的状态。
+    """
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=DEFAULT_BATCH_SIZE, flush_seconds=DEFAULT_FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._pending = {}     # (user, card) -> State
+        self._stored = {}      # (user, card) -> 进入缓冲前数据库里的 State（None 表示新卡）
+        self._log = []         # (user, card, day, grade)
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load(self, user, card):
+        row = self._conn.execute(
+            "SELECT reps, interval, ease, due, lapses, first, last FROM card_state WHERE user = ? AND card = ?",
+            (user, card)).fetchone()
+        return State(*row) if row else None
+
+    def state(self, user, card):
+        """当前状态；从未复习过的卡片返回 None"""
+        with self._lock:
+            if (user, card) in self._pending:
+                return self._pending[user, card]
+            return self._load(user, card)
+
+    def review(self, user, card, grade, day=None):
+        """记录一次作答并返回新状态；达到批量或时间阈值时写盘"""
+        day = today() if day is None else day
+        with self._lock:
+            key = (user, card)
+            if key not in self._pending:
+                self._stored[key] = self._load(user, card)
+            new = schedule(self._pending.get(key) or self._stored[key], grade, day)
+            self._pending[key] = new
+            self._log.append((user, card, day, grade))
+            if len(self._log) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_seconds:
+                self.flush()
+        return new
+
+    def flush(self):
+        """把待写缓冲在一个事务里写入"""
+        with self._lock:
+            if self._log:
+                rows = [(user, card, *state.row()) for (user, card), state in self._pending.items()]
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    self._conn.executemany("INSERT OR REPLACE INTO card_state VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                           rows)
+                    self._conn.executemany("INSERT INTO review_log VALUES (?, ?, ?, ?)", self._log)
+                self._pending.clear()
+                self._stored.clear()
+                self._log.clear()
+            self._last_flush = time.monotonic()
+
+    def _user_pending(self, user):
+        return {card: (self._stored[u, card], state) for (u, card), state in self._pending.items() if u == user}
+
+    def due(self, user, day=None, limit=None):
+        """到期（due <= day）的卡片 id，最早到期的在前；走 (user, due) 索引"""
+        day = today() if day is None else day
+        with self._lock:
+            pending = self._user_pending(user)
+            rows = self._conn.execute(
+                "SELECT card, due FROM card_state WHERE user = ? AND due <= ? ORDER BY due, card LIMIT ?",
+                (user, day, -1 if limit is None else limit + len(pending))).fetchall()
+        due = [(d, card) for card, d in rows if card not in pending]
+        due += [(state.due, card) for card, (_, state) in pending.items() if state.due <= day]
+        return [card for _, card in sorted(due)[:limit]]
+
+    def due_count(self, user, day=None):
+        day = today() if day is None else day
+        with self._lock:
+            pending = self._user_pending(user)
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM card_state WHERE user = ? AND due <= ?",
+                                          (user, day)).fetchone()
+        for stored, state in pending.values():
+            count += (state.due <= day) - (stored is not None and stored.due <= day)
+        return count
+
+    def new_today(self, user, day=None):
+        """今天第一次学的卡片数（走 (user, first) 索引）"""
+        day = today() if day is None else day
+        with self._lock:
+            pending = self._user_pending(user)
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM card_state WHERE user = ? AND first = ?",
+                                          (user, day)).fetchone()
+        return count + sum(stored is None and state.first == day for stored, state in pending.values())
+
+    def new_cards(self, user, limit=DEFAULT_NEW_PER_DAY, cards=None):
+        """该用户还没学过的卡片 id（按 deck 顺序取前 limit 张）"""
+        cards = deck() if cards is None else cards
+        if limit <= 0:
+            return []
+        with self._lock:
+            seen = set(self._user_pending(user))
+            seen.update(card for (card,) in self._conn.execute("SELECT card FROM card_state WHERE user = ?", (user,)))
+        fresh = []
+        for card in cards:
+            if card.id not in seen:
+                fresh.append(card.id)
+                if len(fresh) >= limit:
+                    break
+        return fresh
+
+    def today(self, user, day=None, limit=100, new_per_day=DEFAULT_NEW_PER_DAY):
+        """今天的复习队列：先到期的旧卡，剩余名额给新卡（每天最多 new_per_day 张新卡）"""
+        day = today() if day is None else day
+        queue = self.due(user, day, limit)
+        if len(queue) < limit:
+            queue += self.new_cards(user, min(new_per_day - self.new_today(user, day), limit - len(queue)))
+        return queue
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    """进程内共享的 ReviewStore（路径可用环境变量 REVIEW_DB 指定）；进程退出时写入剩余缓冲"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ReviewStore()
+            atexit.register(_default.close)
+        return _default
@@ -0,0 +1,448 @@
+"""
+把 review.py 的 13 个模块导出成静态 HTML，离线打开或直接放到 CDN / 静态文件服务器上。
+
+    python static_export.py                 # 输出到 site/
+    python static_export.py --out dist --seed 3
+    python -m http.server -d site           # 本地预览
+
+做法：用一个记录调用的假 `streamlit` 模块逐个模块执行 review.py（导航 radio 依次返回各模块），
+把 st.* 调用直接转成 HTML，所以页面内容始终与 review.py 一致，不需要另写模板。
+    - 注入的 <style> 与导出页面的基础样式合并成 assets/review.<hash>.css；
+    - render_table 的 DataFrame 转成 <table>；
+    - 模块十一的表单保留为 HTML 表单，由 assets/quiz.<hash>.js 在浏览器里判分
+      （答案与反馈按页面内嵌，不需要服务器）；自测题用 --seed 固定抽题；
+    - 检索、今日复习、遮挡开关等依赖会话的功能在静态版中省略。
+assets 下的文件名带内容哈希，可以设置永久缓存；manifest.json 记录逻辑名 -> 带哈希的文件名。
+review.py 里出现这里没有实现的 st.* 调用时导出直接报错，而不是悄悄漏掉内容。
+"""
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import textwrap
+from contextlib import contextmanager
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+REVIEW_FILE = os.path.join(REPO_ROOT, "review.py")
+DEFAULT_OUT = os.path.join(REPO_ROOT, "site")
+ASSETS_DIR = "assets"
+
+_STYLE_RE = re.compile(r"^\s*<style>(.*)</style>\s*$", re.S)
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_ITEM_RE = re.compile(r"^[*-]\s+")
+
+BASE_CSS = """
+body { margin: 0; display: flex; min-height: 100vh; color: #31333f; }
+aside { width: 300px; flex-shrink: 0; background: #f0f2f6; padding: 24px 16px; box-sizing: border-box; }
+aside nav a { display: block; padding: 6px 8px; border-radius: 6px; color: inherit; text-decoration: none; }
+aside nav a.current { background: #fff; font-weight: bold; }
+main { flex: 1; max-width: 1100px; padding: 32px 48px; box-sizing: border-box; }
+.caption { color: #808495; font-size: 0.9em; }
+.columns { display: flex; gap: 16px; } .columns > div { flex: 1; min-width: 0; }
+.st-alert { padding: 12px 16px; border-radius: 8px; margin-bottom: 12px; }
+.st-info { background: #e8f1fb; color: #004280; } .st-success { background: #e6f4ea; color: #177233; }
+.st-warning { background: #fffbe6; color: #926c05; } .st-error { background: #fdecea; color: #7d353b; }
+table.kb-table { border-collapse: collapse; width: 100%; margin-bottom: 16px; }
+table.kb-table th, table.kb-table td { border: 1px solid #e6e9ef; padding: 6px 10px; text-align: left; }
+table.kb-table th { background: #f8f9fb; }
+details { border: 1px solid #e6e9ef; border-radius: 8px; padding: 8px 16px; margin-bottom: 12px; }
+summary { cursor: pointer; font-weight: bold; }
+section.tab { border-top: 2px solid #ff4b4b; margin-bottom: 16px; } .tab-label { color: #ff4b4b; }
+fieldset { border: none; padding: 0; margin: 12px 0; } legend { font-weight: bold; }
+fieldset label { display: block; margin: 4px 0; }
+form button { padding: 6px 16px; border-radius: 6px; border: 1px solid #d0d3da; background: #fff; cursor: pointer; }
+"""
+
+QUIZ_JS = """
+(function () {
+  var data = document.getElementById("quiz-key");
+  if (!data) return;
+  var key = JSON.parse(data.textContent);
+  document.querySelectorAll("form[data-quiz]").forEach(function (form) {
+    var out = document.createElement("div");
+    form.after(out);
+    form.addEventListener("submit", function (event) {
+      event.preventDefault();
+      var names = [], score = 0, parts = [];
+      form.querySelectorAll("input[type=radio]").forEach(function (input) {
+        if (names.indexOf(input.name) < 0) names.push(input.name);
+      });
+      names.forEach(function (qid) {
+        var q = key[qid], picked = form.querySelector("input[name='" + qid + "']:checked");
+        var ok = picked !== null && picked.value === q.answer;
+        score += ok;
+        if (q.title) parts.push("<p><strong>" + q.title + "</strong></p>");
+        parts.push(ok ? q.correct : q.wrong);
+      });
+      out.innerHTML = "<h3>得分：" + score + " / " + names.length + "</h3>" + parts.join("");
+    });
+  });
+})();
+"""
+
+
+# ==========================================
+# Markdown（review.py 用到的子集：加粗、列表、分隔线、换行）
+# ==========================================
+
+def markdown(text, allow_html=False):
+    text = textwrap.dedent(text).strip("\n")
+    if not allow_html:
+        text = html.escape(text, quote=False)
+    blocks = []
+    for block in re.split(r"\n\s*\n", text):
+        lines = [line.strip() for line in block.strip("\n").split("\n")]
+        if lines == ["---"]:
+            blocks.append("<hr>")
+        elif all(_ITEM_RE.match(line) for line in lines):
+            items = "".join(f"<li>{_inline(_ITEM_RE.sub('', line))}</li>" for line in lines)
+            blocks.append(f"<ul>{items}</ul>")
+        elif allow_html and lines[0].startswith("<"):
+            blocks.append(_inline("\n".join(lines)))
+        else:
+            # 行尾两个空格为硬换行，其余换行按空格处理（与 Streamlit 的 Markdown 一致）
+            raw = block.strip("\n").split("\n")
+            body = "".join(line.strip() + ("<br>" if line.endswith("  ") else " ") for line in raw)
+            blocks.append(f"<p>{_inline(body.strip())}</p>")
+    return "\n".join(blocks)
+
+
+def _inline(text):
+    return _BOLD_RE.sub(r"<strong>\1</strong>", text)
+
+
+# ==========================================
+# 记录调用的假 streamlit
+# ==========================================
+
+class SessionState(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+class Container:
+    """一个输出区域（主区、侧边栏、分栏、折叠框、表单），st.* 方法把 HTML 追加到这里"""
+
+    def __init__(self, page, tag=None, attrs=""):
+        self.page = page
+        self.parts = []
+        self.tag = tag
+        self.attrs = attrs
+
+    # --- 上下文：with st.sidebar / with col / with st.expander(...) ---
+    def __enter__(self):
+        self.page.stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.page.stack.pop()
+
+    def _emit(self, fragment):
+        self.parts.append(fragment)
+
+    def html(self):
+        body = "\n".join(map(str, self.parts))
+        return f"<{self.tag}{self.attrs}>\n{body}\n</{self.tag}>" if self.tag else body
+
+    def _child(self, tag, attrs="", head=""):
+        child = Container(self.page, tag, attrs)
+        if head:
+            child.parts.append(head)
+        self._emit(_Deferred(child))
+        return child
+
+    # --- 文字 ---
+    def title(self, body, **_):
+        self._emit(f"<h1>{html.escape(body)}</h1>")
+
+    def header(self, body, **_):
+        self._emit(f"<h2>{html.escape(body)}</h2>")
+
+    def subheader(self, body, **_):
+        self._emit(f"<h3>{html.escape(body)}</h3>")
+
+    def caption(self, body, **_):
+        self._emit(f'<div class="caption">{markdown(body)}</div>')
+
+    def divider(self):
+        self._emit("<hr>")
+
+    def markdown(self, body, unsafe_allow_html=False, **_):
+        style = _STYLE_RE.match(body) if unsafe_allow_html else None
+        if style:
+            self.page.css.append(textwrap.dedent(style.group(1)).strip())
+        else:
+            self._emit(markdown(body, unsafe_allow_html))
+
+    def write(self, *args, **_):
+        for arg in args:
+            if not isinstance(arg, str):
+                raise TypeError(f"静态导出只支持 st.write(str)：{type(arg).__name__}")
+            self._emit(markdown(arg))
+
+    def _alert(self, kind, body):
+        self._emit(f'<div class="st-alert st-{kind}">{markdown(body)}</div>')
+
+    def info(self, body, **_):
+        self._alert("info", body)
+
+    def success(self, body, **_):
+        self._alert("success", body)
+
+    def warning(self, body, **_):
+        self._alert("warning", body)
+
+    def error(self, body, **_):
+        self._alert("error", body)
+
+    # --- 数据 ---
+    def dataframe(self, data, **_):
+        self._emit(data.to_html(index=False, border=0, classes="kb-table", escape=True))
+
+    # --- 布局 ---
+    def columns(self, spec, **_):
+        row = self._child("div", ' class="columns"')
+        n = spec if isinstance(spec, int) else len(spec)
+        return [row._child("div") for _ in range(n)]
+
+    def tabs(self, labels):
+        # 静态页面不切换标签页：各标签的内容依次排开，标签名作小标题
+        return [self._child("section", ' class="tab"', f'<h3 class="tab-label">{html.escape(label)}</h3>')
+                for label in labels]
+
+    def expander(self, label, expanded=False, **_):
+        return self._child("details", " open" if expanded else "", f"<summary>{html.escape(label)}</summary>")
+
+    def form(self, key, **_):
+        self.page.forms += 1
+        return self._child("form", f' data-quiz="{html.escape(key)}"')
+
+    # --- 控件：静态页面里取默认值 ---
+    def radio(self, label, options, index=0, key=None, **_):
+        options = list(options)
+        if key == "nav":
+            self.page.nav = options
+            self._emit(_Deferred(self.page.nav_html))
+            return self.page.selected or options[0]
+        question = self.page.question_for(label, options)
+        name = html.escape(question.id if question else key or label)
+        inputs = "".join(f'<label><input type="radio" name="{name}" value="{html.escape(o)}"> {html.escape(o)}</label>'
+                         for o in options)
+        self._emit(f"<fieldset><legend>{html.escape(label)}</legend>{inputs}</fieldset>")
+        return None if index is None else options[index]
+
+    def form_submit_button(self, label, **_):
+        self._emit(f'<button type="submit">{html.escape(label)}</button>')
+        return False
+
+    def toggle(self, label, value=False, **_):
+        return value
+
+    def text_input(self, label, value="", **_):
+        return value
+
+    def button(self, label, **_):
+        return False
+
+
+class _Deferred:
+    """子容器 / 导航在整页执行完后才生成 HTML"""
+
+    def __init__(self, render):
+        self.render = render.html if isinstance(render, Container) else render
+
+    def __str__(self):
+        return self.render()
+
+
+class StaticPage(Container):
+    """伪装成 streamlit 模块：模块级 st.* 调用写到当前容器（栈顶）"""
+
+    def __init__(self, selected=None, session=None, questions=None):
+        super().__init__(self)
+        self.stack = [self]
+        self.sidebar = Container(self, "aside")
+        self.session_state = SessionState(session or {})
+        self.selected = selected
+        self.nav = []
+        self.css = []
+        self.forms = 0
+        self.config = {}
+        self._questions = questions or {}
+
+    def _emit(self, fragment):
+        target = self.stack[-1]
+        if target is self:
+            self.parts.append(fragment)
+        else:
+            target._emit(fragment)
+
+    def set_page_config(self, **config):
+        self.config = config
+
+    def get_option(self, key):
+        # 样式走 inline（见 page_assets），由导出统一合并成带哈希的 CSS 文件
+        return {"server.enableStaticServing": False}[key]
+
+    def question_for(self, label, options):
+        return self._questions.get((label, tuple(options)))
+
+    def nav_html(self):
+        links = []
+        for i, label in enumerate(self.nav):
+            current = ' class="current"' if label == self.selected else ""
+            links.append(f'<a href="{page_file(i)}"{current}>{html.escape(label)}</a>')
+        return f"<nav>{''.join(links)}</nav>"
+
+    def __getattr__(self, name):
+        raise AttributeError(f"静态导出不支持 st.{name}；请在 static_export.Container 中实现")
+
+
+def page_file(i):
+    return "index.html" if i == 0 else f"module-{i}.html"
+
+
+# ==========================================
+# 导出
+# ==========================================
+
+@contextmanager
+def _fake_streamlit(page):
+    saved = sys.modules.get("streamlit")
+    sys.modules["streamlit"] = page
+    try:
+        yield page
+    finally:
+        if saved is None:
+            del sys.modules["streamlit"]
+        else:
+            sys.modules["streamlit"] = saved
+
+
+def _run(code, page):
+    namespace = {"__name__": "__main__", "__file__": REVIEW_FILE}
+    with _fake_streamlit(page):
+        exec(code, namespace)
+    return namespace
+
+
+def _quiz_key(page, namespace):
+    """页面表单里每道题的答案与反馈（反馈 HTML 用 review.py 自己的 box / st.* 渲染）"""
+    import quiz
+
+    cases = {case.question.id: case for case in quiz.cases()}
+    key = {}
+    for question in page._questions.values():
+        if f'name="{html.escape(question.id)}"' not in page.html():
+            continue
+        case = cases.get(question.id)
+        with Container(page) as correct:
+            if case:
+                correct.success(case.correct)
+                if case.explanation:
+                    namespace["box"]("mech", "解析", case.explanation)
+        with Container(page) as wrong:
+            wrong.error(case.wrong if case else f"{question.prompt} 正确答案：{question.answer}")
+        key[question.id] = {"answer": question.answer, "title": html.escape(case.title) if case else "",
+                            "correct": correct.html(), "wrong": wrong.html()}
+    return key
+
+
+def _fingerprint(out, name, content):
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:10]
+    fingerprinted = f"{stem}.{digest}{ext}"
+    with open(os.path.join(out, ASSETS_DIR, fingerprinted), "w", encoding="utf-8") as f:
+        f.write(content)
+    return fingerprinted
+
+
+def _document(page, body, assets, quiz_key):
+    config = page.config
+    title = html.escape(config.get("page_title", ""))
+    scripts = ""
+    if quiz_key:
+        data = json.dumps(quiz_key, ensure_ascii=False).replace("</", "<\\/")
+        scripts = (f'<script type="application/json" id="quiz-key">{data}</script>\n'
+                   f'<script src="{ASSETS_DIR}/{assets["quiz.js"]}" defer></script>')
+    return f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>{html.escape(config.get("page_icon", ""))}</text></svg>">
+<link rel="stylesheet" href="{ASSETS_DIR}/{assets["review.css"]}">
+{scripts}
+</head>
+<body>
+{page.sidebar.html()}
+<main class="stApp">
+{body}
+</main>
+</body>
+</html>
+"""
+
+
+def export(out=DEFAULT_OUT, seed=0, review_path=REVIEW_FILE):
+    """导出全部模块，返回 manifest（逻辑名 -> 文件名，pages 为各页面文件）"""
+    import quiz
+
+    with open(review_path, encoding="utf-8") as f:
+        code = compile(f.read(), review_path, "exec")
+    questions = {(q.prompt, q.options): q for q in quiz.question_index().values()}
+    session = {"quiz_seed": seed}
+
+    first = StaticPage(session=session, questions=questions)
+    _run(code, first)
+    pages = []
+    for label in first.nav:
+        page = StaticPage(label, session, questions)
+        namespace = _run(code, page)
+        body = page.html()   # 先生成正文，再据此找出页面上出现的题目
+        pages.append((page, body, _quiz_key(page, namespace) if page.forms else {}))
+
+    os.makedirs(os.path.join(out, ASSETS_DIR), exist_ok=True)
+    css = "\n".join([BASE_CSS.strip()] + list(dict.fromkeys(c for page, _, _ in pages for c in page.css)))
+    assets = {"review.css": _fingerprint(out, "review.css", css + "\n"),
+              "quiz.js": _fingerprint(out, "quiz.js", QUIZ_JS.lstrip())}
+    for name in os.listdir(os.path.join(out, ASSETS_DIR)):   # 清理上一次导出的旧版本
+        if name not in assets.values():
+            os.remove(os.path.join(out, ASSETS_DIR, name))
+
+    files = []
+    for i, (page, body, quiz_key) in enumerate(pages):
+        files.append(page_file(i))
+        with open(os.path.join(out, files[-1]), "w", encoding="utf-8") as f:
+            f.write(_document(page, body, assets, quiz_key))
+    manifest = {"assets": assets, "pages": files}
+    with open(os.path.join(out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return manifest
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="导出 review.py 为静态 HTML")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="输出目录")
+    parser.add_argument("--seed", type=int, default=0, help="模块十一自测题的抽题种子")
+    args = parser.parse_args(argv)
+
+    manifest = export(args.out, args.seed)
+    size = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(args.out) for name in names)
+    print(f"{len(manifest['pages'])} 个页面，{len(manifest['assets'])} 个资源，共 {size / 1024:.0f} KB -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+import blessing
+
+
+@pytest.fixture
+def pool_file(tmp_path, monkeypatch):
+    path = tmp_path / "pool.json"
+    monkeypatch.setattr(blessing, "POOL_FILE", str(path))
+    blessing.layout_pool.cache_clear()
+    blessing._rendered.cache_clear()
+    yield path
+    blessing.layout_pool.cache_clear()
+    blessing._rendered.cache_clear()
+
+
+def test_cli_pool_is_used_as_is(pool_file, capsys):
+    blessing.main(["pool", "--out", str(pool_file), "--size", "5", "--seed", "7"])
+    assert "5 套布局" in capsys.readouterr().out
+    written = pool_file.read_text(encoding="utf-8")
+
+    assert blessing.layout_pool() == blessing.build_pool(5, 7)
+    assert pool_file.read_text(encoding="utf-8") == written   # 没有按默认参数重建覆盖
+    assert blessing.layout_html(6, "compact") == blessing.render_compact(blessing.build_pool(5, 7)[1])
+
+
+def test_missing_or_stale_pool_is_rebuilt_with_defaults(pool_file):
+    blessing.save_pool(str(pool_file), blessing.build_pool(3, 1), seed=1)
+    data = json.loads(pool_file.read_text(encoding="utf-8"))
+    data["words"] = "0" * 16                                  # 词库变了
+    pool_file.write_text(json.dumps(data), encoding="utf-8")
+
+    assert blessing.layout_pool() == blessing.build_pool()
+    assert blessing.load_pool(str(pool_file)) == blessing.build_pool()
+
+
+def test_load_pool_checks_explicit_parameters(tmp_path):
+    path = str(tmp_path / "pool.json")
+    layouts = blessing.build_pool(4, 9)
+    blessing.save_pool(path, layouts, seed=9)
+    assert blessing.load_pool(path) == layouts
+    assert blessing.load_pool(path, size=4, seed=9) == layouts
+    assert blessing.load_pool(path, size=5) is None
+    assert blessing.load_pool(path, seed=2026) is None
+    assert blessing.load_pool(str(tmp_path / "missing.json")) is None
@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fitness import ACTIVITY_MULTIPLIERS, GOAL_ADJUSTMENTS, FitnessCalculator
+from fitness_batch import _ROUND_EDGE_TOL, OUTPUT_FIELDS, calculate_batch, calculate_frame
+
+# 体脂 ×100 离 .5 不到 _ROUND_EDGE_TOL 的输入（np.log10 与 math.log10 的末位差异可能改变舍入结果）
+EDGE_ROWS = [
+    ("Female", 200.1, 46.2, 117.3, 124.0),
+    ("Male", 150.0, 30.3, 110.8, 0.0),
+    ("Female", 150.9, 32.5, 81.1, 120.4),
+    ("Male", 150.0, 49.3, 129.8, 0.0),
+]
+# 标量版抛 ValueError 的输入：围度差不为正、身高为 0
+INVALID_ROWS = [
+    ("Male", 175.0, 40.0, 40.0, 0.0),
+    ("Male", 175.0, 42.0, 38.0, 0.0),
+    ("Female", 165.0, 40.0, 30.0, 5.0),
+    ("Female", 0.0, 33.0, 70.0, 95.0),
+]
+
+
+def _members(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    tenths = lambda lo, hi, size: rng.integers(lo * 10, hi * 10 + 1, size) / 10
+    rows = [(g, h, nk, w, hp) for g, h, nk, w, hp in zip(
+        rng.choice(["Male", "Female", "MALE", "female"], n), tenths(140, 210, n), tenths(28, 50, n),
+        tenths(60, 140, n), tenths(70, 140, n))]
+    rows += EDGE_ROWS + INVALID_ROWS
+    m = len(rows)
+    return pd.DataFrame({
+        "gender": [r[0] for r in rows],
+        "age": rng.integers(16, 80, m),
+        "height": [r[1] for r in rows],
+        "weight": tenths(40, 130, m),
+        "neck": [r[2] for r in rows],
+        "waist": [r[3] for r in rows],
+        "hip": [r[4] for r in rows],
+        "activity": rng.choice(list(ACTIVITY_MULTIPLIERS) + ["unknown"], m),
+        "goal": rng.choice(list(GOAL_ADJUSTMENTS), m),
+    })
+
+
+def _scalar(row):
+    calc = FitnessCalculator(row.gender, row.age, row.height, row.weight, row.neck, row.waist, row.hip)
+    try:
+        body_fat = calc.calculate_body_fat()
+    except ValueError:
+        body_fat = None
+    bmr = calc.calculate_bmr()
+    tdee = calc.calculate_tdee(row.activity)
+    return body_fat, bmr, tdee, calc.nutrition_plan(tdee, row.goal)
+
+
+def test_edge_rows_are_on_the_rounding_edge():
+    for gender, height, neck, waist, hip in EDGE_ROWS:
+        circ = waist - neck if gender == "Male" else waist + hip - neck
+        a, b, c = (1.0324, 0.19077, 0.15456) if gender == "Male" else (1.29579, 0.35004, 0.22100)
+        scaled = (495 / (a - b * np.log10(circ) + c * np.log10(height)) - 450) * 100
+        assert abs(scaled - math.floor(scaled) - 0.5) < _ROUND_EDGE_TOL
+
+
+def test_batch_matches_scalar_row_by_row():
+    df = _members()
+    r = calculate_frame(df)
+    assert set(r) == set(OUTPUT_FIELDS)
+    for i, row in enumerate(df.itertuples(index=False)):
+        body_fat, bmr, tdee, plan = _scalar(row)
+        if body_fat is None:
+            assert not r["valid"][i] and np.isnan(r["body_fat"][i])
+        else:
+            assert r["valid"][i] and r["body_fat"][i] == body_fat
+        assert r["bmr"][i] == bmr and r["tdee"][i] == tdee
+        assert (r["calories"][i], r["protein"][i], r["fat"][i], r["carbs"][i]) == \
+            (plan["Calories"], plan["Protein"], plan["Fat"], plan["Carbs"])
+    assert (~r["valid"]).sum() >= len(INVALID_ROWS)
+
+
+@pytest.mark.parametrize("gender", ["Male", "female"])
+def test_scalar_arguments_broadcast(gender):
+    r = calculate_batch(gender, 30, [170.0, 180.0], 70.0, 38.0, [80.0, 90.0], 95.0, "Active", "增肌 (Bulk)")
+    for i, (height, waist) in enumerate([(170.0, 80.0), (180.0, 90.0)]):
+        calc = FitnessCalculator(gender, 30, height, 70.0, 38.0, waist, 95.0)
+        assert r["body_fat"][i] == calc.calculate_body_fat()
+        assert r["tdee"][i] == calc.calculate_tdee("Active")
@@ -0,0 +1,75 @@
+import pytest
+
+import fitness_cache
+from fitness import FitnessCalculator
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    fitness_cache.configure_cache(8)
+    yield
+    fitness_cache.configure_cache(fitness_cache.DEFAULT_CACHE_SIZE)
+
+
+def _uncached(gender, age, height, weight, neck, waist, hip, activity, goal):
+    calc = FitnessCalculator(gender, age, height, weight, neck, waist, hip)
+    tdee = calc.calculate_tdee(activity)
+    return calc.calculate_body_fat(), tdee, calc.nutrition_plan(tdee, goal)
+
+
+@pytest.mark.parametrize("args", [
+    ("Male", 30, 178, 76, 38, 84, 0, "Moderate", "减脂 (Cut)"),
+    ("Female", 41, 165.0, 61.5, 33.0, 72.0, 96.0, "Light", "增肌 (Bulk)"),
+    ("female", 25, 160, 55, 32, 70, 94, "unknown", "unknown"),
+])
+def test_cached_equals_uncached(args):
+    assert fitness_cache.compute_plan(*args) == _uncached(*args)
+    assert fitness_cache.compute_plan(*args) == _uncached(*args)
+    assert fitness_cache.cache_stats()["plan"] == {"hits": 1, "misses": 1, "size": 1, "maxsize": 8}
+
+
+def test_equivalent_inputs_share_an_entry():
+    variants = [
+        ("Male", 30, 178, 76, 38, 84, 0, "Sedentary", "维持 (Maintain)"),
+        ("male", 30.0, 178.0, 76.0, 38.0, 84.0, 0.0, "Sedentary", "维持 (Maintain)"),
+        ("MALE", "30", "178", 76, 38, 84, 95.0, "Sedentary", "维持 (Maintain)"),   # 男性公式不用臀围
+    ]
+    keys = {fitness_cache.normalize_inputs(*v) for v in variants}
+    assert len(keys) == 1
+    results = [fitness_cache.compute_plan(*v) for v in variants]
+    assert results[0] == results[1] == results[2] == _uncached(*variants[0])
+    assert fitness_cache.cache_stats()["plan"]["hits"] == 2
+    assert fitness_cache.cache_stats()["plan"]["size"] == 1
+
+
+def test_female_hip_is_part_of_the_key():
+    a = fitness_cache.compute_plan("Female", 30, 165, 60, 33, 72, 95, "Sedentary", "维持 (Maintain)")
+    b = fitness_cache.compute_plan("Female", 30, 165, 60, 33, 72, 100, "Sedentary", "维持 (Maintain)")
+    assert a != b and fitness_cache.cache_stats()["plan"]["size"] == 2
+
+
+def test_invalid_inputs_raise_and_are_not_cached():
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            fitness_cache.compute_plan("Male", 30, 178, 76, 40, 40, 0, "Sedentary", "维持 (Maintain)")
+    assert fitness_cache.cache_stats()["plan"] == {"hits": 0, "misses": 2, "size": 0, "maxsize": 8}
+
+
+def test_configure_cache_bounds_size():
+    fitness_cache.configure_cache(2)
+    for weight in (60, 70, 80):
+        fitness_cache.compute_plan("Male", 30, 178, weight, 38, 84, 0, "Sedentary", "维持 (Maintain)")
+    assert fitness_cache.cache_stats()["plan"]["size"] == 2
+    fitness_cache.clear_cache()
+    assert fitness_cache.cache_stats()["plan"]["size"] == 0
+
+
+def test_macro_frames_are_shared_and_correct():
+    _, _, plan = fitness_cache.compute_plan("Male", 30, 178, 76, 38, 84, 0, "Sedentary", "维持 (Maintain)")
+    macro, table = fitness_cache.macro_frames(plan)
+    again, _ = fitness_cache.macro_frames(dict(plan))
+    assert again is macro
+    assert list(macro["重量 (g)"]) == [plan["Protein"], plan["Fat"], plan["Carbs"]]
+    assert list(macro["热量占比"]) == [plan["Protein"] * 4, plan["Fat"] * 9, plan["Carbs"] * 4]
+    assert list(table.columns) == ["营养素", "重量 (g)"]
+    assert fitness_cache.cache_stats()["macro_data"]["hits"] == 1
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fitness import FitnessCalculator
+from fitness_cli import RESULT_COLUMNS, main, process_file
+from fitness_parallel import process_file_parallel
+
+MEMBERS = pd.DataFrame({
+    "gender": ["Male", "Female", "Male", "Female", "Male"],
+    "age": [30, 41, np.nan, 25, 52],
+    "height": [178.0, 165.0, 180.0, 160.0, 172.0],
+    "weight": [76.0, 61.5, 80.0, np.nan, 90.0],
+    "neck": [38.0, 33.0, 39.0, 32.0, 42.0],
+    "waist": [84.0, 72.0, 88.0, 70.0, 40.0],   # 最后一行腰围不大于颈围
+    "hip": [np.nan, 96.0, np.nan, 94.0, np.nan],
+})
+VALID = [True, True, False, False, False]
+
+
+def _write(df, path):
+    if path.suffix == ".csv":
+        df.to_csv(path, index=False)
+    elif path.suffix == ".jsonl":
+        # JSONL 里缺失的字段直接省略
+        records = [{k: v for k, v in row.items() if not (isinstance(v, float) and np.isnan(v))}
+                   for row in df.to_dict("records")]
+        pd.DataFrame.from_records(records).to_json(path, orient="records", lines=True, force_ascii=False)
+    else:
+        df.to_parquet(path, index=False)
+
+
+def _read(path):
+    if path.suffix == ".csv":
+        return pd.read_csv(path)
+    if path.suffix == ".jsonl":
+        return pd.read_json(path, lines=True)
+    return pd.read_parquet(path)
+
+
+@pytest.mark.parametrize("ext", [".csv", ".jsonl", ".parquet"])
+def test_round_trip(tmp_path, ext):
+    if ext == ".parquet":
+        pytest.importorskip("pyarrow")
+    src, dst = tmp_path / f"members{ext}", tmp_path / f"results{ext}"
+    _write(MEMBERS, src)
+    assert process_file(str(src), str(dst), chunksize=2) == (len(MEMBERS), VALID.count(False))
+
+    out = _read(dst)
+    assert list(out.columns[-len(RESULT_COLUMNS):]) == RESULT_COLUMNS
+    assert list(out["valid"]) == VALID
+    for row, valid in zip(out.itertuples(index=False), VALID):
+        if not valid:
+            assert pd.isna(row.body_fat)
+            continue
+        calc = FitnessCalculator(row.gender, row.age, row.height, row.weight, row.neck, row.waist,
+                                 0 if pd.isna(row.hip) else row.hip)
+        tdee = calc.calculate_tdee("Sedentary")
+        plan = calc.nutrition_plan(tdee, "维持 (Maintain)")
+        assert (row.body_fat, row.bmr, row.tdee) == (calc.calculate_body_fat(), calc.calculate_bmr(), tdee)
+        assert (row.calories, row.protein, row.fat, row.carbs) == \
+            (plan["Calories"], plan["Protein"], plan["Fat"], plan["Carbs"])
+    missing = out.iloc[2:4]
+    assert missing["bmr"].isna().all() and (missing[["tdee", "calories", "protein", "fat", "carbs"]] == 0).all().all()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_marks_missing_rows_the_same_way(tmp_path, workers):
+    src = tmp_path / "members.csv"
+    MEMBERS.to_csv(src, index=False)
+    process_file(str(src), str(tmp_path / "serial.csv"), chunksize=2)
+    process_file_parallel(str(src), str(tmp_path / "parallel.csv"), workers=workers, chunksize=2, shard_size=1)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "parallel.csv"), pd.read_csv(tmp_path / "serial.csv"))
+
+
+def test_main_reports_invalid_rows(tmp_path, capsys):
+    src = tmp_path / "members.csv"
+    MEMBERS.to_csv(src, index=False)
+    assert main([str(src), str(tmp_path / "out.jsonl")]) == 0
+    assert "其中 3 行数据无效" in capsys.readouterr().out
+    assert main([str(src), str(tmp_path / "out.xlsx")]) == 1
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fitness_cli import process_file
+from fitness_parallel import process_file_parallel
+
+
+@pytest.fixture
+def members_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 2_503
+    df = pd.DataFrame({
+        "gender": rng.choice(["Male", "Female"], n),
+        "age": rng.integers(18, 70, n),
+        "height": rng.uniform(150, 195, n).round(1),
+        "weight": rng.uniform(45, 120, n).round(1),
+        "neck": rng.uniform(30, 45, n).round(1),
+        "waist": rng.uniform(60, 120, n).round(1),
+        "hip": rng.uniform(80, 120, n).round(1),
+    })
+    df.loc[::97, "waist"] = 20.0   # 腰围不大于颈围：无效行
+    path = tmp_path / "members.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("workers, chunksize, shard_size", [(1, 500, 200), (2, 400, 150), (3, 1000, 5000)])
+def test_parallel_matches_serial(tmp_path, members_csv, workers, chunksize, shard_size):
+    expected_path, actual_path = tmp_path / "expected.csv", tmp_path / "actual.csv"
+    expected = process_file(str(members_csv), str(expected_path), chunksize=chunksize)
+    seen = []
+    actual = process_file_parallel(str(members_csv), str(actual_path), workers=workers, shard_size=shard_size,
+                                   chunksize=chunksize, progress=lambda done, total: seen.append(done))
+    assert actual == expected
+    assert seen[-1] == expected[0] and seen == sorted(seen)
+    pd.testing.assert_frame_equal(pd.read_csv(actual_path), pd.read_csv(expected_path))
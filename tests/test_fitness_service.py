@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+
+from fitness_service import FitnessService, MicroBatcher, parse_member
+
+
+async def _exchange(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    return data
+
+
+def _run(scenario):
+    async def main():
+        service = FitnessService()
+        _, port = await service.start(port=0)
+        try:
+            return service, await scenario(port)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+def test_malformed_request_line_gets_400():
+    async def scenario(port):
+        return [await _exchange(port, raw) for raw in (
+            b"GARBAGE\r\n\r\n",
+            b"GET /healthz HTTP/1.1 extra\r\n\r\n",
+            b"GET /healthz HTTP/1.1\r\nno-colon-header\r\n\r\n",
+            b"POST /v1/plan HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+        )]
+    _, responses = _run(scenario)
+    assert all(r.startswith(b"HTTP/1.1 400 ") for r in responses), responses
+
+
+def test_unknown_routes_share_one_histogram_series():
+    async def scenario(port):
+        for i in range(50):
+            await _exchange(port, f"GET /scan/{i} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+        return await _exchange(port, b"GET /healthz HTTP/1.1\r\nConnection: close\r\n\r\n")
+    service, health = _run(scenario)
+    assert health.startswith(b"HTTP/1.1 200 ")
+    assert set(service.latency) == {("other", 404), ("/healthz", 200)}
+
+
+MEMBER = {"gender": "Male", "age": 30, "height": 178, "weight": 76, "neck": 38, "waist": 84}
+
+
+def _post(port, payload):
+    body = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+    return _exchange(port, b"POST /v1/plan HTTP/1.1\r\nConnection: close\r\n"
+                     + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+
+
+def test_out_of_range_member_gets_400_without_failing_its_batch():
+    async def scenario(port):
+        huge = json.dumps(MEMBER).replace('"age": 30', '"age": ' + "1" + "0" * 400)
+        nan = json.dumps(MEMBER).replace('"age": 30', '"age": NaN')
+        return await asyncio.gather(*[_post(port, p) for p in (MEMBER, huge, nan, MEMBER, {**MEMBER, "waist": -1})])
+    _, responses = _run(scenario)
+    assert [r.split(b" ", 2)[1] for r in responses] == [b"200", b"400", b"400", b"200", b"400"]
+    body = json.loads(responses[0].split(b"\r\n\r\n", 1)[1])
+    assert body["valid"] and body["tdee"] > 0
+
+
+@pytest.mark.parametrize("key, value", [("age", float("nan")), ("height", float("inf")),
+                                        ("age", 10 ** 400), ("weight", -1), ("hip", 1e6)])
+def test_parse_member_rejects_non_finite_and_out_of_range(key, value):
+    with pytest.raises(ValueError):
+        parse_member({**MEMBER, key: value})
+
+
+def test_batch_failure_only_fails_the_offending_member():
+    async def main():
+        batcher = MicroBatcher(window_ms=5)
+        bad = {**parse_member(MEMBER), "age": 10 ** 400}   # 绕过 parse_member 的校验
+        return await asyncio.gather(batcher.submit(parse_member(MEMBER)), batcher.submit(bad),
+                                    batcher.submit(parse_member(MEMBER)), return_exceptions=True)
+    good, error, other = asyncio.run(main())
+    assert isinstance(error, OverflowError)
+    assert good == other and good["valid"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from fitness import ACTIVITY_MULTIPLIERS, GOAL_ADJUSTMENTS, FitnessCalculator
+from fitness_batch import batch_body_fat
+from fitness_solver import (brute_force_weight, circumference_for_body_fat, goal_for_calories,
+                            waist_for_body_fat, weight_for_calories)
+
+
+def _members(n, seed):
+    rng = np.random.default_rng(seed)
+    return (rng.random(n) < 0.5, rng.integers(18, 80, n), rng.integers(1400, 2100, n) / 10,
+            rng.choice(list(ACTIVITY_MULTIPLIERS.values()), n), rng.choice(list(GOAL_ADJUSTMENTS.values()), n),
+            rng.integers(500, 9000, n).astype(float))   # 含体重范围内达不到的目标
+
+
+@pytest.mark.parametrize("with_current", [False, True])
+def test_weight_matches_brute_force(with_current):
+    args = _members(4000, seed=int(with_current))
+    current = np.random.default_rng(9).integers(400, 1500, 4000) / 10 if with_current else None
+    weight, calories = weight_for_calories(*args, current_weight=current)
+    expected_weight, expected_calories = brute_force_weight(*args, current_weight=current)
+    np.testing.assert_array_equal(calories, expected_calories)
+    np.testing.assert_array_equal(weight, expected_weight)   # 相同误差时同样取较小 / 更接近当前体重的
+
+
+def test_weight_calories_match_scalar():
+    is_male, age, height, act, goal, target = _members(200, seed=2)
+    weight, calories = weight_for_calories(is_male, age, height, act, goal, target)
+    activity = {v: k for k, v in ACTIVITY_MULTIPLIERS.items()}
+    goals = {v: k for k, v in GOAL_ADJUSTMENTS.items()}
+    for i in range(len(weight)):
+        calc = FitnessCalculator("male" if is_male[i] else "female", age[i], height[i], weight[i], 0, 0)
+        plan = calc.nutrition_plan(calc.calculate_tdee(activity[act[i]]), goals[goal[i]])
+        assert plan["Calories"] == calories[i]
+
+
+def test_waist_is_closest_on_grid():
+    rng = np.random.default_rng(3)
+    n = 300
+    is_male, height = rng.random(n) < 0.5, rng.integers(1500, 2000, n) / 10
+    neck, hip = rng.integers(300, 450, n) / 10, rng.integers(800, 1200, n) / 10
+    target = rng.integers(800, 3500, n) / 100
+    waist = waist_for_body_fat(is_male, height, neck, target, hip)
+    grid = np.arange(1, 4000) / 10
+    for i in range(n):
+        k = grid.size
+        bfp, valid = batch_body_fat(np.full(k, is_male[i]), np.full(k, height[i]), np.full(k, neck[i]),
+                                    grid, np.full(k, hip[i]))
+        best = np.nanmin(np.where(valid, np.abs(bfp - target[i]), np.nan))
+        got, _ = batch_body_fat(is_male[i:i + 1], height[i:i + 1], neck[i:i + 1], waist[i:i + 1], hip[i:i + 1])
+        assert abs(got[0] - target[i]) == best
+
+
+def test_unreachable_body_fat_is_nan():
+    assert np.isnan(circumference_for_body_fat([True], [175.0], [-460.0])).all()
+
+
+def test_goal_for_calories():
+    tdee, weight = np.array([2500, 2500, 2500]), np.array([70.0, 70.0, 70.0])
+    goals = goal_for_calories(tdee, weight, [2000, 2500, 2750])
+    assert list(goals) == ["减脂 (Cut)", "维持 (Maintain)", "增肌 (Bulk)"]
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from fitness import FitnessCalculator
+from fitness_batch import calculate_batch
+from fitness_table import Log10Table
+
+
+@pytest.fixture(scope="module")
+def table():
+    return Log10Table.build()
+
+
+def _grid_members(n=4000, seed=0):
+    """0.1 cm 网格上的随机会员（围度差保证为正）"""
+    rng = np.random.default_rng(seed)
+    tenths = lambda lo, hi: rng.integers(lo * 10, hi * 10 + 1, n) / 10
+    neck = tenths(28, 50)
+    return {
+        "gender": rng.choice(["Male", "Female"], n),
+        "height": tenths(140, 210),
+        "neck": neck,
+        "waist": neck + tenths(10, 90),
+        "hip": tenths(70, 140),
+    }
+
+
+def test_table_matches_formula_on_grid(table):
+    m = _grid_members()
+    r = calculate_batch(m["gender"], 30, m["height"], 70.0, m["neck"], m["waist"], m["hip"], log10=table.log10)
+    assert r["valid"].all()
+    for i in range(len(m["gender"])):
+        args = (m["gender"][i], 30, m["height"][i], 70.0, m["neck"][i], m["waist"][i], m["hip"][i])
+        expected = FitnessCalculator(*args).calculate_body_fat()
+        assert r["body_fat"][i] == expected
+        assert table.body_fat(args[0], *args[2:3], *args[4:]) == expected
+
+
+@pytest.mark.parametrize("x", [0.0, -3.0, 0.05, 175.04, 300.1, 1e6, np.nan, np.inf, -np.inf])
+def test_values_outside_table_fall_back(table, x):
+    values = np.array([x, 175.0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = np.log10(values)
+    np.testing.assert_array_equal(table.log10(values), expected)
+
+
+def test_nan_member_matches_default_engine(table):
+    args = (["Male", "Female", "Male"], 30, [175.0, 165.0, 180.0], 70.0,
+            [38.0, np.nan, 40.0], [80.0, 75.0, 90.0], [0.0, 95.0, np.nan])
+    direct = calculate_batch(*args)
+    looked_up = calculate_batch(*args, log10=table.log10)
+    np.testing.assert_array_equal(looked_up["valid"], direct["valid"])
+    np.testing.assert_array_equal(looked_up["body_fat"], direct["body_fat"])
+    assert list(direct["valid"]) == [True, False, True]
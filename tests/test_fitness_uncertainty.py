@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from fitness_batch import calculate_batch
+from fitness_uncertainty import RESULT_FIELDS, RandomStreams, analytic, monte_carlo
+
+MEMBERS = (["Male", "Female", "Male", "Female"], [30, 40, 55, 25], [178.0, 165.0, 170.0, 160.0],
+           [76.0, 62.0, 90.0, 50.0], [38.0, 33.0, 42.0, 31.0], [84.0, 75.0, 100.0, 68.0], [0.0, 96.0, 0.0, 92.0],
+           "Moderate", "维持 (Maintain)")
+
+
+def test_random_streams_are_reproducible():
+    a, b = RandomStreams(1000, seed=7), RandomStreams(1000, seed=7)
+    np.testing.assert_array_equal(a.normals, b.normals)
+    assert not np.array_equal(a.normals, RandomStreams(1000, seed=8).normals)
+    np.testing.assert_array_equal(a.field("waist"), b.field("waist"))
+
+
+def test_shared_streams_make_results_independent_of_the_batch():
+    streams = RandomStreams(2000, seed=3)
+    together = monte_carlo(*MEMBERS, streams=streams)
+    alone = monte_carlo(*(col[1:2] if isinstance(col, list) else col for col in MEMBERS), streams=streams)
+    for field in RESULT_FIELDS:
+        for key in ("mean", "std", "low", "high"):
+            assert together[field][key][1] == alone[field][key][0]
+    again = monte_carlo(*MEMBERS, draws=2000, seed=5)
+    np.testing.assert_array_equal(again["body_fat"]["low"], monte_carlo(*MEMBERS, draws=2000, seed=5)["body_fat"]["low"])
+
+
+# 蛋白 / 脂肪 / 碳水取整到整克，分布是离散的，与正态近似本来就差得多，不在这里比较
+@pytest.mark.parametrize("field", ["body_fat", "bmr", "tdee", "calories"])
+def test_monte_carlo_agrees_with_analytic(field):
+    mc = monte_carlo(*MEMBERS, streams=RandomStreams(20_000, seed=1))
+    an = analytic(*MEMBERS)
+    std = an[field]["std"]
+    np.testing.assert_array_equal(mc[field]["value"], an[field]["value"])
+    np.testing.assert_allclose(mc[field]["std"], std, rtol=0.03)
+    np.testing.assert_allclose(mc[field]["low"], an[field]["low"], atol=0.2 * std.max())
+    np.testing.assert_allclose(mc[field]["high"], an[field]["high"], atol=0.2 * std.max())
+    assert (mc["body_fat"]["valid_share"] == 1).all()
+
+
+def test_zero_errors_collapse_to_the_nominal_result():
+    errors = dict.fromkeys(("height", "weight", "neck", "waist", "hip"), 0.0)
+    mc = monte_carlo(*MEMBERS, errors=errors, draws=50, seed=0)
+    an = analytic(*MEMBERS, errors=errors)
+    nominal = calculate_batch(*MEMBERS)
+    for field in RESULT_FIELDS:
+        np.testing.assert_array_equal(mc[field]["low"], nominal[field])
+        np.testing.assert_array_equal(mc[field]["high"], nominal[field])
+        assert (an[field]["std"] == 0).all()
+
+
+def test_unknown_error_field_raises():
+    with pytest.raises(ValueError):
+        analytic(*MEMBERS, errors={"age": 1.0})
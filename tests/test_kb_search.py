@@ -0,0 +1,43 @@
+import os
+import shutil
+
+import pytest
+
+import kb_search
+from ophth_kb import DEFAULT_ROOT, KnowledgeBase
+
+
+@pytest.fixture
+def kb(tmp_path):
+    root = tmp_path / "kb"
+    shutil.copytree(DEFAULT_ROOT, root, ignore=shutil.ignore_patterns(kb_search.INDEX_DIR))
+    return KnowledgeBase(str(root))
+
+
+def test_build_and_search(kb):
+    meta = kb_search.build_default(kb)
+    root = os.path.join(kb.root, kb_search.INDEX_DIR)
+    assert not [name for name in os.listdir(root) if name.endswith(".tmp")]
+    index = kb_search.SearchIndex(root)
+    try:
+        assert len(index) == meta["docs"] > 0
+        hits = index.search("毛果芸香碱")
+        assert hits and "毛果芸香碱" in hits[0]["title"] + hits[0]["snippet"]
+        assert [h["score"] for h in hits] == sorted((h["score"] for h in hits), reverse=True)
+    finally:
+        index.close()
+
+
+def test_fingerprint_covers_section_files(kb):
+    before = kb_search.fingerprint(kb)
+    assert set(before["sections"]) == set(kb.toc["sections"])
+    key = next(iter(kb.toc["sections"]))
+    path = os.path.join(kb.root, kb.toc["sections"][key]["file"])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))   # 只改 section，不重建 toc.json
+    assert kb_search.fingerprint(kb) != before
+
+
+def test_temp_files_are_per_process(tmp_path):
+    path = str(tmp_path / "meta.json")
+    assert kb_search._tmp_path(path) == f"{path}.{os.getpid()}.tmp"
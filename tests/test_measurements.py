@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from measurements import RECORD_DTYPE, HistoryStore, Measurement, records_from_columns
+
+
+def _measurement(member_id, day, weight):
+    return Measurement(member_id, f"2026-01-{day:02d}", "Male", 30, 175, weight, 38, 85)
+
+
+def test_append_after_partial_record(tmp_path):
+    store = HistoryStore(str(tmp_path), buckets=4)
+    store.append([_measurement(1, 1, 70.0), _measurement(5, 2, 71.0)])
+    # 模拟追加中途退出：分桶文件尾部残留半条记录
+    with open(store._part(1), "ab") as f:
+        f.write(b"\x01" * (RECORD_DTYPE.itemsize // 2))
+
+    store.append([_measurement(1, 3, 72.0), _measurement(9, 4, 73.0)])
+    store.append([_measurement(5, 5, 74.0)])
+
+    assert [r["weight"] / 10 for r in store.member_series(1)] == [70.0, 72.0]
+    assert [r["weight"] / 10 for r in store.member_series(5)] == [71.0, 74.0]
+    assert [r["weight"] / 10 for r in store.member_series(9)] == [73.0]
+    assert len(store) == 5
+
+
+@pytest.mark.parametrize("field, value", [
+    ("weight", float("nan")),
+    ("weight", -1.0),
+    ("height", 7000.0),
+    ("age", 300),
+    ("age", -1),
+    ("member_id", -5),
+])
+def test_records_from_columns_rejects_out_of_range(field, value):
+    columns = dict(member_id=[1, 2], day=[20000, 20001], gender="Male", age=[30, 40], height=[175.0, 180.0],
+                   weight=[70.0, 80.0], neck=[38.0, 39.0], waist=[85.0, 90.0])
+    columns[field] = [columns[field][0], value]
+    with pytest.raises(ValueError):
+        records_from_columns(**columns)
+
+
+def test_records_from_columns_round_trip():
+    rec = records_from_columns([1, 2], [20000, 20001], ["Male", "Female"], [30, 40], [175.0, 160.5],
+                               [70.2, 55.0], [38.0, 33.0], [85.0, 70.0], [0.0, 95.0])
+    assert rec["age"].tolist() == [30, 40]
+    np.testing.assert_allclose(rec["weight"] / 10, [70.2, 55.0])
@@ -0,0 +1,101 @@
+import asyncio
+import http.client
+import socket
+import threading
+
+import pytest
+
+import media
+
+
+@pytest.fixture
+def served(tmp_path):
+    """临时目录里一个带哈希文件名的文件，由 media.MediaServer 在后台线程提供"""
+    data = bytes(range(256)) * 4099
+    name = "bench.0123456789.flac"
+    (tmp_path / name).write_bytes(data)
+    loop = asyncio.new_event_loop()
+    server = media.MediaServer(str(tmp_path))
+    host, port = loop.run_until_complete(server.start(port=0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+
+    def get(method="GET", path=f"/{name}", **headers):
+        conn.request(method, path, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+
+    get.address = (host, port)
+    yield get, data
+    conn.close()
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    loop.close()
+
+
+@pytest.mark.parametrize("header, size, expected", [
+    (None, 100, None),
+    ("bytes=0-", 100, (0, 99)),
+    ("bytes=10-19", 100, (10, 19)),
+    ("bytes=90-200", 100, (90, 99)),
+    ("bytes=-10", 100, (90, 99)),
+    ("bytes=-500", 100, (0, 99)),
+    ("bytes=20-10", 100, None),
+    ("bytes=0-1,5-6", 100, None),
+    ("items=0-1", 100, None),
+])
+def test_parse_range(header, size, expected):
+    assert media.parse_range(header, size) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        media.parse_range(header, 100)
+
+
+def test_range_requests(served):
+    get, data = served
+    size = len(data)
+    r, body = get(Range="bytes=0-")
+    assert r.status == 206 and r.getheader("Content-Range") == f"bytes 0-{size - 1}/{size}" and body == data
+    assert r.getheader("Accept-Ranges") == "bytes"
+    assert r.getheader("Cache-Control") == media.IMMUTABLE
+
+    middle = size // 2
+    r, body = get(Range=f"bytes={middle}-{middle + 999}")
+    assert r.status == 206 and body == data[middle:middle + 1000]
+    r, body = get(Range="bytes=-1000")
+    assert r.status == 206 and body == data[-1000:]
+
+    r, body = get(Range=f"bytes={size}-")
+    assert r.status == 416 and r.getheader("Content-Range") == f"bytes */{size}"
+
+    r, body = get("HEAD")
+    assert r.status == 200 and int(r.getheader("Content-Length")) == size and body == b""
+
+
+def test_conditional_requests(served):
+    get, data = served
+    r, _ = get("HEAD")
+    tag = r.getheader("ETag")
+    r, body = get(**{"If-None-Match": tag})
+    assert r.status == 304 and body == b""
+
+    r, body = get(Range="bytes=0-9", **{"If-Range": tag})
+    assert r.status == 206 and body == data[:10]
+    r, body = get(Range="bytes=0-9", **{"If-Range": '"stale"'})
+    assert r.status == 200 and body == data
+
+
+def test_rejects_unknown_and_malformed(served):
+    get, _ = served
+    assert get(path="/missing.mp3")[0].status == 404
+    assert get(path=f"/{media.MANIFEST}")[0].status == 404
+    assert get("POST")[0].status == 405
+    for raw in (b"GARBAGE\r\n\r\n", b"GET / HTTP/1.1\r\nno-colon-header\r\n\r\n"):
+        with socket.create_connection(get.address, timeout=10) as sock:
+            sock.sendall(raw)
+            assert sock.recv(1024).startswith(b"HTTP/1.1 400 ")
@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pytest
+
+import quiz
+
+
+@pytest.fixture(scope="module")
+def index():
+    return quiz.question_index()
+
+
+def test_answer_index(index):
+    key = quiz.answer_key()
+    assert set(key) == set(index)
+    assert {c.question.id for c in quiz.cases()} <= set(index)
+    assert len(index) == len(quiz.cases()) + len(quiz.generated_questions())
+    for qid, q in index.items():
+        assert key[qid] == q.answer and q.answer in q.options
+        if not qid.startswith("case:"):
+            assert quiz.MIN_OPTIONS <= len(q.options) <= quiz.MAX_OPTIONS
+        assert len(set(q.options)) == len(q.options)
+
+
+def test_generated_options_are_deterministic(index):
+    quiz.generated_questions.cache_clear()
+    quiz.question_index.cache_clear()
+    try:
+        again = quiz.question_index()
+        assert all(again[qid].options == q.options for qid, q in index.items())
+    finally:
+        quiz.question_index.cache_clear()
+
+
+def test_grade_and_grade_batch_agree(index):
+    rng = random.Random(0)
+    questions = [q.id for q in quiz.sample(20, seed=1)] + [c.question.id for c in quiz.cases()]
+    submissions = []
+    for _ in range(50):
+        answers = {}
+        for qid in rng.sample(questions, 15):
+            answers[qid] = rng.choice(index[qid].options + ("不是选项",))
+        submissions.append(answers)
+
+    batch = quiz.grade_batch(submissions, questions)
+    assert batch["questions"] == questions
+    for i, answers in enumerate(submissions):
+        single = quiz.grade(answers, questions)
+        assert batch["scores"][i] == single["score"]
+        assert list(batch["correct"][i]) == [single["results"][qid] for qid in questions]
+        assert batch["answered"][i] == len(answers)
+    assert batch["mean"] == pytest.approx(np.mean([quiz.grade(a, questions)["score"] for a in submissions]))
+
+
+def test_unknown_questions_are_listed_not_raised(index):
+    qid = next(iter(index))
+    answers = {qid: index[qid].answer, "no:such:question": "x"}
+    single = quiz.grade(answers)
+    batch = quiz.grade_batch([answers], list(answers))
+    assert single["unknown"] == batch["unknown"] == ["no:such:question"]
+    assert single["score"] == batch["scores"][0] == 1
+    assert batch["questions"] == [qid]
+
+
+def test_drill_does_not_replace_case_answers(tmp_path):
+    log = quiz.SubmissionLog(str(tmp_path / "log.jsonl"))
+    case = quiz.cases()[0].question
+    drill = quiz.sample(2, seed=3)
+    log.append("alice", {case.id: case.answer}, "cases")
+    log.append("alice", {drill[0].id: drill[0].answer}, "drill")
+    log.append("alice", {drill[1].id: drill[1].answer}, "drill")
+    with pytest.raises(ValueError):
+        log.append("alice", {}, "exam")
+
+    merged = quiz.merge_answers(log)
+    assert merged["cases"] == {"alice": {case.id: case.answer}}
+    assert merged["drill"] == {"alice": {drill[0].id: drill[0].answer, drill[1].id: drill[1].answer}}
+    # 没有 kind 字段的旧记录按题目推断
+    assert quiz.record_kind({"answers": {case.id: "x"}}) == "cases"
+    assert quiz.record_kind({"answers": {drill[0].id: "x"}}) == "drill"
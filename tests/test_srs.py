@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from srs import GRADES, INITIAL_EASE, MIN_EASE, ReviewStore, State, deck, schedule
+
+
+def test_schedule_intervals():
+    s1 = schedule(None, GRADES["good"], 100)
+    assert (s1.reps, s1.interval, s1.due, s1.first, s1.last) == (1, 1, 101, 100, 100)
+    assert s1.ease == pytest.approx(INITIAL_EASE)
+    s2 = schedule(s1, GRADES["good"], 101)
+    assert (s2.reps, s2.interval, s2.due) == (2, 6, 107)
+    s3 = schedule(s2, GRADES["easy"], 107)
+    assert s3.ease == pytest.approx(INITIAL_EASE + 0.1)
+    assert (s3.reps, s3.interval, s3.due) == (3, round(6 * s3.ease), 107 + round(6 * s3.ease))
+    assert s3.first == 100 and s2.interval == 6   # 不修改传入的 state
+
+
+def test_schedule_lapse_and_ease_floor():
+    state = schedule(schedule(None, GRADES["good"], 0), GRADES["good"], 1)
+    lapsed = schedule(state, GRADES["again"], 7)
+    assert (lapsed.reps, lapsed.interval, lapsed.due, lapsed.lapses) == (0, 1, 8, 1)
+    assert lapsed.ease == pytest.approx(INITIAL_EASE - 0.54)
+    for day in range(8, 20):
+        lapsed = schedule(lapsed, GRADES["again"], day)
+    assert lapsed.ease == MIN_EASE and lapsed.lapses == 13
+    assert schedule(State(ease=1.35), GRADES["hard"], 0).ease == MIN_EASE
+
+
+@pytest.mark.parametrize("grade", [-1, 6])
+def test_schedule_rejects_bad_grade(grade):
+    with pytest.raises(ValueError):
+        schedule(None, grade, 0)
+
+
+def _expected(model, user, day):
+    states = {card: s for (u, card), s in model.items() if u == user}
+    due = sorted((s.due, card) for card, s in states.items() if s.due <= day)
+    return [card for _, card in due], len(due), sum(s.first == day for s in states.values())
+
+
+def _observed(store, user, day, limit=None):
+    return store.due(user, day, limit), store.due_count(user, day), store.new_today(user, day)
+
+
+def test_store_overlays_unflushed_reviews(tmp_path):
+    rng = random.Random(0)
+    cards = [f"c{i:02d}" for i in range(30)]
+    users = ["alice", "bob"]
+    model = {}
+    # 缓冲永不自动写盘：查询结果完全依赖缓冲叠加；对照组每次作答都立即写盘
+    with ReviewStore(str(tmp_path / "buffered.db"), batch_size=10 ** 6, flush_seconds=1e9) as buffered, \
+            ReviewStore(str(tmp_path / "direct.db"), batch_size=1) as direct:
+        for day in range(40):
+            for _ in range(rng.randrange(1, 12)):
+                user, card, grade = rng.choice(users), rng.choice(cards), rng.choice(list(GRADES.values()))
+                model[user, card] = schedule(model.get((user, card)), grade, day)
+                assert buffered.review(user, card, grade, day).row() == model[user, card].row()
+                direct.review(user, card, grade, day)
+            if day % 9 == 8:
+                buffered.flush()   # 之后的作答会覆盖数据库里已有的状态
+            for user in users:
+                for query_day in (day, day + 3):
+                    expected = _expected(model, user, query_day)
+                    assert _observed(buffered, user, query_day) == expected
+                    assert _observed(direct, user, query_day) == expected
+                    assert buffered.due(user, query_day, limit=3) == expected[0][:3]
+                stored, expected_state = buffered.state(user, "c00"), model.get((user, "c00"))
+                assert (stored and stored.row()) == (expected_state and expected_state.row())
+        buffered.flush()
+        for user in users:
+            assert _observed(buffered, user, 39) == _expected(model, user, 39)
+            seen = {card for (u, card) in model if u == user}
+            assert set(buffered.new_cards(user, limit=100, cards=[_Card(c) for c in cards])) == set(cards) - seen
+
+    with ReviewStore(str(tmp_path / "buffered.db")) as reopened:
+        for (user, card), state in model.items():
+            assert reopened.state(user, card).row() == state.row()
+
+
+def test_today_respects_new_card_limit(tmp_path):
+    ids = [card.id for card in deck()[:7]]
+    with ReviewStore(str(tmp_path / "s.db"), batch_size=10 ** 6, flush_seconds=1e9) as store:
+        assert store.today("alice", day=5, new_per_day=4) == ids[:4]
+        for card in ids[:3]:
+            store.review("alice", card, GRADES["good"], day=5)
+        assert store.new_today("alice", 5) == 3
+        assert store.today("alice", day=5, new_per_day=4) == ids[3:4]
+        # 第二天：昨天学的 3 张到期，另有 4 张新卡名额
+        assert store.today("alice", day=6, new_per_day=4) == sorted(ids[:3]) + ids[3:7]
+        assert store.today("alice", day=6, limit=2, new_per_day=4) == sorted(ids[:3])[:2]
+
+
+class _Card:
+    def __init__(self, id):
+        self.id = id
@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from measurements import records_from_columns
+from trends import TrendTracker, ewma, member_trends, trend_slope
+
+
+def _history(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    days = 20000 + np.cumsum(rng.integers(1, 4, n))
+    weight = 90 - 0.05 * np.arange(n) + rng.normal(0, 0.3, n)
+    waist = 100 - 0.04 * np.arange(n) + rng.normal(0, 0.5, n)
+    return records_from_columns(np.full(n, 7), days, "Male", np.full(n, 35), np.full(n, 178.0),
+                                weight, np.full(n, 40.0), waist)
+
+
+def test_from_history_body_fat_slope_matches_batch():
+    records = _history()
+    tracker = TrendTracker.from_history(records)
+    t = member_trends(records, tracker.window_days, tracker.alpha)
+    expected = trend_slope(t["day"], t["body_fat_rolling"], tracker.lookback_days)
+    assert tracker.slope("body_fat") == pytest.approx(expected, rel=1e-9)
+    assert tracker.latest["body_fat_rolling"] == pytest.approx(t["body_fat_rolling"][-1])
+
+
+def test_push_after_from_history_matches_batch():
+    records = _history()
+    tracker = TrendTracker.from_history(records[:-5])
+    for rec in records[-5:]:
+        tracker.push(rec)
+    t = member_trends(records, tracker.window_days, tracker.alpha)
+    assert tracker.latest["weight_smooth"] == pytest.approx(t["weight_smooth"][-1])
+    assert tracker.latest["body_fat_rolling"] == pytest.approx(t["body_fat_rolling"][-1])
+
+
+@pytest.mark.parametrize("alpha", [0, -0.5, math.nan])
+def test_ewma_rejects_non_positive_alpha(alpha):
+    with pytest.raises(ValueError):
+        ewma([1.0, 2.0, 3.0], alpha=alpha)
+
+
+def test_ewma_matches_recurrence():
+    x = np.random.default_rng(1).normal(size=500)
+    y, prev = [], x[0]
+    for v in x:
+        prev = 0.3 * v + 0.7 * prev
+        y.append(prev)
+    np.testing.assert_allclose(ewma(x, 0.3), y)
@@ -0,0 +1,222 @@
+"""
+会员趋势：基于测量历史计算体脂 / BMR / TDEE / 目标热量的滚动均值、体重指数平滑，以及达成目标的预计日期。
+
+    records = HistoryStore("history").member_series(42)
+    t = member_trends(records)                      # 向量化计算整段历史
+    project_goal_date(t["day"], t["weight_smooth"], target=68.0)
+
+    tracker = TrendTracker.from_history(records)    # 之后每来一条新记录只做 O(1) 更新
+    tracker.push(new_record)
+
+时间窗口按天计算（记录可以不连续），平滑按记录逐点进行。
+"""
+import math
+from collections import deque
+
+import numpy as np
+
+from measurements import compute, from_day
+
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_ALPHA = 0.1          # 每次称重的平滑系数（越小越平滑）
+DEFAULT_LOOKBACK_DAYS = 28   # 估计趋势斜率使用的天数
+
+ROLLING_FIELDS = ("body_fat", "bmr", "tdee", "calories")
+
+
+def rolling_mean(days, values, window_days=DEFAULT_WINDOW_DAYS):
+    """
+    以天为窗口的滚动均值：第 i 个点取 (days[i] - window_days, days[i]] 内的所有点。
+    days 须升序；NaN（例如无效的体脂）不计入均值。
+    """
+    values = np.asarray(values, dtype=np.float64)
+    ok = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(ok, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(ok)))
+    start = np.searchsorted(days, np.asarray(days) - window_days, side="right")
+    end = np.arange(1, len(values) + 1)
+    n = counts[end] - counts[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, (sums[end] - sums[start]) / n, np.nan)
+
+
+def _check_alpha(alpha):
+    if not alpha > 0:
+        raise ValueError(f"alpha 必须大于 0：{alpha}")
+
+
+def _ewma_block(alpha):
+    # 块内用 (1-alpha)^-k 展开递推，块长保证该系数不超过 1e6，避免精度损失
+    _check_alpha(alpha)
+    decay = 1 - alpha
+    return 1 if decay <= 0 else max(1, min(4096, int(math.log(1e6) / -math.log(decay))))
+
+
+def ewma(values, alpha=DEFAULT_ALPHA, initial=None):
+    """
+    指数平滑 y[i] = alpha * x[i] + (1 - alpha) * y[i-1]，y[-1] 默认取 x[0]。alpha 须大于 0，否则抛 ValueError。
+    按块向量化：块内用闭式求和，块间传递上一块的最后一个值。
+    """
+    _check_alpha(alpha)
+    x = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(x)
+    if not x.size:
+        return out
+    if alpha >= 1:
+        out[:] = x
+        return out
+    prev = x[0] if initial is None else initial
+    decay = 1 - alpha
+    block = _ewma_block(alpha)
+    k = np.arange(block)
+    grow = decay ** -(k + 1.0)     # (1-a)^-(j+1)
+    shrink = decay ** (k + 1.0)    # (1-a)^(i+1)
+    for start in range(0, x.size, block):
+        chunk = x[start:start + block]
+        m = chunk.size
+        out[start:start + m] = shrink[:m] * (prev + alpha * np.cumsum(chunk * grow[:m]))
+        prev = out[start + m - 1]
+    return out
+
+
+def trend_slope(days, values, lookback_days=DEFAULT_LOOKBACK_DAYS):
+    """最近 lookback_days 天内的最小二乘斜率（每天变化量），点数不足时返回 NaN"""
+    days = np.asarray(days, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if not days.size:
+        return math.nan
+    recent = (days > days[-1] - lookback_days) & ~np.isnan(values)
+    t, y = days[recent] - days[-1], values[recent]
+    if t.size < 2 or np.ptp(t) == 0:
+        return math.nan
+    t_mean = t.mean()
+    return float(((t - t_mean) * (y - y.mean())).sum() / ((t - t_mean) ** 2).sum())
+
+
+def _projection(last_day, current, slope, target):
+    if math.isnan(slope) or math.isnan(current):
+        return None
+    if current == target:
+        return from_day(last_day)
+    if slope == 0 or (target - current) / slope < 0:
+        return None  # 趋势方向与目标相反
+    return from_day(last_day + math.ceil((target - current) / slope))
+
+
+def project_goal_date(days, values, target, lookback_days=DEFAULT_LOOKBACK_DAYS):
+    """按最近的线性趋势推算数值到达 target 的日期；趋势背离目标时返回 None"""
+    if not len(days):
+        return None
+    slope = trend_slope(days, values, lookback_days)
+    return _projection(int(days[-1]), float(values[-1]), slope, target)
+
+
+def member_trends(records, window_days=DEFAULT_WINDOW_DAYS, alpha=DEFAULT_ALPHA):
+    """
+    对单个会员按日期排序的测量记录（measurements.RECORD_DTYPE）计算全部趋势序列。
+    返回 dict：day、weight、weight_smooth，以及 ROLLING_FIELDS 各自的原始值和 *_rolling 滚动均值。
+    """
+    days = records["day"].astype(np.int64)
+    results = compute(records)
+    trends = {"day": days, "weight": records["weight"] / 10}
+    trends["weight_smooth"] = ewma(trends["weight"], alpha)
+    for field in ROLLING_FIELDS:
+        values = results[field].astype(np.float64)
+        trends[field] = values
+        trends[f"{field}_rolling"] = rolling_mean(days, values, window_days)
+    return trends
+
+
+class _WindowSums:
+    """按天滑动的窗口：维护点的队列和 NaN 感知的累加和"""
+
+    def __init__(self, window_days, width):
+        self.window_days = window_days
+        self.points = deque()
+        self.sums = [0.0] * width
+        self.counts = [0] * width
+
+    def push(self, day, values):
+        self.points.append((day, values))
+        for i, v in enumerate(values):
+            if not math.isnan(v):
+                self.sums[i] += v
+                self.counts[i] += 1
+        while self.points[0][0] <= day - self.window_days:
+            _, old = self.points.popleft()
+            for i, v in enumerate(old):
+                if not math.isnan(v):
+                    self.sums[i] -= v
+                    self.counts[i] -= 1
+
+    def means(self):
+        return [s / c if c else math.nan for s, c in zip(self.sums, self.counts)]
+
+
+class TrendTracker:
+    """
+    增量趋势：每条新记录只更新滑动窗口和平滑值，不重新扫描历史。
+    记录须按日期顺序到达。
+    """
+
+    def __init__(self, window_days=DEFAULT_WINDOW_DAYS, alpha=DEFAULT_ALPHA, lookback_days=DEFAULT_LOOKBACK_DAYS):
+        self.alpha = alpha
+        self.window_days = window_days
+        self.lookback_days = lookback_days
+        self.rolling = _WindowSums(window_days, len(ROLLING_FIELDS))
+        self.recent = _WindowSums(lookback_days, 2)   # 平滑体重、滚动体脂：用于斜率
+        self.weight_smooth = None
+        self.latest = None
+
+    @classmethod
+    def from_history(cls, records, **kwargs):
+        """
+        用已有历史初始化：向量化计算一次，然后只把窗口内的尾部数据放进状态。
+        斜率用的滚动体脂直接取向量化结果（按完整历史计算），原始值只用来填滑动窗口。
+        """
+        tracker = cls(**kwargs)
+        if not len(records):
+            return tracker
+        trends = member_trends(records, tracker.window_days, tracker.alpha)
+        days = trends["day"]
+        last = int(days[-1])
+        horizon = max(tracker.window_days, tracker.lookback_days)
+        for i in np.flatnonzero(days > last - horizon):
+            tracker._push_point(int(days[i]), [float(trends[f][i]) for f in ROLLING_FIELDS],
+                                float(trends["weight"][i]), smooth=float(trends["weight_smooth"][i]),
+                                means=[float(trends[f"{f}_rolling"][i]) for f in ROLLING_FIELDS])
+        return tracker
+
+    def push(self, record):
+        """追加一条 RECORD_DTYPE 记录，返回最新的趋势快照"""
+        rec = np.asarray(record).reshape(1)
+        result = compute(rec)
+        self._push_point(int(rec["day"][0]), [float(result[f][0]) for f in ROLLING_FIELDS],
+                         float(rec["weight"][0]) / 10)
+        return self.latest
+
+    def _push_point(self, day, values, weight, smooth=None, means=None):
+        if smooth is None:
+            prev = weight if self.weight_smooth is None else self.weight_smooth
+            smooth = self.alpha * weight + (1 - self.alpha) * prev
+        self.weight_smooth = smooth
+        self.rolling.push(day, values)
+        if means is None:
+            means = self.rolling.means()
+        self.recent.push(day, (smooth, means[0]))
+        self.latest = {"day": day, "weight": weight, "weight_smooth": smooth,
+                       **dict(zip(ROLLING_FIELDS, values)),
+                       **{f"{f}_rolling": m for f, m in zip(ROLLING_FIELDS, means)}}
+
+    def slope(self, metric="weight"):
+        """最近 lookback_days 天的斜率；metric 为 'weight'（平滑体重）或 'body_fat'（滚动体脂）"""
+        idx = {"weight": 0, "body_fat": 1}[metric]
+        pts = [(d, v[idx]) for d, v in self.recent.points]
+        return trend_slope([d for d, _ in pts], [v for _, v in pts], self.lookback_days)
+
+    def project(self, target, metric="weight"):
+        """按当前趋势推算到达 target 的日期"""
+        if self.latest is None:
+            return None
+        current = self.latest["weight_smooth"] if metric == "weight" else self.latest["body_fat_rolling"]
+        return _projection(self.latest["day"], current, self.slope(metric), target)